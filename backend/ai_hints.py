@@ -1,16 +1,36 @@
 import random
 from game_logic import GameLogic
+from game_state import GuessTracker
+from hint_catalogue import HintCatalogue
+from hint_providers import TemplateHintProvider
+from player_profiles import EXPERT, STEADY, STRUGGLING
+from solver import get_solver
+
+# Average distance from the secret, as a fraction of the range, above which
+# guesses count as far off and below which as close (30 and 10 on 1-100)
+FAR_FRACTION = 0.3
+CLOSE_FRACTION = 0.1
+
+# Share of recent guesses ignoring earlier feedback above which hints restate the bounds
+UNREASONABLE_REMINDER = 0.15
 
 class AIHints:
     """Provides AI-powered hints for the number guessing game"""
     
-    def __init__(self):
-        self.game_logic = GameLogic()
+    def __init__(self, game_logic=None, provider=None):
+        """
+        Args:
+            game_logic (GameLogic): Rules used for statistics and default ranges
+            provider: Source of hint text (see hint_providers); the
+                template table below is its fallback
+        """
+        self.game_logic = game_logic or GameLogic()
+        self.provider = provider or TemplateHintProvider()
         self.hint_templates = {
             'first_guess': [
-                "Try starting with a number in the middle range (40-60) to narrow down quickly!",
-                "A good strategy is to start with 50 and then adjust based on the feedback.",
-                "Consider using the binary search approach - start with 50!"
+                "Try starting with a number in the middle range ({middle_range}) to narrow down quickly!",
+                "A good strategy is to start with {midpoint} and then adjust based on the feedback.",
+                "Consider using the binary search approach - start with {midpoint}!"
             ],
             'too_high': [
                 "You're getting closer! Try a number in the lower half of your current range.",
@@ -33,8 +53,10 @@ class AIHints:
                 "You're getting closer with each guess. Trust the process!"
             ]
         }
+        # Compile the templates once; rendered hints are cached per game situation
+        self.catalogue = HintCatalogue(self.hint_templates)
     
-    def generate_hint(self, current_guess, secret_number, previous_guesses):
+    def generate_hint(self, current_guess, secret_number, previous_guesses, tracker=None):
         """
         Generate an intelligent hint based on the current game state
         
@@ -42,94 +64,212 @@ class AIHints:
             current_guess (int): The player's current guess
             secret_number (int): The secret number
             previous_guesses (list): List of all previous guesses
+            tracker (GuessTracker): Incremental state including the current
+                guess; built from previous_guesses when omitted
             
         Returns:
             str: A helpful hint for the player
         """
+        if tracker is None:
+            tracker = self._build_tracker(previous_guesses, secret_number)
+        
         # Determine the type of hint to give
         if len(previous_guesses) == 1:
-            return self._get_first_guess_hint()
-        
-        # Analyze the current guess
-        if current_guess > secret_number:
-            return self._get_too_high_hint(current_guess, previous_guesses, secret_number)
+            kind = 'first_guess'
+        elif current_guess > secret_number:
+            kind = 'too_high'
         else:
-            return self._get_too_low_hint(current_guess, previous_guesses, secret_number)
+            kind = 'too_low'
+        
+        context = self._context(kind, current_guess, tracker, len(previous_guesses))
+        return self.provider.hint(context, lambda: self._template_hint(kind, current_guess, tracker))
     
-    def _get_first_guess_hint(self):
-        """Generate a hint for the first guess"""
-        return random.choice(self.hint_templates['first_guess'])
+    def _context(self, kind, current_guess, tracker, attempts):
+        """The situation handed to the provider; only what the player already knows"""
+        return {
+            'kind': kind,
+            'min_number': tracker.min_number,
+            'max_number': tracker.max_number,
+            'lower_bound': tracker.lower_bound(),
+            'upper_bound': tracker.upper_bound(),
+            'guess': current_guess,
+            'attempts': attempts
+        }
     
-    def _get_too_high_hint(self, current_guess, previous_guesses, secret_number):
-        """Generate a hint when the guess is too high"""
-        # Find the highest guess that was too low
-        too_low_guesses = [g for g in previous_guesses if g < secret_number]
-        lower_bound = max(too_low_guesses) if too_low_guesses else 1
+    def prefetch_hints(self, tracker, attempts):
+        """
+        Prepare hints for both outcomes of the most likely next guess
         
-        # Find the lowest guess that was too high
-        too_high_guesses = [g for g in previous_guesses if g > secret_number]
-        upper_bound = min(too_high_guesses) if too_high_guesses else current_guess
+        The likely next guess is the solver's optimal guess for the
+        remaining interval. It can only come back too high or too low (a win
+        needs no hint), so two hints cover it. A provider that cannot answer
+        right away starts fetching in the background and leaves None.
         
-        suggested_range = f"{lower_bound + 1}-{upper_bound - 1}"
+        Args:
+            tracker (GuessTracker): The game's state after its latest guess
+            attempts (int): Guesses made so far
+            
+        Returns:
+            dict: guess, attempts (the attempt number it applies to),
+                too_high and too_low hints, or None if only one number is left
+        """
+        outcomes = self._next_outcomes(tracker, attempts)
+        if outcomes is None:
+            return None
         
-        hint_template = random.choice(self.hint_templates['too_high'])
-        return hint_template.format(
-            suggested_range=suggested_range,
-            current_guess=current_guess
-        )
+        guess, branches = outcomes
+        prefetched = {'guess': guess, 'attempts': attempts + 1}
+        for outcome, kind, next_tracker in branches:
+            if next_tracker is None:
+                prefetched[outcome] = None
+                continue
+            context = self._context(kind, guess, next_tracker, attempts + 1)
+            prefetched[outcome] = self.provider.prefetch(
+                context, lambda kind=kind, next_tracker=next_tracker: self._template_hint(kind, guess, next_tracker)
+            )
+        return prefetched
     
-    def _get_too_low_hint(self, current_guess, previous_guesses, secret_number):
-        """Generate a hint when the guess is too low"""
-        # Find the highest guess that was too low
-        too_low_guesses = [g for g in previous_guesses if g < secret_number]
-        lower_bound = max(too_low_guesses) if too_low_guesses else current_guess
+    def warm_up(self, min_number, max_number):
+        """
+        Render the template hints for every guess the solver would make
         
-        # Find the lowest guess that was too high
-        too_high_guesses = [g for g in previous_guesses if g > secret_number]
-        upper_bound = min(too_high_guesses) if too_high_guesses else 100
+        Walks the solver's search tree for the range so the hint catalogue
+        already holds each hint a solver-guided game can need. Only the
+        templates are used; the provider is never called.
         
-        suggested_range = f"{lower_bound + 1}-{upper_bound - 1}"
+        Returns:
+            int: Hint situations rendered
+        """
+        rendered = 0
+        pending = [(GuessTracker(min_number, max_number), 0)]
+        while pending:
+            tracker, attempts = pending.pop()
+            outcomes = self._next_outcomes(tracker, attempts)
+            if outcomes is None:
+                continue
+            guess, branches = outcomes
+            for _, kind, next_tracker in branches:
+                if next_tracker is not None:
+                    self._template_hint(kind, guess, next_tracker)
+                    rendered += 1
+                    pending.append((next_tracker, attempts + 1))
+        return rendered
+    
+    def _next_outcomes(self, tracker, attempts):
+        """
+        The solver's next guess and the tracker after each way it can miss
+        
+        Returns:
+            tuple: (guess, [(outcome, hint kind, tracker or None if the
+                outcome is impossible), ...]), or None if one number is left
+        """
+        lower_bound = tracker.lower_bound()
+        upper_bound = tracker.upper_bound()
+        if lower_bound >= upper_bound:
+            return None
         
-        hint_template = random.choice(self.hint_templates['too_low'])
-        return hint_template.format(
-            suggested_range=suggested_range,
-            current_guess=current_guess
+        guess = get_solver(tracker.min_number, tracker.max_number).next_guess(lower_bound, upper_bound)
+        branches = []
+        for outcome, secret_number in (('too_high', guess - 1), ('too_low', guess + 1)):
+            if not lower_bound <= secret_number <= upper_bound:
+                branches.append((outcome, outcome, None))
+                continue
+            # Any secret on the right side gives the same bounds, hence the same hint
+            next_tracker = GuessTracker.from_dict(tracker.to_dict())
+            next_tracker.record(guess, secret_number)
+            branches.append((outcome, 'first_guess' if attempts == 0 else outcome, next_tracker))
+        return guess, branches
+    
+    def _template_hint(self, kind, current_guess, tracker):
+        """Pick a hint from the built-in template table"""
+        if kind == 'first_guess':
+            return self._get_first_guess_hint(tracker)
+        if kind == 'too_high':
+            return self._get_too_high_hint(current_guess, tracker)
+        return self._get_too_low_hint(current_guess, tracker)
+    
+    def _build_tracker(self, previous_guesses, secret_number):
+        """Replay a guess history over this instance's default range"""
+        return GuessTracker.from_guesses(
+            previous_guesses, secret_number,
+            self.game_logic.min_number, self.game_logic.max_number
         )
     
-    def get_strategy_hint(self, previous_guesses, secret_number):
+    def _get_first_guess_hint(self, tracker):
+        """Generate a hint for the first guess"""
+        return random.choice(self.catalogue.render('first_guess', tracker.min_number, tracker.max_number))
+    
+    def _get_too_high_hint(self, current_guess, tracker):
+        """Generate a hint when the guess is too high"""
+        # The tracker already holds the current guess as its best too-high guess
+        lower_bound = tracker.lower_bound()
+        upper_bound = tracker.upper_bound()
+        
+        return random.choice(self.catalogue.render('too_high', lower_bound, upper_bound, current_guess))
+    
+    def _get_too_low_hint(self, current_guess, tracker):
+        """Generate a hint when the guess is too low"""
+        # The tracker already holds the current guess as its best too-low guess
+        lower_bound = tracker.lower_bound()
+        upper_bound = tracker.upper_bound()
+        
+        return random.choice(self.catalogue.render('too_low', lower_bound, upper_bound, current_guess))
+    
+    def get_strategy_hint(self, previous_guesses, secret_number, tracker=None, profile=None):
         """
         Provide a strategic hint based on the player's guessing pattern
         
         Args:
             previous_guesses (list): List of previous guesses
             secret_number (int): The secret number
+            tracker (GuessTracker): Incremental state for the game, if available
+            profile (dict): The game's player_profiles.game_profile(), if any
             
         Returns:
             str: Strategic advice
         """
+        # Players who often ignore earlier feedback are reminded of the bounds first
+        if profile and profile['unreasonable_rate'] > UNREASONABLE_REMINDER and previous_guesses:
+            if tracker is None:
+                tracker = self._build_tracker(previous_guesses, secret_number)
+            return (f"Only numbers from {tracker.lower_bound()} to {tracker.upper_bound()} can still be right. "
+                    f"In recent games {profile['unreasonable_rate']:.0%} of your guesses fell outside "
+                    f"what the feedback had left.")
+        
         if len(previous_guesses) < 2:
             return "Try to use each guess to eliminate half of the remaining possibilities!"
         
-        # Analyze the player's strategy
-        stats = self.game_logic.get_guess_statistics(previous_guesses, secret_number)
+        # Analyze the player's strategy, measuring distances against the game's range
+        if tracker is None:
+            tracker = self._build_tracker(previous_guesses, secret_number)
+        stats = self.game_logic.get_guess_statistics(previous_guesses, secret_number, tracker)
+        span = tracker.max_number - tracker.min_number
         
-        if stats['average_difference'] > 30:
+        if stats['average_difference'] > FAR_FRACTION * span:
             return "Your guesses are quite far from the target. Try to use the feedback more systematically!"
-        elif stats['average_difference'] < 10:
+        elif stats['average_difference'] < CLOSE_FRACTION * span:
             return "You're getting very close! Try to be more precise with your next guess."
         else:
             return "You're making good progress. Keep narrowing down the range!"
     
-    def get_encouragement_hint(self, attempts):
+    def get_encouragement_hint(self, attempts, profile=None):
         """
         Provide encouraging feedback based on number of attempts
         
         Args:
             attempts (int): Number of attempts made
+            profile (dict): The game's player_profiles.game_profile(); with
+                a history, the player is compared with their usual pace
             
         Returns:
             str: Encouraging message
         """
+        usual = profile['usual_attempts'] if profile else None
+        if usual:
+            if attempts < usual:
+                return f"You're ahead of your usual pace of about {usual:.0f} guesses!"
+            return f"You usually need about {usual:.0f} guesses. Keep narrowing it down!"
+        
         if attempts <= 3:
             return "Great start! You're learning about the number's location."
         elif attempts <= 6:
@@ -139,27 +279,67 @@ class AIHints:
         else:
             return "Persistence pays off! You're narrowing it down."
     
-    def get_binary_search_hint(self, previous_guesses, secret_number):
+    def personalize(self, hint, previous_guesses, secret_number, tracker, profile, attempts_left=None):
+        """
+        Adapt a hint's tone to the player's history
+        
+        Struggling players get strategy on top of the hint, steady players
+        a comparison with their usual pace, and experts only the bounds.
+        New players, and games without a profile, get the hint unchanged.
+        
+        Args:
+            hint (str): The hint from generate_hint or the prefetch
+            previous_guesses (list): List of all previous guesses
+            secret_number (int): The secret number
+            tracker (GuessTracker): The game's state including the latest guess
+            profile (dict): The game's player_profiles.game_profile(), or None
+            attempts_left (int): Remaining attempts if the game has a limit
+            
+        Returns:
+            str: The hint to send
+        """
+        tone = profile['tone'] if profile else None
+        if tone == STRUGGLING:
+            if profile['unreasonable_rate'] > UNREASONABLE_REMINDER:
+                advice = self.get_strategy_hint(previous_guesses, secret_number, tracker, profile)
+            else:
+                advice = self.get_binary_search_hint(previous_guesses, secret_number, tracker, attempts_left)
+            return f"{hint} {advice}"
+        if tone == STEADY:
+            return f"{hint} {self.get_encouragement_hint(len(previous_guesses), profile)}"
+        if tone == EXPERT:
+            return f"Between {tracker.lower_bound()} and {tracker.upper_bound()}."
+        return hint
+    
+    def get_binary_search_hint(self, previous_guesses, secret_number, tracker=None, attempts_left=None):
         """
-        Suggest using binary search strategy
+        Suggest the optimal next guess using the solver for the game's range
         
         Args:
             previous_guesses (list): List of previous guesses
             secret_number (int): The secret number
+            tracker (GuessTracker): Incremental state for the game, if available
+            attempts_left (int): Remaining attempts if the game has a limit
             
         Returns:
             str: Binary search advice
         """
-        if len(previous_guesses) == 0:
-            return "Try starting with 50! This is the middle of the range and will help you eliminate half the possibilities."
-        
         # Find the current search range
-        too_low_guesses = [g for g in previous_guesses if g < secret_number]
-        too_high_guesses = [g for g in previous_guesses if g > secret_number]
+        if tracker is None:
+            tracker = self._build_tracker(previous_guesses, secret_number)
         
-        lower_bound = max(too_low_guesses) if too_low_guesses else 1
-        upper_bound = min(too_high_guesses) if too_high_guesses else 100
+        solver = get_solver(tracker.min_number, tracker.max_number)
+        lower_bound = tracker.lower_bound()
+        upper_bound = tracker.upper_bound()
+        suggested_guess = solver.next_guess(lower_bound, upper_bound)
+        worst_case = solver.worst_case_attempts(lower_bound, upper_bound)
         
-        suggested_guess = (lower_bound + upper_bound) // 2
+        if len(previous_guesses) == 0:
+            hint = f"Try starting with {suggested_guess}! This is the middle of the range and will help you eliminate half the possibilities."
+        else:
+            hint = f"Try guessing {suggested_guess}! This is the middle of your current search range ({lower_bound}-{upper_bound})."
         
-        return f"Try guessing {suggested_guess}! This is the middle of your current search range ({lower_bound}-{upper_bound})."
+        if attempts_left is not None and attempts_left < worst_case:
+            chance = solver.win_probability(lower_bound, upper_bound, attempts_left)
+            return hint + f" With {attempts_left} attempts left, playing optimally wins {chance:.0%} of the time."
+        return hint + f" Playing optimally, you are guaranteed to win within {worst_case} more guesses."
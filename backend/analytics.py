@@ -0,0 +1,221 @@
+"""Vectorized offline analytics over the game event log
+
+    python backend/analytics.py events.log [more.log ...] --top 10 --json report.json
+
+Loads the fixed-size records written by event_log.GameEventLog into NumPy
+arrays (memory-mapped, so millions of games fit) and computes every
+statistic with whole-array operations instead of per-game Python loops.
+"""
+import argparse
+import json
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # Analytics is an offline tool; the server does not need NumPy
+    np = None
+
+from event_log import EVENT_FIELDS, SECRET_UNKNOWN
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('Analytics needs NumPy. Run: pip install -r requirements-analytics.txt')
+
+
+def load_events(paths):
+    """
+    Load one or more event log files into a single structured array
+
+    A trailing partial record (from a crashed writer) is ignored.
+
+    Args:
+        paths (list): Event log files
+
+    Returns:
+        numpy.ndarray: Structured array with the EVENT_FIELDS columns
+    """
+    _require_numpy()
+    dtype = np.dtype(EVENT_FIELDS)
+    arrays = []
+    for path in paths:
+        count = os.path.getsize(path) // dtype.itemsize
+        if count:
+            arrays.append(np.memmap(path, dtype=dtype, mode='r', shape=(count,)))
+    if not arrays:
+        return np.empty(0, dtype=dtype)
+    return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+
+def _grouped_cummax(values, game_idx, n_games):
+    """
+    Running maximum of non-negative values that restarts at every game
+
+    Each game's values are lifted by game_index * M, so a single
+    np.maximum.accumulate over the whole array never carries a maximum
+    across a game boundary. Games are processed in chunks small enough
+    that the lifted keys fit in int64.
+    """
+    if not len(values):
+        return values.copy()
+    span = int(values.max()) + 1
+    games_per_chunk = max(1, (1 << 62) // span)
+    result = np.empty_like(values)
+    chunk_starts = np.searchsorted(game_idx, np.arange(0, n_games, games_per_chunk))
+    chunk_ends = np.append(chunk_starts[1:], len(values))
+    for start, end in zip(chunk_starts, chunk_ends):
+        offsets = (game_idx[start:end] - game_idx[start]) * span
+        result[start:end] = np.maximum.accumulate(values[start:end] + offsets) - offsets
+    return result
+
+
+def _previous_in_game(running, new_game):
+    """Shift a per-game running value by one guess; 0 marks 'no previous guess'"""
+    previous = np.empty_like(running)
+    previous[0] = 0
+    previous[1:] = running[:-1]
+    previous[new_game] = 0
+    return previous
+
+
+def analyze(events):
+    """
+    Compute global and per-player statistics over recorded guesses
+
+    Args:
+        events (numpy.ndarray): Array returned by load_events()
+
+    Returns:
+        dict: 'global' summary and 'players' columns (NumPy arrays)
+    """
+    _require_numpy()
+    if not len(events):
+        return {'global': {'games': 0, 'guesses': 0}, 'players': {}}
+
+    # Order every guess by game, then attempt
+    events = events[np.lexsort((events['attempt'], events['game_key']))]
+    guess = events['guess']
+    code = events['code']
+    hinted = events['hinted'].astype(bool)
+    n = len(events)
+
+    new_game = np.empty(n, dtype=bool)
+    new_game[0] = True
+    new_game[1:] = events['game_key'][1:] != events['game_key'][:-1]
+    game_idx = np.cumsum(new_game) - 1
+    n_games = int(game_idx[-1]) + 1
+
+    # is_guess_reasonable semantics: the guess must lie strictly between the
+    # highest earlier too-low guess and the lowest earlier too-high guess.
+    # Work relative to each game's minimum so values stay small and non-negative.
+    relative = guess - events['min_number']
+    top = int((events['max_number'] - events['min_number']).max()) + 1
+    low_keys = np.where(code < 0, relative + 1, 0)             # max too-low guess + 1
+    high_keys = np.where(code > 0, top - relative, 0)          # top - min too-high guess
+    prev_low = _previous_in_game(_grouped_cummax(low_keys, game_idx, n_games), new_game)
+    prev_high = _previous_in_game(_grouped_cummax(high_keys, game_idx, n_games), new_game)
+    reasonable = (relative + 1 > prev_low) & ((prev_high == 0) | (top - relative > prev_high))
+
+    # Commit-reveal games log their secret only on the guess that ends them;
+    # spread it over the game's guesses, and leave out games never finished
+    game_secret = np.full(n_games, SECRET_UNKNOWN, dtype=np.int64)
+    np.maximum.at(game_secret, game_idx, events['secret'])
+    secret = game_secret[game_idx]
+    known = secret != SECRET_UNKNOWN
+    difference = np.abs(guess[known] - secret[known]).astype(np.float64)
+
+    # Games end with a correct guess; its attempt number is the game's length
+    won = code == 0
+    won_attempts = events['attempt'][won].astype(np.int64)
+    attempts_distribution = np.bincount(won_attempts) if len(won_attempts) else np.zeros(1, dtype=np.int64)
+
+    # Hint effectiveness: is the guess after a hint more often reasonable?
+    has_next = np.zeros(n, dtype=bool)
+    has_next[:-1] = ~new_game[1:]
+    after_hint = has_next & hinted
+    after_no_hint = has_next & ~hinted
+    game_used_hints = np.bincount(game_idx, weights=hinted, minlength=n_games) > 0
+    won_game_idx = game_idx[won]
+
+    def mean_or_none(values):
+        return float(values.mean()) if len(values) else None
+
+    summary = {
+        'games': n_games,
+        'finished_games': int(won.sum()),
+        'guesses': n,
+        'average_attempts': mean_or_none(won_attempts),
+        'attempts_distribution': {int(a): int(c) for a, c in enumerate(attempts_distribution) if c},
+        'average_difference': mean_or_none(difference),
+        'unreasonable_rate': float(1 - reasonable.mean()),
+        'hinted_guesses': int(hinted.sum()),
+        'reasonable_after_hint': mean_or_none(reasonable[1:][after_hint[:-1]]) if n > 1 else None,
+        'reasonable_without_hint': mean_or_none(reasonable[1:][after_no_hint[:-1]]) if n > 1 else None,
+        'average_attempts_with_hints': mean_or_none(won_attempts[game_used_hints[won_game_idx]]),
+        'average_attempts_without_hints': mean_or_none(won_attempts[~game_used_hints[won_game_idx]]),
+    }
+
+    # Per-player aggregates via bincount over the player index
+    player_ids, player_idx = np.unique(events['player_id'], return_inverse=True)
+    n_players = len(player_ids)
+    guesses_per_player = np.bincount(player_idx, minlength=n_players)
+    known_per_player = np.bincount(player_idx[known], minlength=n_players)
+    won_per_player = np.bincount(player_idx[won], minlength=n_players)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        players = {
+            'player_id': player_ids,
+            'games': np.bincount(player_idx[new_game], minlength=n_players),
+            'finished_games': won_per_player,
+            'guesses': guesses_per_player,
+            'average_attempts': np.bincount(player_idx[won], weights=won_attempts, minlength=n_players) / won_per_player,
+            'average_difference': np.bincount(player_idx[known], weights=difference, minlength=n_players) / known_per_player,
+            'unreasonable_rate': np.bincount(player_idx, weights=~reasonable, minlength=n_players) / guesses_per_player,
+            'hint_rate': np.bincount(player_idx, weights=hinted, minlength=n_players) / guesses_per_player,
+        }
+    return {'global': summary, 'players': players}
+
+
+def top_players(players, limit):
+    """Rows for the players with the most games, as plain dicts"""
+    if not players:
+        return []
+    order = np.argsort(-players['games'], kind='stable')[:limit]
+    rows = []
+    for i in order:
+        row = {}
+        for name, column in players.items():
+            value = column[i].item()
+            row[name] = None if isinstance(value, float) and value != value else value
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze recorded games')
+    parser.add_argument('logs', nargs='+', help='Event log files written via $GAME_EVENT_LOG')
+    parser.add_argument('--top', type=int, default=10, help='Players to list')
+    parser.add_argument('--json', help='Write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = analyze(load_events(args.logs))
+    summary = report['global']
+    rows = top_players(report['players'], args.top)
+
+    print("📈 Global statistics")
+    for key, value in summary.items():
+        print(f"   {key}: {value}")
+    print(f"\n🏅 Top {len(rows)} players by games played")
+    for row in rows:
+        print(f"   {row['player_id']}: {row['games']} games, avg attempts {row['average_attempts']}, "
+              f"unreasonable rate {row['unreasonable_rate']:.2%}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'global': summary, 'top_players': rows}, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,37 +1,350 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, Response, request, jsonify, session
 from flask_cors import CORS
-import random
-from game_logic import GameLogic
+from startup import Lazy, Startup
+import hmac
+import os
+import secrets
+import time
+from game_logic import GameLogic, DEFAULT_MIN_NUMBER, DEFAULT_MAX_NUMBER, MAX_RANGE_SPAN, TOO_HIGH
+from solver import get_solver
 from ai_hints import AIHints
+from fairness import create_secret_deriver
+from hint_providers import create_hint_provider
+from game_store import GameConflict, create_game_store
+from game_state import GuessTracker
+from event_log import SECRET_UNKNOWN, open_event_log
+from metrics import init_metrics
+from profiling import install_profiler
+from leaderboard import open_leaderboard
+from lifecycle import ACTIVE, FINAL_MESSAGES, OUT_OF_ATTEMPTS, TIMED_OUT, WON, create_game_limits, status_of
+from player_profiles import game_profile, open_player_profiles, summary as profile_summary
+from rooms import NATIVE_STREAM, RoomRegistry, STREAM_HEADERS, parse_last_event_id, stream_events
+from ratelimit import ClientGames, install_proxy_fix, install_rate_limiter
+from validation import MISSING, Field, Invalid, Schema, check_bounds, check_range, flag, integer, integer_list, object_list, text
+from wire import BINARY_MIMETYPE, encode_guess, encode_status, wants_binary
 
 app = Flask(__name__)
-app.secret_key = 'your-secret-key-here'  # Change this in production
-CORS(app, supports_credentials=True, origins=['http://localhost:3000'])
+app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'your-secret-key-here')  # Set $FLASK_SECRET_KEY in production
+CORS_ORIGINS = ['http://localhost:3000']
+CORS(app, supports_credentials=True, origins=CORS_ORIGINS)
 
-# Initialize game logic and AI hints
+# Request latency histograms and counters, served at /metrics ($METRICS_ENABLED=0 turns them off)
+metrics = init_metrics(app)
+
+# Opt-in profiling of sampled requests ($PROFILE=sample|trace); folded stacks at /admin/profile
+profiler = install_profiler(app)
+
+# Guards /admin endpoints; without it only loopback clients are admitted
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Floods are turned away before Flask decodes the session or parses a body ($RATE_LIMIT=0 turns this off)
+rate_limiter = install_rate_limiter(
+    app, CORS_ORIGINS, on_reject=lambda rule: metrics.increment('rate_limited', (('rule', rule),))
+)
+
+# Behind $TRUSTED_PROXY_HOPS proxies the client address comes from X-Forwarded-For; wraps everything above
+proxy_fix = install_proxy_fix(app)
+
+# Game logic is cheap; the hint tables and provider pool are built on first
+# use or by the warm-up (see create_app)
 game_logic = GameLogic()
-ai_hints = AIHints()
+ai_hints = Lazy(lambda: AIHints(game_logic, provider=create_hint_provider()))
+
+# Hints for the likely next guess are prepared ahead of time ($HINT_PREFETCH=0 turns this off)
+HINT_PREFETCH = os.environ.get('HINT_PREFETCH', '1') != '0'
+
+# With $COMMIT_REVEAL=1 games store a nonce and their secrets are derived on demand
+secret_deriver = create_secret_deriver(app.secret_key)
+
+# Development aid: with $DISCLOSE_SECRET=1, /start returns the secret number.
+# Games whose secret was disclosed are never put on the leaderboard.
+DISCLOSE_SECRET = os.environ.get('DISCLOSE_SECRET', '0') == '1'
+
+# Game state lives server-side; the session cookie only carries the game id.
+# Idle games expire after $GAME_TTL and at most $GAME_STORE_MAX_GAMES are kept.
+game_store = create_game_store()
+
+# How a game can end besides a win ($GAME_MAX_ATTEMPTS, $GAME_TIME_LIMIT)
+game_limits = create_game_limits()
+
+# Games one player may keep open; starting more evicts their oldest ($MAX_GAMES_PER_CLIENT, 0 = no cap)
+client_games = ClientGames(int(os.environ.get('MAX_GAMES_PER_CLIENT', 50)))
+
+# Optional append-only log of every guess for offline analytics ($GAME_EVENT_LOG)
+event_log = open_event_log()
+
+# Finished games, ranked per number range ($LEADERBOARD_PATH)
+leaderboard = Lazy(open_leaderboard)
+
+# Rolling per-player history that adapts hints and the default range ($PLAYER_PROFILES_PATH)
+player_profiles = Lazy(open_player_profiles)
+
+# New games without an explicit range get the player's level's range ($ADAPTIVE_DIFFICULTY=0 turns this off)
+ADAPTIVE_DIFFICULTY = os.environ.get('ADAPTIVE_DIFFICULTY', '1') != '0'
+
+# Multiplayer rooms and their event streams, kept in this process. With several
+# worker processes serve.py sets $ROOMS=0, since a room is only found by its own worker.
+rooms = RoomRegistry() if os.environ.get('ROOMS', '1') != '0' else None
+
+# Readiness of this worker, reported by /ready
+startup = Startup()
+
+# Upper limits for a single /guess/batch request
+MAX_BATCH_GUESSES = 1000
+MAX_BATCH_GAMES = 100
+
+# Longest display name shown to a room or on the leaderboard
+MAX_PLAYER_NAME = 24
+
+def _check_range(values):
+    return check_range(values['min_number'], values['max_number'], MAX_RANGE_SPAN)
+
+def _check_batch(values):
+    if values['games'] is None and values['guesses'] is None:
+        return Invalid(MISSING, 'guesses', 'guesses must be a non-empty list')
+    return None
+
+# Request schemas, built once and shared by every endpoint; see validation.py
+RANGE_FIELDS = (
+    Field('min_number', integer(), DEFAULT_MIN_NUMBER),
+    Field('max_number', integer(), DEFAULT_MAX_NUMBER),
+)
+GUESS_FIELD = Field('guess', integer('Guess'), required='Guess is required')
+NAME_FIELD = Field('name', text(MAX_PLAYER_NAME))
+HINT_FIELD = Field('get_hint', flag, False)
+START_REQUEST = Schema(*RANGE_FIELDS, NAME_FIELD, check=_check_range)
+GUESS_REQUEST = Schema(GUESS_FIELD, HINT_FIELD)
+BATCH_GUESSES = integer_list(MAX_BATCH_GUESSES)
+BATCH_REQUEST = Schema(Field('guesses', BATCH_GUESSES), Field('games', object_list(MAX_BATCH_GAMES)),
+                       HINT_FIELD, check=_check_batch)
+ROOM_REQUEST = Schema(*RANGE_FIELDS, check=_check_range)
+ROOM_GUESS_REQUEST = Schema(GUESS_FIELD, NAME_FIELD)
+LEADERBOARD_QUERY = Schema(*RANGE_FIELDS, Field('limit', integer(), 10), check=_check_range)
+
+def _load_game():
+    """Return (game_id, state) for the session's game, or (None, None)"""
+    game_id = session.get('game_id')
+    if game_id is None:
+        return None, None
+    with metrics.timed('game_store'):
+        return game_id, game_store.get(game_id)
+
+def _binary_response(body):
+    """A compact wire-format response; see wire.py"""
+    return Response(body, mimetype=BINARY_MIMETYPE, headers={'Vary': 'Accept'})
+
+def _invalid(error):
+    """400 response for a validation.Invalid, counted by error code"""
+    metrics.increment('invalid_requests', (('code', error.code),))
+    return jsonify(error.to_dict()), 400
+
+def _conflict():
+    """409 response for a guess that raced another worker's on the same game"""
+    metrics.increment('game_conflicts')
+    return jsonify({'error': 'The game changed while this guess was checked. Try again.', 'code': 'conflict'}), 409
+
+def _check_guess(guess, min_number, max_number):
+    """Invalid if an already parsed guess is outside a game's range, else None"""
+    return check_bounds(guess, min_number, max_number, 'guess', 'Guess')
+
+def _player_id():
+    """The session's stable player id, assigned on first use"""
+    if 'player_id' not in session:
+        session['player_id'] = secrets.randbits(63)
+    return session['player_id']
+
+def _player_name(name, player_id):
+    """A validated display name, or a default derived from the player id"""
+    return name or f'Player {player_id % 10000}'
+
+def _record_win(state):
+    """Put a won game on the leaderboard and return its rank, or None if the player saw the secret"""
+    if state.get('secret_disclosed'):
+        return None
+    with metrics.timed('leaderboard'):
+        return leaderboard.get().record(
+            state['player_id'], state.get('player_name') or _player_name(None, state['player_id']),
+            state['min_number'], state['max_number'], state['attempts'],
+            time.time() - state.get('started_at', time.time()), state.get('hints_used', 0)
+        )
+
+def _record_profile(state):
+    """Fold a finished game into its player's profile"""
+    with metrics.timed('player_profiles'):
+        player_profiles.get().record_game(
+            state['player_id'], state['min_number'], state['max_number'], state['attempts'],
+            state.get('hints_used', 0), state.get('unreasonable', 0), status_of(state) == WON
+        )
+
+def _personalize(hint, guesses, secret_number, tracker, state):
+    """The hint in the tone the game's player profile asks for, given the attempts it has left"""
+    return ai_hints.get().personalize(hint, guesses, secret_number, tracker, state.get('profile'),
+                                      game_limits.remaining(state).get('attempts_left'))
+
+def _prefetch_hints(state, tracker):
+    """Store hints for both outcomes of the likely next guess, once the game has asked for a hint"""
+    if HINT_PREFETCH and state['game_active'] and state.get('hints_used'):
+        state['prefetched_hints'] = ai_hints.get().prefetch_hints(tracker, state['attempts'])
+
+def _take_prefetched_hint(prefetched, guess, result, attempts):
+    """
+    The hint prepared for this guess, if the player made the predicted one
+    
+    Args:
+        prefetched (dict): The game's prefetched_hints entry, or None
+        guess (int): The guess just made
+        result (dict): Its check_guess result
+        attempts (int): Attempt number of this guess
+        
+    Returns:
+        str: The prefetched hint, or None if it has to be generated
+    """
+    if not HINT_PREFETCH:
+        return None
+    if not prefetched or prefetched['guess'] != guess or prefetched['attempts'] != attempts:
+        metrics.increment('hint_prefetch', (('result', 'miss'),))
+        return None
+    hint = prefetched['too_high' if result['code'] == TOO_HIGH else 'too_low']
+    # Predicted, but the provider was still fetching it; its cache should have it by now
+    metrics.increment('hint_prefetch', (('result', 'hit' if hint else 'pending'),))
+    return hint
+
+def _secret_number(state):
+    """The game's secret, stored or, in commit-reveal mode, derived from its nonce"""
+    if 'nonce' in state:
+        return secret_deriver.secret_number(state['nonce'], state['min_number'], state['max_number'])
+    return state['secret_number']
+
+def _reveal(state):
+    """Secret and salt disclosed at the end of a commit-reveal game, else None"""
+    if 'nonce' not in state:
+        return None
+    return secret_deriver.reveal(state['nonce'], state['min_number'], state['max_number'])
+
+def _end_of_game(state):
+    """Status, message and secret for a game that ended without a win"""
+    body = {
+        'game_over': True,
+        'status': state['status'],
+        'final_message': FINAL_MESSAGES[state['status']].format(secret_number=_secret_number(state))
+    }
+    reveal = _reveal(state)
+    if reveal is not None:
+        body['reveal'] = reveal
+    return body
+
+def _check_deadline(state):
+    """End a game past its time limit; returns the 409 body to answer with, else None"""
+    if not game_limits.check_deadline(state):
+        return None
+    metrics.increment('games_finished', (('status', TIMED_OUT),))
+    # Once per game, so the profile update is done here under the game's lock
+    _record_profile(state)
+    body = _end_of_game(state)
+    body['error'] = body['final_message']
+    return body
+
+def _log_guess(game_id, state, guess, code, hinted):
+    """Append a guess to the event log, if one is configured"""
+    if event_log is not None:
+        # A commit-reveal secret is only written once the game is over and it is revealed anyway
+        hidden = 'nonce' in state and state['game_active']
+        event_log.record(state['player_id'], game_id, state['attempts'], guess,
+                         SECRET_UNKNOWN if hidden else _secret_number(state),
+                         state['min_number'], state['max_number'], hinted, code)
+
+def _apply_guess(state, guess, tracker):
+    """
+    Record a guess against the game state and check it
+    
+    Args:
+        state (dict): Game state, updated in place
+        guess (int): A validated guess
+        tracker (GuessTracker): The game's tracker, updated in place
+        
+    Returns:
+        dict: The check_guess result
+    """
+    secret_number = _secret_number(state)
+    # The tracker does not hold this guess yet, so this is an O(1) bounds check
+    if not game_logic.is_guess_reasonable(guess, state['guesses'], secret_number, tracker):
+        state['unreasonable'] = state.get('unreasonable', 0) + 1
+    state['attempts'] += 1
+    state['guesses'].append(guess)
+    tracker.record(guess, secret_number)
+    
+    result = game_logic.check_guess(guess, secret_number)
+    if game_limits.after_guess(state, result['correct']) != ACTIVE:
+        metrics.increment('games_finished', (('status', state['status']),))
+    return result
 
 @app.route('/start', methods=['POST'])
 def start_game():
     """Start a new number guessing game"""
     try:
-        # Generate a new secret number
-        secret_number = random.randint(1, 100)
+        # Read the optional number range for this game
+        body = request.get_json(silent=True) or {}
+        data, error = START_REQUEST.validate(body)
+        if error:
+            return _invalid(error)
+        min_number, max_number = data['min_number'], data['max_number']
         
-        # Store game state in session
-        session['secret_number'] = secret_number
-        session['attempts'] = 0
-        session['game_active'] = True
-        session['guesses'] = []
+        # Replace any previous game and store the new one server-side
+        old_game_id = session.get('game_id')
+        if old_game_id is not None:
+            game_store.delete(old_game_id)
+            client_games.discard(session.get('player_id'), old_game_id)
         
-        print(f"Game started! Secret number: {secret_number}, Session ID: {session.sid if hasattr(session, 'sid') else 'No SID'}")
+        # Players keep a stable id across games for analytics and their profile;
+        # one who is only now given an id has no profile to read
+        returning = 'player_id' in session
+        player_id = _player_id()
+        with metrics.timed('player_profiles'):
+            profile = player_profiles.get().get(player_id) if returning else profile_summary(None)
+        if ADAPTIVE_DIFFICULTY and body.get('min_number') is None and body.get('max_number') is None:
+            min_number, max_number = profile['min_number'], profile['max_number']
+        state = {
+            'player_id': player_id,
+            'player_name': _player_name(data['name'], player_id),
+            'started_at': time.time(),
+            'hints_used': 0,
+            'min_number': min_number,
+            'max_number': max_number,
+            'attempts': 0,
+            'guesses': [],
+            'tracker': GuessTracker(min_number, max_number).to_dict(),
+            # Hints read the profile from here, so /guess never queries the store
+            'profile': game_profile(profile, min_number, max_number)
+        }
+        response = {
+            'message': f'Game started! Guess a number between {min_number} and {max_number}.',
+            'min_number': min_number,
+            'max_number': max_number,
+            'attempts': 0,
+            'level': profile['level']
+        }
+        game_limits.start(state, state['started_at'])
+        response.update(game_limits.remaining(state))
         
-        return jsonify({
-            'message': 'Game started! Guess a number between 1 and 100.',
-            'secret_number': secret_number,  # Remove this in production
-            'attempts': 0
-        }), 200
+        # Generate a new secret number, or in commit-reveal mode a nonce it
+        # is derived from and a commitment the player can check at the end
+        if secret_deriver is not None:
+            state['nonce'] = secret_deriver.new_nonce()
+            response['commitment'] = secret_deriver.commit(state['nonce'], min_number, max_number)
+        else:
+            state['secret_number'] = game_logic.pick_secret(min_number, max_number)
+            if DISCLOSE_SECRET:
+                state['secret_disclosed'] = True
+                response['secret_number'] = state['secret_number']
+        
+        game_id = game_store.create(state)
+        session['game_id'] = game_id
+        for abandoned_id in client_games.add(player_id, game_id):
+            game_store.delete(abandoned_id)
+            metrics.increment('games_evicted', (('reason', 'client_cap'),))
+        response['game_id'] = game_id
+        
+        return jsonify(response), 200
         
     except Exception as e:
         print(f"Error starting game: {e}")
@@ -41,66 +354,253 @@ def start_game():
 def make_guess():
     """Make a guess in the number guessing game"""
     try:
-        print(f"Guess request received. Session data: {dict(session)}")
-        
-        # Check if game is active
-        if not session.get('game_active', False):
-            print("No active game found in session")
+        game_id = session.get('game_id')
+        if game_id is None:
             return jsonify({'error': 'No active game. Start a new game first.'}), 400
         
-        # Get the guess from request
-        data = request.get_json()
-        if not data or 'guess' not in data:
-            return jsonify({'error': 'Guess is required'}), 400
-        
+        # Malformed bodies are turned away before the game is locked
+        data, error = GUESS_REQUEST.validate(request.get_json(silent=True))
+        if error:
+            return _invalid(error)
         guess = data['guess']
         
-        # Validate guess
-        try:
-            guess = int(guess)
-            if guess < 1 or guess > 100:
-                return jsonify({'error': 'Guess must be between 1 and 100'}), 400
-        except ValueError:
-            return jsonify({'error': 'Guess must be a valid number'}), 400
-        
-        # Get game state
-        secret_number = session['secret_number']
-        attempts = session['attempts']
-        guesses = session.get('guesses', [])
-        
-        # Increment attempts
-        attempts += 1
-        session['attempts'] = attempts
-        guesses.append(guess)
-        session['guesses'] = guesses
-        
-        # Check the guess
-        result = game_logic.check_guess(guess, secret_number)
-        
-        # Generate AI hint if requested
-        ai_hint = None
-        if data.get('get_hint', False) and not result['correct']:
-            ai_hint = ai_hints.generate_hint(guess, secret_number, guesses)
+        # The transaction keeps concurrent guesses on this game from
+        # overwriting each other, whichever worker process they land on
+        with game_store.transaction(game_id) as txn:
+            state = txn.state
+            
+            # Check if game is active
+            if state is None or not state['game_active']:
+                return jsonify({'error': 'No active game. Start a new game first.'}), 400
+            ended = _check_deadline(state)
+            if ended:
+                txn.save()
+                return jsonify(ended), 409
+            
+            # The range depends on the game
+            error = _check_guess(guess, state['min_number'], state['max_number'])
+            if error:
+                return _invalid(error)
+            
+            # Record and check the guess
+            with metrics.timed('game_logic'):
+                tracker = GuessTracker.from_dict(state['tracker'])
+                result = _apply_guess(state, guess, tracker)
+                state['tracker'] = tracker.to_dict()
+            txn.save()
+            
+            want_hint = data['get_hint'] and state['game_active']
+            prefetched = state.pop('prefetched_hints', None)
+            ai_hint = None
+            if want_hint:
+                state['hints_used'] = state.get('hints_used', 0) + 1
+                ai_hint = _take_prefetched_hint(prefetched, guess, result, state['attempts'])
+            with metrics.timed('ai_hints'):
+                _prefetch_hints(state, tracker)
+            _log_guess(game_id, state, guess, result['code'], want_hint)
+            secret_number = _secret_number(state)
+            attempts = state['attempts']
+            guesses = list(state['guesses'])
+        
+        # Generate AI hint if requested and not prefetched, after the game is unlocked
+        if want_hint:
+            with metrics.timed('ai_hints'):
+                if ai_hint is None:
+                    ai_hint = ai_hints.get().generate_hint(guess, secret_number, guesses, tracker)
+                ai_hint = _personalize(ai_hint, guesses, secret_number, tracker, state)
+        
+        rank = _record_win(state) if result['correct'] else None
+        if not state['game_active']:
+            _record_profile(state)
+        reveal = _reveal(state) if not state['game_active'] else None
+        out_of_attempts = status_of(state) == OUT_OF_ATTEMPTS
+        
+        # Compact clients get the result code and this guess only
+        if wants_binary(request.accept_mimetypes):
+            return _binary_response(encode_guess(result['code'], attempts, guess, ai_hint, rank, reveal,
+                                                 secret_number if out_of_attempts else None,
+                                                 **game_limits.remaining(state)))
         
         response = {
             'guess': guess,
             'result': result['message'],
             'correct': result['correct'],
             'attempts': attempts,
-            'guesses': guesses
+            'guesses': guesses,
+            'status': status_of(state)
         }
+        response.update(game_limits.remaining(state))
         
         if ai_hint:
             response['ai_hint'] = ai_hint
         
-        # If game is won, mark as inactive
+        # If game is won, report it and its leaderboard rank
         if result['correct']:
-            session['game_active'] = False
             response['game_over'] = True
             response['final_message'] = f'Congratulations! You found the number in {attempts} attempts!'
+            response['leaderboard_rank'] = rank
+            if reveal is not None:
+                response['reveal'] = reveal
+        elif out_of_attempts:
+            response.update(_end_of_game(state))
         
-        return jsonify(response), 200
+        response = jsonify(response)
+        response.vary.add('Accept')
+        return response, 200
+        
+    except GameConflict:
+        return _conflict()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _play_batch(game_id, state, parsed, get_hint):
+    """
+    Run an ordered list of guesses against one game, stopping at a win
+    
+    The whole batch is validated first so a bad entry leaves the game
+    untouched. The caller saves the state once afterwards and, outside the
+    game's transaction, passes the hint request to _add_batch_hint.
+    
+    Args:
+        parsed (list): Guesses already checked to be ints by BATCH_GUESSES
+    
+    Returns:
+        tuple: (response_dict, hint_request, validation.Invalid or None)
+    """
+    for guess in parsed:
+        error = check_bounds(guess, state['min_number'], state['max_number'], 'guesses', 'Guess')
+        if error:
+            return None, None, error
+    
+    with metrics.timed('game_logic'):
+        tracker = GuessTracker.from_dict(state['tracker'])
+        results = []
+        result = None
+        for guess in parsed:
+            result = _apply_guess(state, guess, tracker)
+            results.append([guess, result['code']])
+            # Only the last guess of a batch can come back with a hint
+            hinted = get_hint and state['game_active'] and len(results) == len(parsed)
+            _log_guess(game_id, state, guess, result['code'], hinted)
+            if not state['game_active']:
+                break
+        state['tracker'] = tracker.to_dict()
+        # Batches are played by bots; hints prefetched for a single next guess no longer apply
+        state.pop('prefetched_hints', None)
+    
+    response = {
+        'results': results,
+        'processed': len(results),
+        'attempts': state['attempts'],
+        'correct': result['correct'],
+        'game_active': state['game_active'],
+        'status': status_of(state)
+    }
+    hint_request = None
+    if get_hint and state['game_active']:
+        state['hints_used'] = state.get('hints_used', 0) + 1
+        hint_request = (parsed[len(results) - 1], _secret_number(state), list(state['guesses']), tracker, state)
+    if result['correct']:
+        response['game_over'] = True
+        response['final_message'] = f'Congratulations! You found the number in {state["attempts"]} attempts!'
+        reveal = _reveal(state)
+        if reveal is not None:
+            response['reveal'] = reveal
+    elif not state['game_active']:
+        response.update(_end_of_game(state))
+    return response, hint_request, None
+
+def _add_batch_hint(response, hint_request):
+    """Attach the AI hint for the last guess of a batch, if one was asked for"""
+    if hint_request is not None:
+        guess, secret_number, guesses, tracker, state = hint_request
+        with metrics.timed('ai_hints'):
+            hint = ai_hints.get().generate_hint(guess, secret_number, guesses, tracker)
+            response['ai_hint'] = _personalize(hint, guesses, secret_number, tracker, state)
+
+@app.route('/guess/batch', methods=['POST'])
+def make_guess_batch():
+    """
+    Submit many guesses at once for bots and replay tooling
+    
+    Accepts either {"guesses": [...], "get_hint": bool} for the session's
+    game, or {"games": [{"game_id": ..., "guesses": [...]}, ...]}. Each
+    result is a [guess, code] pair using the GameLogic result codes, and
+    each game's state is saved once per batch.
+    """
+    try:
+        data, error = BATCH_REQUEST.validate(request.get_json(silent=True))
+        if error:
+            return _invalid(error)
+        get_hint = data['get_hint']
+        
+        if data['games'] is None:
+            game_id = session.get('game_id')
+            if game_id is None:
+                return jsonify({'error': 'No active game. Start a new game first.'}), 400
+            with game_store.transaction(game_id) as txn:
+                state = txn.state
+                if state is None or not state['game_active']:
+                    return jsonify({'error': 'No active game. Start a new game first.'}), 400
+                ended = _check_deadline(state)
+                if ended:
+                    txn.save()
+                    return jsonify(ended), 409
+                response, hint_request, error = _play_batch(game_id, state, data['guesses'], get_hint)
+                if error:
+                    return _invalid(error)
+                txn.save()
+            _add_batch_hint(response, hint_request)
+            if response['correct']:
+                response['leaderboard_rank'] = _record_win(state)
+            if not response['game_active']:
+                _record_profile(state)
+            return jsonify(response), 200
+        
+        game_results = []
+        for entry in data['games']:
+            game_id = entry.get('game_id') if isinstance(entry, dict) else None
+            if not isinstance(game_id, str):
+                game_results.append({'game_id': game_id, 'error': 'No active game'})
+                continue
+            guesses, error = BATCH_GUESSES(entry.get('guesses'), 'guesses')
+            if error is None:
+                reported = len(game_results)
+                try:
+                    with game_store.transaction(game_id) as txn:
+                        state = txn.state
+                        if state is None or not state['game_active']:
+                            game_results.append({'game_id': game_id, 'error': 'No active game'})
+                            continue
+                        ended = _check_deadline(state)
+                        if ended:
+                            txn.save()
+                            game_results.append({'game_id': game_id, **ended})
+                            continue
+                        response, hint_request, error = _play_batch(game_id, state, guesses, get_hint)
+                        if error is None:
+                            txn.save()
+                except GameConflict:
+                    # Nothing was saved, so drop a result appended before the save failed
+                    del game_results[reported:]
+                    metrics.increment('game_conflicts')
+                    game_results.append({'game_id': game_id, 'error': 'Game changed during the batch', 'code': 'conflict'})
+                    continue
+            if error is not None:
+                game_results.append({'game_id': game_id, **error.to_dict()})
+                continue
+            _add_batch_hint(response, hint_request)
+            if response['correct']:
+                response['leaderboard_rank'] = _record_win(state)
+            if not response['game_active']:
+                _record_profile(state)
+            response['game_id'] = game_id
+            game_results.append(response)
+        
+        return jsonify({'games': game_results}), 200
         
+    except GameConflict:
+        return _conflict()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -108,14 +608,33 @@ def make_guess():
 def game_status():
     """Get current game status"""
     try:
-        if not session.get('game_active', False):
-            return jsonify({'game_active': False, 'message': 'No active game'}), 200
+        game_id, state = _load_game()
+        # A game past its time limit reads as ended; its next guess records that
+        status = game_limits.status(state) if state is not None else None
+        if status != ACTIVE:
+            state = None
         
-        return jsonify({
-            'game_active': True,
-            'attempts': session.get('attempts', 0),
-            'guesses': session.get('guesses', [])
-        }), 200
+        # Compact clients pass ?since=<guesses they already have> and get the rest
+        if wants_binary(request.accept_mimetypes):
+            return _binary_response(encode_status(state, request.args.get('since', 0, type=int)))
+        
+        if state is None:
+            body = {'game_active': False, 'message': 'No active game'}
+            if status is not None:
+                body['status'] = status
+            response = jsonify(body)
+        else:
+            response = jsonify({
+                'game_active': True,
+                'status': status,
+                'min_number': state['min_number'],
+                'max_number': state['max_number'],
+                'attempts': state['attempts'],
+                'guesses': state['guesses'],
+                **game_limits.remaining(state)
+            })
+        response.vary.add('Accept')
+        return response, 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -124,19 +643,277 @@ def game_status():
 def reset_game():
     """Reset the current game"""
     try:
-        session.clear()
-        return jsonify({'message': 'Game reset successfully'}), 200
+        game_id = session.pop('game_id', None)
+        response = {'message': 'Game reset successfully'}
+        if game_id is not None:
+            # An abandoned commit-reveal game still discloses its secret
+            state = game_store.get(game_id)
+            reveal = _reveal(state) if state is not None else None
+            if reveal is not None:
+                response['reveal'] = reveal
+            game_store.delete(game_id)
+            client_games.discard(session.get('player_id'), game_id)
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _rooms_disabled():
+    """404 for room endpoints on a server running several worker processes"""
+    return jsonify({'error': 'Rooms are disabled on this server'}), 404
+
+@app.route('/rooms', methods=['POST'])
+def create_room():
+    """Open a multiplayer room where every player hunts the same number"""
+    if rooms is None:
+        return _rooms_disabled()
+    try:
+        data, error = ROOM_REQUEST.validate(request.get_json(silent=True) or {})
+        if error:
+            return _invalid(error)
+        min_number, max_number = data['min_number'], data['max_number']
+        
+        room = rooms.create(game_logic.pick_secret(min_number, max_number), min_number, max_number)
+        if room is None:
+            return jsonify({'error': 'Too many open rooms. Try again later.'}), 503
+        return jsonify(room.snapshot()), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/rooms/<room_id>', methods=['GET'])
+def room_status(room_id):
+    """Current state of a room, for clients that cannot stream"""
+    if rooms is None:
+        return _rooms_disabled()
+    room = rooms.get(room_id)
+    if room is None:
+        return jsonify({'error': 'Room not found'}), 404
+    return jsonify(room.snapshot()), 200
+
+@app.route('/rooms/<room_id>/guess', methods=['POST'])
+def room_guess(room_id):
+    """Guess in a room; the result is broadcast to everyone watching it"""
+    if rooms is None:
+        return _rooms_disabled()
+    try:
+        room = rooms.get(room_id)
+        if room is None:
+            return jsonify({'error': 'Room not found'}), 404
+        
+        data, error = ROOM_GUESS_REQUEST.validate(request.get_json(silent=True))
+        if not error:
+            error = _check_guess(data['guess'], room.min_number, room.max_number)
+        if error:
+            return _invalid(error)
+        guess = data['guess']
+        
+        player_id = _player_id()
+        name = _player_name(data['name'], player_id)
+        result = game_logic.check_guess(guess, room.secret_number)
+        attempts = room.record_guess(player_id, name, guess, result['code'])
+        if attempts is None:
+            return jsonify({'error': f'Too late! {room.winner} already found the number.'}), 409
+        
+        response = {
+            'guess': guess,
+            'result': result['message'],
+            'correct': result['correct'],
+            'attempts': attempts
+        }
+        if result['correct']:
+            response['game_over'] = True
+            response['final_message'] = f'You won the room in {attempts} attempts!'
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/rooms/<room_id>/events', methods=['GET'])
+def room_events(room_id):
+    """
+    Server-Sent Events stream of a room's guesses
+    
+    A new stream starts with a 'snapshot' event; reconnecting clients send
+    Last-Event-ID and receive what they missed. Under asgi.py this view
+    only admits the stream, which is then served on the event loop.
+    """
+    if rooms is None:
+        return _rooms_disabled()
+    room = rooms.get(room_id)
+    if room is None:
+        return jsonify({'error': 'Room not found'}), 404
+    cursor = parse_last_event_id(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+    if request.environ.get(NATIVE_STREAM):
+        request.environ[NATIVE_STREAM] = (room, cursor)
+        return Response(headers=STREAM_HEADERS)
+    return Response(stream_events(room, cursor), headers=STREAM_HEADERS)
+
+def _leaderboard_query():
+    """(values, error) for the query string, defaulting to the standard range"""
+    return LEADERBOARD_QUERY.validate(request.args)
+
+@app.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Top games for a number range: ?min_number=1&max_number=100&limit=10"""
+    try:
+        query, error = _leaderboard_query()
+        if error:
+            return _invalid(error)
+        min_number, max_number, limit = query['min_number'], query['max_number'], query['limit']
+        
+        with metrics.timed('leaderboard'):
+            entries = leaderboard.get().top(min_number, max_number, limit)
+            total = leaderboard.get().total(min_number, max_number)
+        return jsonify({
+            'min_number': min_number,
+            'max_number': max_number,
+            'total': total,
+            'entries': entries
+        }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/leaderboard/me', methods=['GET'])
+def my_leaderboard_rank():
+    """The session player's best game and rank for a number range"""
+    try:
+        query, error = _leaderboard_query()
+        if error:
+            return _invalid(error)
+        min_number, max_number = query['min_number'], query['max_number']
+        if 'player_id' not in session:
+            return jsonify({'ranked': False, 'message': 'Win a game to get on the leaderboard'}), 200
+        
+        with metrics.timed('leaderboard'):
+            best = leaderboard.get().player_best(session['player_id'], min_number, max_number)
+        if best is None:
+            return jsonify({'ranked': False, 'message': 'Win a game to get on the leaderboard'}), 200
+        best['ranked'] = True
+        return jsonify(best), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/profile', methods=['GET'])
+def my_profile():
+    """The session player's history across games, level and hint tone"""
+    try:
+        # A session without a player id reads as a new player's empty profile
+        with metrics.timed('player_profiles'):
+            return jsonify(player_profiles.get().get(session.get('player_id'))), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _collect_runtime_metrics():
+    """Cache and store gauges reported at scrape time"""
+    if hasattr(game_store, '__len__'):
+        yield 'stored_games', 'gauge', (), len(game_store)
+    for reason, count in game_store.evictions.items():
+        yield 'game_store_evictions', 'counter', (('reason', reason),), count
+    # A scrape must not be what builds the hint resources
+    if ai_hints.built:
+        hints = ai_hints.get()
+        hint_cache = hints.catalogue.stats()
+        yield 'hint_cache_hits', 'counter', (), hint_cache['hits']
+        yield 'hint_cache_misses', 'counter', (), hint_cache['misses']
+        yield 'hint_cache_entries', 'gauge', (), hint_cache['size']
+        for name, value in hints.provider.stats().items():
+            kind = 'gauge' if name in ('cached', 'inflight') else 'counter'
+            yield f'hint_provider_{name}', kind, (), value
+    if rooms is not None:
+        yield 'rooms', 'gauge', (), len(rooms)
+        yield 'room_subscribers', 'gauge', (), rooms.subscribers()
+    if profiler is not None:
+        yield 'profiled_requests', 'counter', (), profiler.stats['profiled']
+        yield 'profile_samples', 'counter', (), profiler.stats['samples']
+        yield 'profile_sampler_seconds', 'counter', (), profiler.stats['sampler_seconds']
+        yield 'profile_stacks', 'gauge', (), len(profiler.stacks)
+
+metrics.add_collector(_collect_runtime_metrics)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose request metrics in the Prometheus text format"""
+    if not metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def _is_admin():
+    """Bearer $ADMIN_TOKEN, or any loopback client when no token is set"""
+    if ADMIN_TOKEN:
+        return hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {ADMIN_TOKEN}'.encode())
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+@app.route('/admin/profile', methods=['GET', 'DELETE'])
+def admin_profile():
+    """
+    Download this worker's folded stacks for flamegraph.pl or speedscope
+    
+    GET ?reset=1 clears them after reading; DELETE just clears them.
+    """
+    if profiler is None:
+        return jsonify({'error': 'Profiling is disabled'}), 404
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    if request.method == 'DELETE':
+        profiler.stacks.clear()
+        return jsonify({'message': 'Profile cleared'}), 200
+    
+    body = profiler.stacks.render()
+    if request.args.get('reset') == '1':
+        profiler.stacks.clear()
+    return Response(body, mimetype='text/plain', headers={
+        'Content-Disposition': f'attachment; filename=profile-{profiler.mode}-{os.getpid()}.folded',
+        'X-Profile-Mode': profiler.mode
+    })
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 503 until this worker's warm-up has finished"""
+    return jsonify(startup.status()), 200 if startup.ready else 503
+
 @app.route('/test', methods=['GET'])
 def test():
     """Test endpoint to verify backend is working"""
     return jsonify({'message': 'Backend is working!', 'session_id': id(session)}), 200
 
+def _warm_up():
+    """Build the lazy resources and precompute the default range's tables"""
+    hints = ai_hints.get()
+    leaderboard.get()
+    player_profiles.get()
+    get_solver(DEFAULT_MIN_NUMBER, DEFAULT_MAX_NUMBER)
+    rendered = hints.warm_up(DEFAULT_MIN_NUMBER, DEFAULT_MAX_NUMBER)
+    print(f"🔥 Warm-up rendered {rendered} hints for {DEFAULT_MIN_NUMBER}-{DEFAULT_MAX_NUMBER}")
+
+def create_app(warm_up=None, background=True):
+    """
+    Entry point for servers: the app, with its warm-up started
+    
+    Importing this module only registers routes; expensive resources are
+    built lazily. Calling create_app() more than once returns the same app
+    and warms it up only once.
+    
+    Args:
+        warm_up (bool): Precompute tables before reporting ready
+            (default: on unless $WARM_UP=0)
+        background (bool): Warm up on a thread while serving; pass False
+            to finish before returning, e.g. before forking workers
+            
+    Returns:
+        Flask: The app
+    """
+    if warm_up is None:
+        warm_up = os.environ.get('WARM_UP', '1') != '0'
+    if warm_up:
+        startup.run(_warm_up, background)
+    return app
+
 if __name__ == '__main__':
     print("🚀 Backend server starting...")
     print("🔗 Backend will be available at: http://localhost:5000")
     print("🎮 Frontend should connect from: http://localhost:3000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
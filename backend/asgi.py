@@ -0,0 +1,118 @@
+"""ASGI entry point for production serving
+
+The Flask app stays a plain WSGI app; a2wsgi's WSGIMiddleware lets an
+ASGI server such as uvicorn own the sockets. Connections (including idle
+keep-alive ones) are handled by the server's event loop, and a thread is
+only borrowed from a bounded pool while a request is actually inside
+Flask.
+
+    uvicorn asgi:application --app-dir backend --workers 4
+
+Long-lived room event streams (GET /rooms/<id>/events) are served straight
+from the event loop instead, so thousands of open streams do not pin the
+pool's threads. They are still admitted by the WSGI app first, so the
+proxy fix, rate limiter, profiler, metrics and CORS apply to them too.
+That route is the only part of the translation done here.
+
+See serve.py for a launcher with the documented concurrency settings.
+"""
+import os
+import re
+
+from a2wsgi import WSGIMiddleware
+
+from rooms import NATIVE_STREAM, stream_events_asgi
+
+# Largest declared request body accepted before Flask sees it
+MAX_BODY_BYTES = 1024 * 1024
+
+ROOM_EVENTS = re.compile(r'/rooms/([^/]+)/events')
+
+
+def _native_stream_flag(wsgi_app):
+    """
+    Carry NATIVE_STREAM between the ASGI scope and the WSGI environ
+
+    WSGIMiddleware puts the scope in the environ as 'asgi.scope'. A scope
+    flagged by Application reaches the view as an environ flag, and the
+    view's answer, (room, cursor), is copied back for Application to read.
+    """
+    def app(environ, start_response):
+        scope = environ.get('asgi.scope')
+        if scope is None or NATIVE_STREAM not in scope:
+            return wsgi_app(environ, start_response)
+        environ[NATIVE_STREAM] = True
+        try:
+            return wsgi_app(environ, start_response)
+        finally:
+            scope[NATIVE_STREAM] = environ[NATIVE_STREAM]
+    return app
+
+
+class Application:
+    """The WSGI app over ASGI, with room event streams served natively"""
+
+    def __init__(self, wsgi_app, threads=32):
+        """
+        Args:
+            wsgi_app: The WSGI callable to wrap
+            threads (int): Requests that may run inside the WSGI app at once
+        """
+        self.wsgi = WSGIMiddleware(_native_stream_flag(wsgi_app), workers=threads)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            if _declared_length(scope) > MAX_BODY_BYTES:
+                await send({'type': 'http.response.start', 'status': 413, 'headers': []})
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+            if scope['method'] == 'GET' and ROOM_EVENTS.fullmatch(scope['path']):
+                await self._room_events(scope, receive, send)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _room_events(self, scope, receive, send):
+        """
+        Serve GET /rooms/<id>/events on the event loop
+
+        The request first runs through the whole WSGI app with NATIVE_STREAM
+        set, so every middleware and Flask hook sees it. The view then answers
+        with the stream's headers and leaves the room and cursor behind, and
+        the stream itself is served here. Any other answer, such as 404 for
+        an unknown room or 429, is sent as it is.
+        """
+        scope = dict(scope)
+        scope[NATIVE_STREAM] = True
+        messages = []
+
+        async def hold(message):
+            messages.append(message)
+
+        await self.wsgi(scope, receive, hold)
+        start = messages[0]
+        admitted = scope[NATIVE_STREAM]
+        if start['status'] == 200 and admitted is not True:
+            room, cursor = admitted
+            # The admission response was empty; the stream has no length
+            headers = [(name, value) for name, value in start['headers'] if name != b'content-length']
+            await stream_events_asgi(room, cursor, receive, send, headers)
+            return
+        for message in messages:
+            await send(message)
+
+
+def _declared_length(scope):
+    """The request's Content-Length, 0 if it has none"""
+    for name, value in scope.get('headers', ()):
+        if name == b'content-length':
+            return int(value) if value.isdigit() else 0
+    return 0
+
+
+def create_application():
+    """Wrap the Flask app, sizing the pool from $ASGI_THREADS"""
+    import app as backend
+    return Application(backend.create_app(), threads=int(os.environ.get('ASGI_THREADS', 32)))
+
+
+application = create_application()
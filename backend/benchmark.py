@@ -0,0 +1,361 @@
+"""Load-test and benchmark harness for the backend
+
+Plays many simulated games against the real Flask app and reports
+requests/sec plus p50/p95/p99 latency for every endpoint.
+
+    python backend/benchmark.py --games 2000 --strategy binary
+    python backend/benchmark.py --transport http --concurrency 16
+    python backend/benchmark.py --output after.json --compare before.json
+
+The default transport drives the app in-process through Flask's test
+client. `--transport http` starts a local threaded server on a free port
+and talks to it over keep-alive HTTP connections instead; `--url` points
+the same client at a server that is already running.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+# --- Transports ---------------------------------------------------------
+
+class TestClientTransport:
+    """Send requests straight into the Flask app without a socket"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPTransport:
+    """Send requests over one keep-alive connection, carrying the session cookie"""
+
+    def __init__(self, base_url):
+        parsed = urlparse(base_url)
+        self.connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80)
+        self.cookie = None
+
+    def request(self, method, path, body=None):
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        raw = response.read()
+        set_cookie = response.getheader('Set-Cookie')
+        if set_cookie:
+            self.cookie = set_cookie.split(';', 1)[0]
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = None
+        return response.status, data
+
+
+def start_local_server(app):
+    """Serve the app on a free local port in a background thread"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+# --- Player strategies --------------------------------------------------
+
+class RandomPlayer:
+    """Guesses uniformly inside the range it still believes possible"""
+
+    def __init__(self, min_number, max_number, rng):
+        self.low, self.high, self.rng = min_number, max_number, rng
+
+    def next_payload(self):
+        return {'guess': self.rng.randint(self.low, self.high)}
+
+    def observe(self, guess, data):
+        if data and not data.get('correct'):
+            if data['result'].startswith('Too low'):
+                self.low = guess + 1
+            else:
+                self.high = guess - 1
+
+
+class BinarySearchPlayer(RandomPlayer):
+    """Always guesses the midpoint of the remaining range"""
+
+    def next_payload(self):
+        return {'guess': (self.low + self.high) // 2}
+
+
+class AdversarialPlayer(BinarySearchPlayer):
+    """Binary search interleaved with malformed and out-of-range payloads"""
+
+    def __init__(self, min_number, max_number, rng, invalid_rate=0.5):
+        super().__init__(min_number, max_number, rng)
+        self.min_number, self.max_number = min_number, max_number
+        self.invalid_rate = invalid_rate
+
+    def next_payload(self):
+        if self.rng.random() >= self.invalid_rate:
+            return super().next_payload()
+        return self.rng.choice([
+            {},
+            {'guess': 'fifty'},
+            {'guess': None},
+            {'guess': True},
+            {'guess': 12.5},
+            {'guess': [1, 2]},
+            {'guess': self.max_number + 1},
+            {'guess': self.min_number - 1},
+            {'guess': '9' * 5000},
+        ])
+
+
+STRATEGIES = {
+    'random': RandomPlayer,
+    'binary': BinarySearchPlayer,
+    'adversarial': AdversarialPlayer,
+}
+
+
+# --- Recording and reporting --------------------------------------------
+
+class Recorder:
+    """Collects latencies per endpoint; one instance per worker thread"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def timed(self, transport, method, path, body=None):
+        start = time.perf_counter()
+        status, data = transport.request(method, path, body)
+        elapsed = time.perf_counter() - start
+        key = f'{method} {path}'
+        self.latencies.setdefault(key, []).append(elapsed)
+        if status >= 500:
+            self.errors[key] = self.errors.get(key, 0) + 1
+        return status, data
+
+    def merge(self, other):
+        for key, values in other.latencies.items():
+            self.latencies.setdefault(key, []).extend(values)
+        for key, count in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + count
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder, wall_time):
+    """Turn raw latencies into per-endpoint and overall statistics"""
+    endpoints = {}
+    total = 0
+    for key, values in sorted(recorder.latencies.items()):
+        values.sort()
+        total += len(values)
+        endpoints[key] = {
+            'requests': len(values),
+            'errors': recorder.errors.get(key, 0),
+            'rps': len(values) / wall_time,
+            'mean_ms': 1000 * sum(values) / len(values),
+            'p50_ms': 1000 * percentile(values, 0.50),
+            'p95_ms': 1000 * percentile(values, 0.95),
+            'p99_ms': 1000 * percentile(values, 0.99),
+        }
+    return {
+        'wall_time_s': wall_time,
+        'total_requests': total,
+        'rps': total / wall_time,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(summary):
+    print(f"\n{'endpoint':<20}{'requests':>10}{'errors':>8}{'rps':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for key, stats in summary['endpoints'].items():
+        print(f"{key:<20}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>11.1f}"
+              f"{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}{stats['p99_ms']:>9.3f}")
+    print(f"\nTotal: {summary['total_requests']} requests in {summary['wall_time_s']:.2f}s "
+          f"({summary['rps']:.1f} req/s)")
+
+
+def compare(summary, baseline, threshold):
+    """
+    Report endpoints whose p95 latency or throughput regressed
+
+    Returns:
+        list: Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for key, stats in summary['endpoints'].items():
+        before = baseline['summary']['endpoints'].get(key)
+        if not before:
+            continue
+        if stats['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{key}: p95 {before['p95_ms']:.3f}ms -> {stats['p95_ms']:.3f}ms")
+        if stats['rps'] < before['rps'] * (1 - threshold):
+            regressions.append(f"{key}: rps {before['rps']:.1f} -> {stats['rps']:.1f}")
+    return regressions
+
+
+# --- Driver -------------------------------------------------------------
+
+def play_games(make_transport, args, worker_index):
+    """Play this worker's share of games and return its Recorder"""
+    recorder = Recorder()
+    rng = random.Random(args.seed + worker_index)
+    player_class = STRATEGIES[args.strategy]
+    transport = make_transport()
+    games = args.games // args.concurrency + (1 if worker_index < args.games % args.concurrency else 0)
+
+    for _ in range(games):
+        status, _ = recorder.timed(transport, 'POST', '/start',
+                                   {'min_number': args.min_number, 'max_number': args.max_number})
+        if status != 200:
+            continue
+        player = player_class(args.min_number, args.max_number, rng)
+        for turn in range(1, args.max_requests + 1):
+            payload = player.next_payload()
+            if args.hint_rate and rng.random() < args.hint_rate:
+                payload['get_hint'] = True
+            status, data = recorder.timed(transport, 'POST', '/guess', payload)
+            if status == 200:
+                player.observe(payload['guess'], data)
+                if data.get('correct'):
+                    break
+            if args.status_every and turn % args.status_every == 0:
+                recorder.timed(transport, 'GET', '/status')
+        recorder.timed(transport, 'POST', '/reset')
+    return recorder
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the AI Guess Master backend')
+    parser.add_argument('--games', type=int, default=500, help='Games to play in total')
+    parser.add_argument('--concurrency', type=int, default=1, help='Simulated players at once')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='binary')
+    parser.add_argument('--min-number', type=int, default=1)
+    parser.add_argument('--max-number', type=int, default=100)
+    parser.add_argument('--hint-rate', type=float, default=0.5, help='Fraction of guesses asking for a hint')
+    parser.add_argument('--status-every', type=int, default=3, help='Call /status every N guesses (0 = never)')
+    parser.add_argument('--max-requests', type=int, default=200, help='Guess requests per game before giving up')
+    parser.add_argument('--transport', choices=['test-client', 'http'], default='test-client')
+    parser.add_argument('--url', help='Benchmark an already running server instead of a local one')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--label', help='Free-form label stored in the JSON results')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Baseline JSON results to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed regression (0.10 = 10%%)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.concurrency = max(1, min(args.concurrency, args.games))
+
+    server = None
+    if args.url:
+        base_url = args.url
+        make_transport = lambda: HTTPTransport(base_url)
+    else:
+        # Every simulated player shares one address; do not throttle them
+        os.environ.setdefault('RATE_LIMIT', '0')
+        # Synthetic games must not land in the real databases in the working directory
+        data_dir = tempfile.TemporaryDirectory(prefix='benchmark-')
+        os.environ['LEADERBOARD_PATH'] = os.path.join(data_dir.name, 'leaderboard.db')
+        os.environ['PLAYER_PROFILES_PATH'] = os.path.join(data_dir.name, 'player_profiles.db')
+        os.environ['GAME_STORE_PATH'] = os.path.join(data_dir.name, 'games.db')
+        from app import create_app
+        # Warm up first so the first measured games do not pay for it
+        app = create_app(background=False)
+        if args.transport == 'http':
+            server, base_url = start_local_server(app)
+            make_transport = lambda: HTTPTransport(base_url)
+        else:
+            make_transport = lambda: TestClientTransport(app)
+
+    print(f"🏁 {args.games} {args.strategy} games, concurrency {args.concurrency}, "
+          f"range {args.min_number}-{args.max_number}, transport {args.url or args.transport}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        recorders = list(pool.map(lambda i: play_games(make_transport, args, i), range(args.concurrency)))
+    wall_time = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+
+    recorder = Recorder()
+    for other in recorders:
+        recorder.merge(other)
+    summary = summarize(recorder, wall_time)
+    print_report(summary)
+
+    results = {
+        'label': args.label,
+        'git_revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'summary': summary,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(summary, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.threshold:.0%} against {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
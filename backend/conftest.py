@@ -0,0 +1,51 @@
+"""Shared setup for the in-process tests
+
+    python -m pytest backend
+
+app.py reads its configuration when it is imported, so the environment
+is fixed here first: games in memory, SQLite files in a throwaway
+directory, no rate limiter around the app (test_ratelimit.py builds its
+own), and the profiler in trace mode for requests that ask for it, so
+the admin endpoint's stacks do not depend on sampling timing.
+"""
+import os
+import tempfile
+
+import pytest
+
+# Scripts that drive a live server on :5000 with requests; run them with python
+collect_ignore = ['test_backend.py']
+
+_data_dir = tempfile.TemporaryDirectory(prefix='guessmaster-tests-')
+
+for _name in ('ADMIN_TOKEN', 'COMMIT_REVEAL', 'DISCLOSE_SECRET', 'GAME_EVENT_LOG', 'HINT_PROVIDER_URL',
+              'TRUSTED_PROXY_HOPS'):
+    os.environ.pop(_name, None)
+os.environ.update(
+    FLASK_SECRET_KEY='test-secret-key',
+    GAME_STORE='memory',
+    LEADERBOARD_PATH=os.path.join(_data_dir.name, 'leaderboard.db'),
+    PLAYER_PROFILES_PATH=os.path.join(_data_dir.name, 'player_profiles.db'),
+    RATE_LIMIT='0',
+    WARM_UP='0',
+    PROFILE='trace',
+    PROFILE_RATE='0',
+    ROOMS='1',
+)
+
+
+def pytest_unconfigure(config):
+    _data_dir.cleanup()
+
+
+@pytest.fixture
+def backend():
+    """The app module, imported once with the environment above"""
+    import app
+    return app
+
+
+@pytest.fixture
+def client(backend):
+    """A test client with its own cookie jar, i.e. a new player"""
+    return backend.create_app(background=False).test_client()
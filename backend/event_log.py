@@ -0,0 +1,92 @@
+import atexit
+import os
+import struct
+import threading
+
+# One fixed-size little-endian record per guess:
+# player id, game key, attempt, guess, secret, min, max, hinted, result code
+EVENT_RECORD = struct.Struct('<QQIqqqqBb')
+
+# Secret field of a guess made while a commit-reveal game was still hiding
+# its secret; the guess that ends the game carries the real one
+SECRET_UNKNOWN = -2 ** 63
+
+# Matching NumPy dtype, spelled out so analytics can load the file directly
+EVENT_FIELDS = [
+    ('player_id', '<u8'),
+    ('game_key', '<u8'),
+    ('attempt', '<u4'),
+    ('guess', '<i8'),
+    ('secret', '<i8'),
+    ('min_number', '<i8'),
+    ('max_number', '<i8'),
+    ('hinted', 'u1'),
+    ('code', 'i1'),
+]
+
+
+def game_key(game_id):
+    """Compact 64-bit key for an opaque hex game id"""
+    return int(game_id[:16], 16)
+
+
+class GameEventLog:
+    """Append-only binary log of every guess, buffered in memory
+
+    Records are flushed in whole-record writes to a file opened for append,
+    so several worker processes can share one log without interleaving.
+    """
+
+    def __init__(self, path, flush_bytes=64 * 1024):
+        """
+        Args:
+            path (str): Log file, created if missing
+            flush_bytes (int): Buffered bytes that trigger a write
+        """
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        atexit.register(self.close)
+
+    def record(self, player_id, game_id, attempt, guess, secret_number,
+               min_number, max_number, hinted, code):
+        """Buffer one guess event, writing the buffer out once it is full"""
+        packed = EVENT_RECORD.pack(player_id, game_key(game_id), attempt, guess, secret_number,
+                                   min_number, max_number, 1 if hinted else 0, code)
+        with self._lock:
+            self._buffer += packed
+            if len(self._buffer) >= self.flush_bytes:
+                self._flush()
+
+    def flush(self):
+        """Write out any buffered events"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            os.write(self._fd, self._buffer)
+            self._buffer.clear()
+
+    def close(self):
+        """Flush and close the file; safe to call more than once"""
+        with self._lock:
+            if self._fd is not None:
+                self._flush()
+                os.close(self._fd)
+                self._fd = None
+
+
+def open_event_log(path=None):
+    """
+    Open the event log configured by argument or $GAME_EVENT_LOG
+
+    Returns:
+        GameEventLog: The log, or None when event logging is disabled
+    """
+    path = path or os.environ.get('GAME_EVENT_LOG')
+    if not path:
+        return None
+    return GameEventLog(path)
@@ -0,0 +1,128 @@
+"""Commit-reveal secrets derived from a server key
+
+In commit-reveal mode a game stores a random nonce instead of its secret
+number, which is recomputed from the nonce with HMAC-SHA256 under the
+server key whenever a guess is checked. Beyond the nonce the game store
+holds only the feedback bounds, never a distance to the secret, and the
+event log gets the secret once the game is over. A salted hash of the
+secret is published at /start as a commitment, and the secret and salt
+are revealed when the game ends. Anyone can then check the
+commitment and confirm the secret never changed during the game:
+
+    python backend/fairness.py <commitment> <secret_number> <salt>
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import sys
+
+NONCE_BYTES = 16
+SALT_BYTES = 16
+
+
+class SecretDeriver:
+    """Derives each game's secret number and commitment salt from its nonce"""
+
+    def __init__(self, key):
+        """
+        Args:
+            key (bytes): Server key; every worker must use the same one
+        """
+        # The keyed state is computed once and copied per derivation
+        self._hmac = hmac.new(key, digestmod=hashlib.sha256)
+
+    def _prf(self, label, nonce, *values):
+        mac = self._hmac.copy()
+        mac.update(b':'.join([label, nonce.encode('ascii')] + [str(value).encode('ascii') for value in values]))
+        return mac.digest()
+
+    @staticmethod
+    def new_nonce():
+        """A fresh random nonce for a new game"""
+        return secrets.token_hex(NONCE_BYTES)
+
+    def secret_number(self, nonce, min_number, max_number):
+        """
+        The game's secret number, uniform over the range up to a 2**-200 bias
+
+        Args:
+            nonce (str): The game's nonce
+            min_number (int): Lowest possible secret number
+            max_number (int): Highest possible secret number
+
+        Returns:
+            int: Secret number
+        """
+        value = int.from_bytes(self._prf(b'secret', nonce, min_number, max_number), 'big')
+        return min_number + value % (max_number - min_number + 1)
+
+    def salt(self, nonce):
+        """The game's commitment salt, kept private until the reveal"""
+        return self._prf(b'salt', nonce)[:SALT_BYTES].hex()
+
+    def commit(self, nonce, min_number, max_number):
+        """Commitment published at /start"""
+        return commitment(self.secret_number(nonce, min_number, max_number), self.salt(nonce))
+
+    def reveal(self, nonce, min_number, max_number):
+        """
+        What a finished game discloses so its commitment can be checked
+
+        Returns:
+            dict: secret_number and salt
+        """
+        return {
+            'secret_number': self.secret_number(nonce, min_number, max_number),
+            'salt': self.salt(nonce)
+        }
+
+
+def commitment(secret_number, salt):
+    """SHA-256 over '<salt>:<secret_number>', as hex"""
+    return hashlib.sha256(f'{salt}:{secret_number}'.encode('ascii')).hexdigest()
+
+
+def verify_commitment(published, secret_number, salt):
+    """
+    Check a revealed secret against the commitment published at /start
+
+    Args:
+        published (str): Commitment from the /start response
+        secret_number (int): Revealed secret number
+        salt (str): Revealed salt
+
+    Returns:
+        bool: True if the game kept the secret it committed to
+    """
+    return hmac.compare_digest(commitment(secret_number, salt), published.lower())
+
+
+def create_secret_deriver(fallback_key=None):
+    """
+    Build the deriver for commit-reveal mode, or None when it is off
+
+    Args:
+        fallback_key (str): Key to derive from when $GAME_SECRET_KEY is unset,
+            normally the Flask secret key
+
+    Returns:
+        SecretDeriver or None: None unless $COMMIT_REVEAL=1
+    """
+    if os.environ.get('COMMIT_REVEAL', '0') != '1':
+        return None
+    key = os.environ.get('GAME_SECRET_KEY')
+    if key:
+        return SecretDeriver(key.encode('utf-8'))
+    print("⚠️  GAME_SECRET_KEY is not set; deriving game secrets from the Flask secret key")
+    # Kept separate from cookie signing by deriving a dedicated key
+    return SecretDeriver(hmac.new(fallback_key.encode('utf-8'), b'game-secrets', hashlib.sha256).digest())
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        print('usage: python fairness.py <commitment> <secret_number> <salt>')
+        sys.exit(2)
+    fair = verify_commitment(sys.argv[1], int(sys.argv[2]), sys.argv[3])
+    print('✅ Commitment matches: the secret was fixed at /start' if fair else '❌ Commitment does not match')
+    sys.exit(0 if fair else 1)
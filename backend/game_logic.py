@@ -1,9 +1,39 @@
+import random
+from game_state import GuessTracker
+
+DEFAULT_MIN_NUMBER = 1
+DEFAULT_MAX_NUMBER = 100
+# Largest allowed span (max_number - min_number) for a single game
+MAX_RANGE_SPAN = 10 ** 12
+
+# Compact result codes returned by check_guess alongside the message
+TOO_LOW = -1
+CORRECT = 0
+TOO_HIGH = 1
+
 class GameLogic:
     """Handles the core game logic for the number guessing game"""
     
-    def __init__(self):
-        self.min_number = 1
-        self.max_number = 100
+    def __init__(self, min_number=DEFAULT_MIN_NUMBER, max_number=DEFAULT_MAX_NUMBER):
+        self.min_number = min_number
+        self.max_number = max_number
+    
+    def pick_secret(self, min_number=None, max_number=None):
+        """
+        Pick a secret number uniformly from the range
+        
+        Args:
+            min_number (int): Lower bound (defaults to self.min_number)
+            max_number (int): Upper bound (defaults to self.max_number)
+            
+        Returns:
+            int: The secret number
+        """
+        if min_number is None:
+            min_number = self.min_number
+        if max_number is None:
+            max_number = self.max_number
+        return random.randint(min_number, max_number)
     
     def check_guess(self, guess, secret_number):
         """
@@ -14,84 +44,49 @@ class GameLogic:
             secret_number (int): The secret number to guess
             
         Returns:
-            dict: Contains 'correct' (bool) and 'message' (str)
+            dict: Contains 'correct' (bool), 'code' (TOO_LOW, CORRECT or
+                TOO_HIGH) and 'message' (str)
         """
         if guess == secret_number:
             return {
                 'correct': True,
+                'code': CORRECT,
                 'message': 'Correct! You found the number!'
             }
         elif guess < secret_number:
             return {
                 'correct': False,
+                'code': TOO_LOW,
                 'message': f'Too low! The number is higher than {guess}.'
             }
         else:
             return {
                 'correct': False,
+                'code': TOO_HIGH,
                 'message': f'Too high! The number is lower than {guess}.'
             }
     
-    def validate_guess(self, guess):
-        """
-        Validate that a guess is within the valid range
-        
-        Args:
-            guess: The guess to validate
-            
-        Returns:
-            tuple: (is_valid, error_message)
-        """
-        try:
-            guess_int = int(guess)
-            if guess_int < self.min_number or guess_int > self.max_number:
-                return False, f'Guess must be between {self.min_number} and {self.max_number}'
-            return True, None
-        except (ValueError, TypeError):
-            return False, 'Guess must be a valid number'
-    
-    def calculate_difference(self, guess, secret_number):
-        """
-        Calculate the absolute difference between guess and secret number
-        
-        Args:
-            guess (int): The player's guess
-            secret_number (int): The secret number
-            
-        Returns:
-            int: Absolute difference
-        """
-        return abs(guess - secret_number)
-    
-    def get_guess_statistics(self, guesses, secret_number):
+    def get_guess_statistics(self, guesses, secret_number, tracker=None):
         """
         Get statistics about the player's guesses
         
         Args:
             guesses (list): List of previous guesses
             secret_number (int): The secret number
+            tracker (GuessTracker): Incremental state for the game; the
+                statistics are read from it in O(1) unless it was restored
+                from the game store, which keeps none
             
         Returns:
             dict: Statistics about the guesses
         """
-        if not guesses:
-            return {
-                'total_guesses': 0,
-                'closest_guess': None,
-                'furthest_guess': None,
-                'average_difference': 0
-            }
-        
-        differences = [self.calculate_difference(g, secret_number) for g in guesses]
-        
-        return {
-            'total_guesses': len(guesses),
-            'closest_guess': min(guesses, key=lambda x: self.calculate_difference(x, secret_number)),
-            'furthest_guess': max(guesses, key=lambda x: self.calculate_difference(x, secret_number)),
-            'average_difference': sum(differences) / len(differences)
-        }
+        if tracker is None or not tracker.has_statistics:
+            min_number = tracker.min_number if tracker is not None else self.min_number
+            max_number = tracker.max_number if tracker is not None else self.max_number
+            tracker = GuessTracker.from_guesses(guesses, secret_number, min_number, max_number)
+        return tracker.statistics()
     
-    def is_guess_reasonable(self, guess, previous_guesses, secret_number):
+    def is_guess_reasonable(self, guess, previous_guesses, secret_number, tracker=None):
         """
         Check if a guess is reasonable based on previous feedback
         
@@ -99,18 +94,16 @@ class GameLogic:
             guess (int): The current guess
             previous_guesses (list): List of previous guesses
             secret_number (int): The secret number
+            tracker (GuessTracker): Incremental state for the previous
+                guesses; when given the check is O(1)
             
         Returns:
             bool: True if the guess is reasonable
         """
-        if not previous_guesses:
-            return True
-        
-        # Check if the guess is within the range suggested by previous guesses
-        for prev_guess in previous_guesses:
-            if prev_guess < secret_number and guess <= prev_guess:
-                return False  # Should guess higher
-            elif prev_guess > secret_number and guess >= prev_guess:
-                return False  # Should guess lower
+        if tracker is None:
+            if not previous_guesses:
+                return True
+            tracker = GuessTracker.from_guesses(previous_guesses, secret_number, self.min_number, self.max_number)
         
-        return True
+        # The guess must fall strictly inside the range left by previous feedback
+        return tracker.is_reasonable(guess)
@@ -0,0 +1,138 @@
+class GuessTracker:
+    """Incrementally tracked summary of a game's guesses
+
+    Every guess updates the tracker in O(1), so hints and statistics never
+    need to rescan the guess history.
+
+    Only the bounds and the guess count are saved with the game: they are
+    exactly what the feedback has already told the player. The distance
+    statistics are not, since closest +/- closest_diff is the secret, so a
+    restored tracker has no statistics and they are rebuilt from the
+    guesses when a hint needs them (see GameLogic.get_guess_statistics).
+    """
+
+    __slots__ = ('min_number', 'max_number', 'low', 'high', 'closest',
+                 'closest_diff', 'furthest', 'furthest_diff',
+                 'total_difference', 'count', 'has_statistics')
+
+    # What to_dict() saves; everything here is known to the player
+    STORED = ('min_number', 'max_number', 'low', 'high', 'count')
+
+    def __init__(self, min_number=1, max_number=100):
+        self.min_number = min_number
+        self.max_number = max_number
+        self.low = None            # Highest guess that was too low
+        self.high = None           # Lowest guess that was too high
+        self.closest = None
+        self.closest_diff = None
+        self.furthest = None
+        self.furthest_diff = None
+        self.total_difference = 0
+        self.count = 0
+        self.has_statistics = True
+
+    @classmethod
+    def from_guesses(cls, guesses, secret_number, min_number=1, max_number=100):
+        """
+        Build a tracker by replaying an existing guess history
+
+        Args:
+            guesses (list): Previous guesses in order
+            secret_number (int): The secret number
+            min_number (int): Lowest possible secret number
+            max_number (int): Highest possible secret number
+
+        Returns:
+            GuessTracker: Tracker reflecting every guess
+        """
+        tracker = cls(min_number, max_number)
+        for guess in guesses:
+            tracker.record(guess, secret_number)
+        return tracker
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a tracker saved with to_dict(), without its statistics unless it is empty"""
+        tracker = cls()
+        if data:
+            for name in cls.STORED:
+                setattr(tracker, name, data[name])
+            tracker.has_statistics = not tracker.count
+        return tracker
+
+    def to_dict(self):
+        """Serialize the bounds for storage alongside the game state; no distances to the secret"""
+        return {name: getattr(self, name) for name in self.STORED}
+
+    def record(self, guess, secret_number):
+        """
+        Fold one guess into the tracker
+
+        Args:
+            guess (int): The player's guess
+            secret_number (int): The secret number
+        """
+        if guess < secret_number:
+            if self.low is None or guess > self.low:
+                self.low = guess
+        elif guess > secret_number:
+            if self.high is None or guess < self.high:
+                self.high = guess
+
+        self.count += 1
+        if not self.has_statistics:
+            return
+        difference = abs(guess - secret_number)
+        if self.closest_diff is None or difference < self.closest_diff:
+            self.closest = guess
+            self.closest_diff = difference
+        if self.furthest_diff is None or difference > self.furthest_diff:
+            self.furthest = guess
+            self.furthest_diff = difference
+        self.total_difference += difference
+
+    def lower_bound(self):
+        """Lowest number the secret can still be"""
+        return self.low + 1 if self.low is not None else self.min_number
+
+    def upper_bound(self):
+        """Highest number the secret can still be"""
+        return self.high - 1 if self.high is not None else self.max_number
+
+    def is_reasonable(self, guess):
+        """
+        Check whether a guess respects all feedback recorded so far
+
+        Args:
+            guess (int): The guess to check
+
+        Returns:
+            bool: True if the guess lies strictly inside the known bounds
+        """
+        if self.low is not None and guess <= self.low:
+            return False
+        if self.high is not None and guess >= self.high:
+            return False
+        return True
+
+    def statistics(self):
+        """
+        Summarize the recorded guesses; only for a tracker with has_statistics
+
+        Returns:
+            dict: Same shape as GameLogic.get_guess_statistics()
+        """
+        if not self.count:
+            return {
+                'total_guesses': 0,
+                'closest_guess': None,
+                'furthest_guess': None,
+                'average_difference': 0
+            }
+
+        return {
+            'total_guesses': self.count,
+            'closest_guess': self.closest,
+            'furthest_guess': self.furthest,
+            'average_difference': self.total_difference / self.count
+        }
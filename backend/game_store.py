@@ -0,0 +1,312 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Striped locks serialize concurrent guesses on the same game within a process
+LOCK_STRIPES = 64
+
+
+class GameConflict(Exception):
+    """Another process saved the game while this transaction was using it"""
+
+
+class GameTransaction:
+    """A private copy of one game's state inside store.transaction()
+
+    Call save() after changing the state; unchanged games are not written,
+    and nothing is written if the transaction body raises.
+    """
+
+    __slots__ = ('game_id', 'state', 'dirty')
+
+    def __init__(self, game_id, state):
+        self.game_id = game_id
+        self.state = state
+        self.dirty = False
+
+    def save(self):
+        """Mark the state to be written when the transaction ends"""
+        self.dirty = True
+
+
+class MemoryGameStore:
+    """Keeps game state in a process-local dict with TTL and size-capped eviction
+
+    Games are kept in the order they were last saved. Every game has the
+    same TTL, so that is also the order they expire in: each save moves
+    its game to the back and drops expired games from the front, and the
+    first live game found ends the scan. Expiry therefore costs O(1)
+    amortized per save, however many abandoned games there are, and
+    never needs a full sweep. Past max_games the least recently saved
+    games are evicted from the same end.
+    """
+
+    def __init__(self, ttl=3600, max_games=0):
+        """
+        Args:
+            ttl (int): Seconds a game may sit untouched before it is evicted
+            max_games (int): Games kept at most; 0 means unlimited
+        """
+        self.ttl = ttl
+        self.max_games = max_games
+        self.evictions = {'expired': 0, 'capacity': 0}
+        self._games = OrderedDict()     # game_id -> (expires_at, state), least recently saved first
+        self._lock = threading.Lock()
+        self._game_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def create(self, state):
+        """
+        Store a new game and return its id
+
+        Args:
+            state (dict): Initial game state
+
+        Returns:
+            str: Opaque game id to hand to the client
+        """
+        game_id = uuid.uuid4().hex
+        self.save(game_id, state)
+        return game_id
+
+    def get(self, game_id):
+        """
+        Look up a game by id
+
+        Args:
+            game_id (str): Id returned by create()
+
+        Returns:
+            dict: The game state, or None if unknown or expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                return None
+            if entry[0] < now:
+                del self._games[game_id]
+                self.evictions['expired'] += 1
+                return None
+            return entry[1]
+
+    def save(self, game_id, state):
+        """Store the game state and push back its expiry"""
+        now = time.monotonic()
+        with self._lock:
+            self._games[game_id] = (now + self.ttl, state)
+            self._games.move_to_end(game_id)
+            self._evict(now)
+
+    def delete(self, game_id):
+        """Forget a game"""
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    @contextmanager
+    def transaction(self, game_id):
+        """
+        Read-modify-write one game without interleaving other guesses on it
+
+        The state is copied, so a body that fails halfway leaves the stored
+        game as it was.
+
+        Yields:
+            GameTransaction: .state is None if the game is unknown or expired
+        """
+        with self._game_locks[hash(game_id) % LOCK_STRIPES]:
+            txn = GameTransaction(game_id, copy.deepcopy(self.get(game_id)))
+            yield txn
+            if txn.dirty and txn.state is not None:
+                self.save(game_id, txn.state)
+
+    def __len__(self):
+        return len(self._games)
+
+    def _evict(self, now):
+        """Drop expired games, then any over max_games, oldest first. Caller must hold the lock."""
+        games = self._games
+        while games:
+            expires_at = games[next(iter(games))][0]
+            if expires_at < now:
+                reason = 'expired'
+            elif self.max_games and len(games) > self.max_games:
+                reason = 'capacity'
+            else:
+                return
+            games.popitem(last=False)
+            self.evictions[reason] += 1
+
+
+class SQLiteGameStore:
+    """Keeps game state as JSON rows in a SQLite file so it survives restarts
+
+    The database runs in WAL mode, so readers never block the writer and
+    several worker processes can share one file. Connections are opened
+    per thread and re-opened after a fork. Each row carries a version that
+    every write bumps, which lets transaction() detect a concurrent write
+    to its game without locking any other.
+    """
+
+    def __init__(self, path='games.db', ttl=3600, sweep_interval=60, max_games=0):
+        """
+        Args:
+            path (str): SQLite database file
+            ttl (int): Seconds a game may sit untouched before it is evicted
+            sweep_interval (int): Minimum seconds between eviction sweeps
+            max_games (int): Games kept after each sweep, least recently
+                saved evicted first; 0 means unlimited
+        """
+        self.path = path
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.max_games = max_games
+        self.evictions = {'expired': 0, 'capacity': 0}   # by this process's sweeps
+        self._local = threading.local()
+        self._next_sweep = time.time() + sweep_interval
+        self._game_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            'game_id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL, '
+            'version INTEGER NOT NULL DEFAULT 0)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS games_expires_at ON games (expires_at)')
+        # Files created before rows were versioned
+        if 'version' not in [column[1] for column in conn.execute('PRAGMA table_info(games)')]:
+            try:
+                conn.execute('ALTER TABLE games ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+            except sqlite3.OperationalError:
+                pass    # another worker added it first
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use or after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, state):
+        """Store a new game and return its id"""
+        game_id = uuid.uuid4().hex
+        self.save(game_id, state)
+        return game_id
+
+    def get(self, game_id):
+        """Look up a game by id, returning None if unknown or expired"""
+        row = self._connection().execute(
+            'SELECT state FROM games WHERE game_id = ? AND expires_at >= ?',
+            (game_id, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def save(self, game_id, state):
+        """Store the game state and push back its expiry"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            'INSERT INTO games (game_id, state, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT (game_id) DO UPDATE SET '
+            'state = excluded.state, expires_at = excluded.expires_at, version = version + 1',
+            (game_id, json.dumps(state, separators=(',', ':')), now + self.ttl)
+        )
+        self._maybe_sweep(conn, now)
+
+    def _maybe_sweep(self, conn, now):
+        """Sweep if sweep_interval has passed since the last sweep"""
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self._sweep(conn, now)
+
+    def _sweep(self, conn, now):
+        """Delete expired games, then the least recently saved beyond max_games"""
+        self.evictions['expired'] += conn.execute('DELETE FROM games WHERE expires_at < ?', (now,)).rowcount
+        if self.max_games:
+            excess = conn.execute('SELECT COUNT(*) FROM games').fetchone()[0] - self.max_games
+            if excess > 0:
+                self.evictions['capacity'] += conn.execute(
+                    'DELETE FROM games WHERE game_id IN '
+                    '(SELECT game_id FROM games ORDER BY expires_at LIMIT ?)', (excess,)
+                ).rowcount
+
+    def delete(self, game_id):
+        """Forget a game"""
+        self._connection().execute('DELETE FROM games WHERE game_id = ?', (game_id,))
+
+    @contextmanager
+    def transaction(self, game_id):
+        """
+        Read-modify-write one game atomically across threads and processes
+
+        The game is read with its version and written back only if the
+        version is unchanged (UPDATE ... WHERE version = ?), so no database
+        lock is held while the caller works and guesses on different games
+        never wait for each other. Within a process, striped locks queue
+        guesses on the same game; a guess that races one on the same game
+        in another process raises GameConflict instead of overwriting it.
+
+        Yields:
+            GameTransaction: .state is None if the game is unknown or expired
+
+        Raises:
+            GameConflict: The game was saved or deleted by someone else
+                since it was read; nothing was written
+        """
+        with self._game_locks[hash(game_id) % LOCK_STRIPES]:
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT state, version FROM games WHERE game_id = ? AND expires_at >= ?',
+                (game_id, time.time())
+            ).fetchone()
+            txn = GameTransaction(game_id, json.loads(row[0]) if row is not None else None)
+            yield txn
+            if not txn.dirty or txn.state is None or row is None:
+                return
+            now = time.time()
+            updated = conn.execute(
+                'UPDATE games SET state = ?, expires_at = ?, version = version + 1 '
+                'WHERE game_id = ? AND version = ?',
+                (json.dumps(txn.state, separators=(',', ':')), now + self.ttl, game_id, row[1])
+            ).rowcount
+            if not updated:
+                raise GameConflict(game_id)
+            self._maybe_sweep(conn, now)
+
+
+def create_game_store(kind=None, path=None, ttl=None, max_games=None):
+    """
+    Build the game store selected by arguments or environment
+
+    Args:
+        kind (str): 'memory' or 'sqlite' (default: $GAME_STORE or 'memory')
+        path (str): SQLite file (default: $GAME_STORE_PATH or 'games.db')
+        ttl (int): Idle seconds before eviction (default: $GAME_TTL or 3600)
+        max_games (int): Games kept at most, 0 for no cap
+            (default: $GAME_STORE_MAX_GAMES or 100000)
+
+    Returns:
+        MemoryGameStore or SQLiteGameStore
+    """
+    kind = kind or os.environ.get('GAME_STORE', 'memory')
+    ttl = int(ttl or os.environ.get('GAME_TTL', 3600))
+    if max_games is None:
+        max_games = int(os.environ.get('GAME_STORE_MAX_GAMES', 100000))
+
+    if kind == 'memory':
+        return MemoryGameStore(ttl=ttl, max_games=max_games)
+    if kind == 'sqlite':
+        path = path or os.environ.get('GAME_STORE_PATH', 'games.db')
+        return SQLiteGameStore(path=path, ttl=ttl, max_games=max_games)
+    raise ValueError(f'Unknown game store: {kind}')
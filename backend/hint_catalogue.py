@@ -0,0 +1,79 @@
+from functools import lru_cache
+from string import Formatter
+
+
+class HintCatalogue:
+    """Hint templates compiled once, with an LRU of rendered variants
+
+    Rendering depends only on (hint kind, lower, upper, guess), so every
+    variant of a kind is rendered together on a miss and cached as a tuple.
+    A hit is a single lru_cache lookup; the caller then picks a variant.
+    """
+
+    def __init__(self, templates, max_entries=8192):
+        """
+        Args:
+            templates (dict): Hint kind -> list of str.format templates
+            max_entries (int): Rendered (kind, lower, upper, guess) entries kept
+        """
+        self._compiled = {kind: self._compile(variants) for kind, variants in templates.items()}
+        self._render_variants = lru_cache(maxsize=max_entries)(self._render_all)
+
+    @staticmethod
+    def _compile(variants):
+        """Split variants into pre-rendered constants and bound format calls"""
+        compiled = []
+        for template in variants:
+            fields = [field for _, field, _, _ in Formatter().parse(template) if field is not None]
+            compiled.append(template.format if fields else template)
+        return tuple(compiled)
+
+    def _render_all(self, kind, lower, upper, guess, attempts):
+        """Render every variant of a kind for one game situation"""
+        span = upper - lower
+        values = {
+            'suggested_range': f"{lower}-{upper}",
+            'current_guess': guess,
+            'attempts': attempts,
+            'midpoint': (lower + upper) // 2,
+            'middle_range': f"{lower + span * 2 // 5}-{lower + span * 3 // 5}",
+        }
+        return tuple(
+            variant if isinstance(variant, str) else variant(**values)
+            for variant in self._compiled[kind]
+        )
+
+    def render(self, kind, lower, upper, guess=None, attempts=None):
+        """
+        Return every rendered variant of a hint kind
+
+        Args:
+            kind (str): Template group, e.g. 'too_high'
+            lower (int): Lowest number still possible (or range minimum)
+            upper (int): Highest number still possible (or range maximum)
+            guess (int): The current guess, if the template uses it
+            attempts (int): Attempts so far, if the template uses it
+
+        Returns:
+            tuple: Rendered hint strings
+        """
+        return self._render_variants(kind, lower, upper, guess, attempts)
+
+    def stats(self):
+        """
+        Report cache effectiveness
+
+        Returns:
+            dict: hits, misses, size and max_entries of the rendered-hint LRU
+        """
+        info = self._render_variants.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_entries': info.maxsize,
+        }
+
+    def clear(self):
+        """Drop every rendered hint and reset the counters"""
+        self._render_variants.cache_clear()
@@ -0,0 +1,225 @@
+"""Pluggable sources of hint text for AIHints
+
+A provider receives the game situation as the player sees it (range,
+remaining interval, last guess and its direction; never the secret) and
+returns a hint. Every provider gets a fallback callable producing the
+built-in template hint, which it must use whenever it cannot answer in time.
+
+    HINT_PROVIDER_URL=http://localhost:5055/hint python backend/app.py
+    python backend/hint_stub.py --delay 0.05     # local stand-in for a model
+"""
+import http.client
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from urllib.parse import urlsplit
+
+
+class TemplateHintProvider:
+    """The built-in template table; always answers immediately"""
+
+    def hint(self, context, fallback):
+        return fallback()
+
+    def prefetch(self, context, fallback):
+        return fallback()
+
+    def stats(self):
+        return {}
+
+
+class HTTPHintProvider:
+    """Hints from a model behind an HTTP endpoint, within a latency budget
+
+    Each call is made on a small thread pool over pooled keep-alive
+    connections. The request thread waits at most budget seconds and then
+    answers from the templates. The model call keeps running, and its
+    answer is cached for the next request in the same situation.
+    Identical concurrent requests share one call, and a full pool falls
+    back immediately instead of queueing. A slow or failing model
+    therefore never adds more than the budget to a /guess.
+
+    Prefetches run on a separate, smaller pool and never count against
+    the workers that player requests use. They are also skipped while
+    those workers are all busy, so prefetching yields to players.
+
+    The endpoint receives the context dict as JSON and must answer
+    {"hint": "..."}.
+    """
+
+    def __init__(self, url, budget=0.15, timeout=5.0, workers=8, prefetch_workers=2, cache_size=4096):
+        """
+        Args:
+            url (str): http:// URL of the hint endpoint
+            budget (float): Seconds a request waits before using the templates
+            timeout (float): Socket timeout for the model call itself
+            workers (int): Concurrent model calls for player requests
+            prefetch_workers (int): Concurrent model calls for prefetches
+            cache_size (int): Answers kept, keyed on the game situation
+        """
+        parts = urlsplit(url)
+        if parts.scheme != 'http':
+            raise ValueError(f'Unsupported hint provider URL: {url}')
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path or '/'
+        self.budget = budget
+        self.timeout = timeout
+        self.workers = workers
+        self.prefetch_workers = prefetch_workers
+        self.cache_size = cache_size
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hints')
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=prefetch_workers,
+                                                     thread_name_prefix='hint-prefetch')
+        self._connections = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()   # situation key -> hint
+        self._inflight = {}           # situation key -> Future
+        self._prefetching = set()     # keys in _inflight started by prefetch()
+        self._stats = dict.fromkeys(
+            ('requests', 'cache_hits', 'coalesced', 'model_hints', 'timeouts', 'errors', 'rejected',
+             'prefetches', 'prefetches_skipped'), 0)
+
+    @staticmethod
+    def _key(context):
+        """Situations that would get the same hint; attempts only change the wording"""
+        return (context['kind'], context['min_number'], context['max_number'],
+                context['lower_bound'], context['upper_bound'], context['guess'])
+
+    def hint(self, context, fallback):
+        """
+        A model hint if one is ready within the budget, otherwise fallback()
+
+        Args:
+            context (dict): Game situation sent to the model
+            fallback: Callable returning the template hint
+        """
+        key = self._key(context)
+        submitted = False
+        with self._lock:
+            self._stats['requests'] += 1
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats['cache_hits'] += 1
+                return cached
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats['coalesced'] += 1
+            elif len(self._inflight) - len(self._prefetching) >= self.workers:
+                # Every worker is busy; queueing would only add latency
+                self._stats['rejected'] += 1
+                return fallback()
+            else:
+                future = self._inflight[key] = self._executor.submit(self._fetch, context)
+                submitted = True
+        if submitted:
+            # Outside the lock: an already finished future runs the callback right here
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        try:
+            hint = future.result(timeout=self.budget)
+        except FutureTimeout:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            return fallback()
+        except Exception:
+            return fallback()
+        with self._lock:
+            self._stats['model_hints'] += 1
+        return hint
+
+    def prefetch(self, context, fallback):
+        """
+        Start fetching a hint that will probably be needed soon, without waiting
+
+        Returns:
+            str: The hint if already cached, otherwise None while it is fetched
+        """
+        key = self._key(context)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            if key in self._inflight:
+                return None
+            if (len(self._prefetching) >= self.prefetch_workers
+                    or len(self._inflight) - len(self._prefetching) >= self.workers):
+                # Its own pool is full, or players are using every worker
+                self._stats['prefetches_skipped'] += 1
+                return None
+            future = self._inflight[key] = self._prefetch_executor.submit(self._fetch, context)
+            self._prefetching.add(key)
+            self._stats['prefetches'] += 1
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return None
+
+    def _finish(self, key, future):
+        """Cache a completed call's answer and release its in-flight slot"""
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._prefetching.discard(key)
+            if future.exception() is not None:
+                self._stats['errors'] += 1
+                return
+            self._cache[key] = future.result()
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, context):
+        """POST the context to the model over a pooled connection"""
+        body = json.dumps(context).encode('utf-8')
+        try:
+            conn, reused = self._connections.get_nowait(), True
+        except queue.Empty:
+            conn, reused = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+        try:
+            try:
+                conn.request('POST', self.path, body, {'Content-Type': 'application/json'})
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                if not reused:
+                    raise
+                # The server closed an idle pooled connection; retry once on a new one
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                conn.request('POST', self.path, body, {'Content-Type': 'application/json'})
+                response = conn.getresponse()
+            data = response.read()
+            if response.status != 200:
+                raise RuntimeError(f'Hint provider answered {response.status}')
+            hint = json.loads(data)['hint']
+            if not isinstance(hint, str) or not hint:
+                raise ValueError('Hint provider returned no hint')
+        except Exception:
+            conn.close()
+            raise
+        self._connections.put(conn)
+        return hint
+
+    def stats(self):
+        """Counters for /metrics"""
+        with self._lock:
+            return dict(self._stats, cached=len(self._cache), inflight=len(self._inflight))
+
+
+def create_hint_provider(url=None, budget_ms=None):
+    """
+    Build the provider configured by arguments or environment
+
+    Args:
+        url (str): Hint endpoint (default: $HINT_PROVIDER_URL; unset means templates)
+        budget_ms (int): Latency budget in milliseconds (default: $HINT_BUDGET_MS or 150)
+
+    Returns:
+        TemplateHintProvider or HTTPHintProvider
+    """
+    url = url or os.environ.get('HINT_PROVIDER_URL')
+    if not url:
+        return TemplateHintProvider()
+    budget_ms = int(budget_ms or os.environ.get('HINT_BUDGET_MS', 150))
+    return HTTPHintProvider(url, budget=budget_ms / 1000)
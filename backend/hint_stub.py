@@ -0,0 +1,59 @@
+"""Local stand-in for a hint model, for development and tests
+
+    python backend/hint_stub.py --port 5055 --delay 0.05 --jitter 0.2
+
+Answers POST /hint with a hint written from the game situation after an
+artificial delay, so the backend's latency budget and fallback can be
+exercised without a real model.
+"""
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def write_hint(context):
+    """Phrase a hint the way a model might"""
+    lower, upper = context['lower_bound'], context['upper_bound']
+    middle = (lower + upper) // 2
+    if context['kind'] == 'first_guess':
+        return f"🤖 Model: open with {middle} and let each answer halve the range."
+    direction = 'lower' if context['kind'] == 'too_high' else 'higher'
+    return (f"🤖 Model: {context['guess']} was too {'high' if direction == 'lower' else 'low'}; "
+            f"the number is between {lower} and {upper}, so {middle} splits what is left.")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like a real model endpoint
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        context = json.loads(self.rfile.read(length))
+        time.sleep(self.server.delay + random.random() * self.server.jitter)
+        body = json.dumps({'hint': write_hint(context)}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a stub hint model')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--delay', type=float, default=0.05, help='Seconds before every answer')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random seconds, up to this much')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.delay = args.delay
+    server.jitter = args.jitter
+    print(f"🤖 Stub hint model on http://{args.host}:{args.port}/hint "
+          f"(delay {args.delay}s + up to {args.jitter}s)")
+    server.serve_forever()
@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Most entries a single top-N query returns
+MAX_LIMIT = 100
+
+
+class Leaderboard:
+    """Finished games ranked per number range, stored in SQLite
+
+    Games are ordered by attempts, then duration. Ranks use standard
+    competition ranking over (attempts, whole seconds): players tied on
+    both share a rank.
+
+    Top-N reads walk the (range, attempts, duration) index and stop after N
+    rows. A rank is 1 plus the number of strictly better games, and that
+    number comes from two small count tables kept up to date on every
+    insert: games per attempts value, and games per (attempts, second)
+    cell. A rank lookup therefore reads at most one row per distinct
+    attempts value plus one per distinct second within the player's
+    attempts value, however many games are stored.
+    """
+
+    def __init__(self, path='leaderboard.db'):
+        """
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY,
+                player_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                min_number INTEGER NOT NULL,
+                max_number INTEGER NOT NULL,
+                attempts INTEGER NOT NULL,
+                duration REAL NOT NULL,
+                hints_used INTEGER NOT NULL,
+                finished_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS scores_board
+                ON scores (min_number, max_number, attempts, duration, id);
+            CREATE INDEX IF NOT EXISTS scores_player
+                ON scores (player_id, min_number, max_number, attempts, duration);
+            CREATE TABLE IF NOT EXISTS score_attempts (
+                min_number INTEGER NOT NULL,
+                max_number INTEGER NOT NULL,
+                attempts INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (min_number, max_number, attempts)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS score_cells (
+                min_number INTEGER NOT NULL,
+                max_number INTEGER NOT NULL,
+                attempts INTEGER NOT NULL,
+                seconds INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (min_number, max_number, attempts, seconds)
+            ) WITHOUT ROWID;
+        ''')
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use or after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record(self, player_id, name, min_number, max_number, attempts, duration, hints_used):
+        """
+        Store a finished game
+
+        Args:
+            player_id (int): Winner's player id
+            name (str): Display name
+            min_number (int): Lowest number of the game's range
+            max_number (int): Highest number of the game's range
+            attempts (int): Guesses needed
+            duration (float): Seconds from start to win
+            hints_used (int): AI hints requested during the game
+
+        Returns:
+            int: The game's rank on its range's leaderboard
+        """
+        duration = max(0.0, float(duration))
+        seconds = int(duration)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT INTO scores (player_id, name, min_number, max_number, attempts, duration, '
+                'hints_used, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (player_id, name, min_number, max_number, attempts, duration, hints_used, time.time())
+            )
+            conn.execute(
+                'INSERT INTO score_attempts VALUES (?, ?, ?, 1) '
+                'ON CONFLICT (min_number, max_number, attempts) DO UPDATE SET count = count + 1',
+                (min_number, max_number, attempts)
+            )
+            conn.execute(
+                'INSERT INTO score_cells VALUES (?, ?, ?, ?, 1) '
+                'ON CONFLICT (min_number, max_number, attempts, seconds) DO UPDATE SET count = count + 1',
+                (min_number, max_number, attempts, seconds)
+            )
+            rank = self._rank(conn, min_number, max_number, attempts, seconds)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return rank
+
+    def _rank(self, conn, min_number, max_number, attempts, seconds):
+        better_attempts = conn.execute(
+            'SELECT COALESCE(SUM(count), 0) FROM score_attempts '
+            'WHERE min_number = ? AND max_number = ? AND attempts < ?',
+            (min_number, max_number, attempts)
+        ).fetchone()[0]
+        faster = conn.execute(
+            'SELECT COALESCE(SUM(count), 0) FROM score_cells '
+            'WHERE min_number = ? AND max_number = ? AND attempts = ? AND seconds < ?',
+            (min_number, max_number, attempts, seconds)
+        ).fetchone()[0]
+        return better_attempts + faster + 1
+
+    def rank(self, min_number, max_number, attempts, duration):
+        """Rank a game with this score would have"""
+        return self._rank(self._connection(), min_number, max_number, attempts, int(max(0.0, duration)))
+
+    def total(self, min_number, max_number):
+        """Games recorded for a range"""
+        return self._connection().execute(
+            'SELECT COALESCE(SUM(count), 0) FROM score_attempts WHERE min_number = ? AND max_number = ?',
+            (min_number, max_number)
+        ).fetchone()[0]
+
+    def top(self, min_number, max_number, limit=10):
+        """
+        Best games for a range
+
+        Returns:
+            list: Dicts with rank, name, attempts, duration, hints_used and finished_at
+        """
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        rows = self._connection().execute(
+            'SELECT name, attempts, duration, hints_used, finished_at FROM scores '
+            'WHERE min_number = ? AND max_number = ? ORDER BY attempts, duration, id LIMIT ?',
+            (min_number, max_number, limit)
+        ).fetchall()
+
+        entries = []
+        previous = None
+        for position, (name, attempts, duration, hints_used, finished_at) in enumerate(rows, 1):
+            key = (attempts, int(duration))
+            rank = entries[-1]['rank'] if key == previous else position
+            previous = key
+            entries.append({
+                'rank': rank,
+                'name': name,
+                'attempts': attempts,
+                'duration': round(duration, 2),
+                'hints_used': hints_used,
+                'finished_at': finished_at,
+            })
+        return entries
+
+    def player_best(self, player_id, min_number, max_number):
+        """
+        A player's best game for a range and its current rank
+
+        Returns:
+            dict: rank, total, attempts, duration and hints_used, or None if
+                the player has not finished a game in this range
+        """
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT attempts, duration, hints_used FROM scores '
+            'WHERE player_id = ? AND min_number = ? AND max_number = ? ORDER BY attempts, duration LIMIT 1',
+            (player_id, min_number, max_number)
+        ).fetchone()
+        if row is None:
+            return None
+        attempts, duration, hints_used = row
+        return {
+            'rank': self._rank(conn, min_number, max_number, attempts, int(duration)),
+            'total': self.total(min_number, max_number),
+            'attempts': attempts,
+            'duration': round(duration, 2),
+            'hints_used': hints_used,
+        }
+
+
+def open_leaderboard(path=None):
+    """
+    Open the leaderboard configured by argument or environment
+
+    Args:
+        path (str): SQLite file (default: $LEADERBOARD_PATH or 'leaderboard.db')
+
+    Returns:
+        Leaderboard
+    """
+    return Leaderboard(path or os.environ.get('LEADERBOARD_PATH', 'leaderboard.db'))
@@ -0,0 +1,108 @@
+"""How a game ends: won, out of attempts, or out of time
+
+A game's state carries an explicit status next to the legacy game_active
+flag. GameLimits moves it out of 'active' when the player wins, when a
+per-game attempt limit is used up, or once a wall-clock deadline set at
+/start has passed. Games nobody touches are not ended here: the game
+store expires them after its idle TTL and, when it holds too many games,
+evicts the least recently used.
+"""
+import os
+import time
+
+ACTIVE = 'active'
+WON = 'won'
+OUT_OF_ATTEMPTS = 'out_of_attempts'
+TIMED_OUT = 'timed_out'
+
+# Shown when a game ends without a win; formatted with the secret number
+FINAL_MESSAGES = {
+    OUT_OF_ATTEMPTS: 'Out of attempts! The number was {secret_number}.',
+    TIMED_OUT: 'Time is up! The number was {secret_number}.',
+}
+
+
+def status_of(state):
+    """A game's status, for states saved before the status field existed"""
+    status = state.get('status')
+    if status is None:
+        status = ACTIVE if state['game_active'] else WON
+    return status
+
+
+def finish(state, status):
+    """End a game with the given status"""
+    state['status'] = status
+    state['game_active'] = False
+
+
+class GameLimits:
+    """Per-game attempt and wall-clock limits"""
+
+    def __init__(self, max_attempts=0, time_limit=0):
+        """
+        Args:
+            max_attempts (int): Guesses allowed per game; 0 means unlimited
+            time_limit (float): Seconds from /start until the game ends; 0 means none
+        """
+        self.max_attempts = max_attempts
+        self.time_limit = time_limit
+
+    def start(self, state, now=None):
+        """Mark a new game active and give it its deadline"""
+        state['status'] = ACTIVE
+        state['game_active'] = True
+        if self.max_attempts:
+            state['max_attempts'] = self.max_attempts
+        if self.time_limit:
+            state['deadline'] = (now or time.time()) + self.time_limit
+
+    def status(self, state, now=None):
+        """A game's status, counting an active game past its deadline as timed out"""
+        status = status_of(state)
+        deadline = state.get('deadline')
+        if status == ACTIVE and deadline is not None and (now or time.time()) > deadline:
+            return TIMED_OUT
+        return status
+
+    def check_deadline(self, state, now=None):
+        """
+        End an active game whose wall-clock deadline has passed
+
+        Returns:
+            bool: True if the game was ended by this call
+        """
+        if state['game_active'] and self.status(state, now) == TIMED_OUT:
+            finish(state, TIMED_OUT)
+            return True
+        return False
+
+    def after_guess(self, state, correct):
+        """
+        Update the status once a guess has been recorded
+
+        Returns:
+            str: The game's status afterwards
+        """
+        if correct:
+            finish(state, WON)
+        elif state.get('max_attempts') and state['attempts'] >= state['max_attempts']:
+            finish(state, OUT_OF_ATTEMPTS)
+        return status_of(state)
+
+    def remaining(self, state, now=None):
+        """Attempts and seconds left, for status responses"""
+        remaining = {}
+        if state.get('max_attempts'):
+            remaining['attempts_left'] = max(0, state['max_attempts'] - state['attempts'])
+        if state.get('deadline') is not None:
+            remaining['seconds_left'] = max(0.0, round(state['deadline'] - (now or time.time()), 1))
+        return remaining
+
+
+def create_game_limits():
+    """GameLimits from $GAME_MAX_ATTEMPTS and $GAME_TIME_LIMIT (both default 0, off)"""
+    return GameLimits(
+        max_attempts=int(os.environ.get('GAME_MAX_ATTEMPTS', 0)),
+        time_limit=float(os.environ.get('GAME_TIME_LIMIT', 0)),
+    )
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+from flask import g, request
+from flask.sessions import SecureCookieSessionInterface
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+PREFIX = 'guessmaster'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in Prometheus style"""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one observation. Caller must hold the registry lock."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """Request counters and latency histograms for the backend
+
+    Recording is a bisect plus a few increments under one lock, cheap
+    enough to leave on in production. When disabled, timed() hands back a
+    shared no-op context manager, increment() returns before taking the
+    lock, and nothing is recorded at all.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}   # (metric, labels) -> Histogram
+        self._counters = {}     # (metric, labels) -> int
+        self._collectors = []
+        self._noop = nullcontext()
+
+    def observe(self, metric, labels, seconds):
+        """
+        Record a duration
+
+        Args:
+            metric (str): Histogram name without prefix or unit suffix
+            labels (tuple): (name, value) pairs identifying the series
+            seconds (float): Observed duration
+        """
+        key = (metric, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, metric, labels=(), amount=1):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        key = (metric, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def timed(self, section):
+        """
+        Context manager timing a block as a section of request handling
+
+        Args:
+            section (str): e.g. 'session', 'game_logic', 'ai_hints'
+        """
+        if not self.enabled:
+            return self._noop
+        return _SectionTimer(self, (('section', section),))
+
+    def add_collector(self, collect):
+        """
+        Register a callable that reports extra values at scrape time
+
+        Args:
+            collect: Returns an iterable of (metric, type, labels, value)
+                where type is 'counter' or 'gauge'
+        """
+        self._collectors.append(collect)
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Scrape body
+        """
+        with self._lock:
+            histograms = [(key, list(h.counts), h.total, h.count) for key, h in self._histograms.items()]
+            counters = list(self._counters.items())
+
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (metric, labels), value in sorted(counters):
+            name = f'{PREFIX}_{metric}_total'
+            declare(name, 'counter')
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        for (metric, labels), counts, total, count in sorted(histograms, key=lambda item: item[0]):
+            name = f'{PREFIX}_{metric}_seconds'
+            declare(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", repr(bound)),))} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+        for collect in self._collectors:
+            for metric, kind, labels, value in collect():
+                name = f'{PREFIX}_{metric}_total' if kind == 'counter' else f'{PREFIX}_{metric}'
+                declare(name, kind)
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+class _SectionTimer:
+    """Minimal context manager; cheaper than a @contextmanager generator"""
+
+    __slots__ = ('metrics', 'labels', 'start')
+
+    def __init__(self, metrics, labels):
+        self.metrics = metrics
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe('section_duration', self.labels, time.perf_counter() - self.start)
+        return False
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class TimedSessionInterface(SecureCookieSessionInterface):
+    """Cookie sessions whose decode and encode time is recorded as 'session'"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def open_session(self, app, request):
+        with self.metrics.timed('session'):
+            return super().open_session(app, request)
+
+    def save_session(self, app, session, response):
+        with self.metrics.timed('session'):
+            return super().save_session(app, session, response)
+
+
+def init_metrics(app, enabled=None):
+    """
+    Attach request instrumentation to a Flask app
+
+    Args:
+        app (Flask): The application
+        enabled (bool): Defaults to $METRICS_ENABLED (on unless set to 0)
+
+    Returns:
+        Metrics: The registry; disabled registries install no hooks
+    """
+    if enabled is None:
+        enabled = os.environ.get('METRICS_ENABLED', '1') != '0'
+    metrics = Metrics(enabled=enabled)
+    if not enabled:
+        return metrics
+
+    app.session_interface = TimedSessionInterface(metrics)
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            labels = (('endpoint', endpoint), ('method', request.method))
+            metrics.observe('request_duration', labels, time.perf_counter() - start)
+            metrics.increment('requests', labels + (('status', str(response.status_code)),))
+            if response.status_code >= 500:
+                metrics.increment('request_errors', labels)
+        return response
+
+    return metrics
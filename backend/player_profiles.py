@@ -0,0 +1,288 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Number ranges a player moves through as they improve; new players start at START_LEVEL
+LEVELS = ((1, 50), (1, 100), (1, 1000), (1, 10000))
+START_LEVEL = 1
+
+# Weight of the latest game in the rolling averages
+ALPHA = 0.3
+
+# Finished games before a player's tone or level is judged, and again after each level change
+MIN_GAMES = 3
+
+# Profiles kept in memory per process, and how long one is trusted before
+# it is read again in case another worker process has updated it
+CACHE_SIZE = 10000
+CACHE_TTL = 30
+
+# Attempts relative to the optimal worst case; a lost game counts as this
+MAX_EFFICIENCY = 3.0
+
+NEW = 'new'
+STRUGGLING = 'struggling'
+STEADY = 'steady'
+EXPERT = 'expert'
+
+
+def optimal_attempts(min_number, max_number):
+    """Guesses binary search needs at worst for a range: ceil(log2(n + 1)) for n numbers"""
+    return (max_number - min_number + 1).bit_length()
+
+
+class PlayerProfiles:
+    """Per-player history across games, stored in SQLite
+
+    Each player has one row keyed by player id. A finished game updates it
+    in place: lifetime totals are incremented and rolling averages are
+    moved towards the game's numbers by ALPHA, so recent games count most.
+    No game history is kept or re-read. A lookup is served from an LRU
+    of recent players and otherwise costs one primary key read. Each
+    process updates its own LRU on a write, so a profile updated by
+    another worker can be up to CACHE_TTL seconds out of date.
+
+    The rolling averages are measured per guess or against the optimal
+    attempts, not in raw attempts, so they stay comparable when the
+    player's level changes their number range:
+
+    - efficiency: attempts / optimal attempts (MAX_EFFICIENCY when lost)
+    - hint_rate: hints / attempts
+    - unreasonable_rate: guesses outside the bounds earlier feedback
+      left (GameLogic.is_guess_reasonable) / attempts
+    - win_rate: 1 for a win, 0 otherwise
+    """
+
+    def __init__(self, path='player_profiles.db', cache_size=CACHE_SIZE, cache_ttl=CACHE_TTL):
+        """
+        Args:
+            path (str): SQLite database file
+            cache_size (int): Profiles kept in memory; 0 disables the cache
+            cache_ttl (float): Seconds a cached profile is used
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._local = threading.local()
+        self._cache = OrderedDict()     # player_id -> (summary, expires_at)
+        self._cache_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS profiles (
+                player_id INTEGER PRIMARY KEY,
+                games INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                attempts INTEGER NOT NULL,
+                hints_used INTEGER NOT NULL,
+                unreasonable INTEGER NOT NULL,
+                efficiency REAL NOT NULL,
+                hint_rate REAL NOT NULL,
+                unreasonable_rate REAL NOT NULL,
+                win_rate REAL NOT NULL,
+                level INTEGER NOT NULL,
+                level_games INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            ) WITHOUT ROWID;
+        ''')
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use or after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, player_id):
+        """
+        A player's profile
+
+        Returns:
+            dict: summary() of the player's row, or of an empty profile for
+                a player without finished games
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(player_id)
+            if cached is not None and cached[1] > now:
+                self._cache.move_to_end(player_id)
+                return cached[0]
+        row = self._connection().execute(
+            'SELECT * FROM profiles WHERE player_id = ?', (player_id,)
+        ).fetchone()
+        profile = summary(dict(row) if row is not None else None)
+        self._remember(player_id, profile, now)
+        return profile
+
+    def _remember(self, player_id, profile, now):
+        """Put a summary in the LRU, dropping the least recently used"""
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[player_id] = (profile, now + self.cache_ttl)
+            self._cache.move_to_end(player_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def record_game(self, player_id, min_number, max_number, attempts, hints_used, unreasonable, won):
+        """
+        Fold a finished game into the player's profile
+
+        Args:
+            player_id (int): The player's id
+            min_number (int): Lowest number of the game's range
+            max_number (int): Highest number of the game's range
+            attempts (int): Guesses made
+            hints_used (int): AI hints requested
+            unreasonable (int): Guesses that ignored earlier feedback
+            won (bool): Whether the game was won
+
+        Returns:
+            dict: The updated summary()
+        """
+        guesses = max(1, attempts)
+        if won:
+            efficiency = min(MAX_EFFICIENCY, attempts / optimal_attempts(min_number, max_number))
+        else:
+            efficiency = MAX_EFFICIENCY
+        game = {
+            'efficiency': efficiency,
+            'hint_rate': min(1.0, hints_used / guesses),
+            'unreasonable_rate': unreasonable / guesses,
+            'win_rate': 1.0 if won else 0.0,
+        }
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT * FROM profiles WHERE player_id = ?', (player_id,)).fetchone()
+            if row is None:
+                profile = dict(game, player_id=player_id, games=0, wins=0, attempts=0, hints_used=0,
+                               unreasonable=0, level=START_LEVEL, level_games=0)
+            else:
+                profile = dict(row)
+                for name, value in game.items():
+                    profile[name] += ALPHA * (value - profile[name])
+            profile['games'] += 1
+            profile['wins'] += bool(won)
+            profile['attempts'] += attempts
+            profile['hints_used'] += hints_used
+            profile['unreasonable'] += unreasonable
+            profile['level_games'] += 1
+            profile['updated_at'] = time.time()
+            _adjust_level(profile)
+            conn.execute(
+                'INSERT OR REPLACE INTO profiles (player_id, games, wins, attempts, hints_used, unreasonable, '
+                'efficiency, hint_rate, unreasonable_rate, win_rate, level, level_games, updated_at) '
+                'VALUES (:player_id, :games, :wins, :attempts, :hints_used, :unreasonable, :efficiency, '
+                ':hint_rate, :unreasonable_rate, :win_rate, :level, :level_games, :updated_at)',
+                profile
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        profile = summary(profile)
+        self._remember(player_id, profile, time.monotonic())
+        return profile
+
+
+def _tone(profile):
+    """How hints should address a player, judged on their rolling averages"""
+    if profile['games'] < MIN_GAMES:
+        return NEW
+    if (profile['win_rate'] < 0.5 or profile['efficiency'] > 2.0
+            or profile['unreasonable_rate'] > 0.25):
+        return STRUGGLING
+    if profile['efficiency'] <= 1.25 and profile['hint_rate'] < 0.1 and profile['unreasonable_rate'] < 0.05:
+        return EXPERT
+    return STEADY
+
+
+def _adjust_level(profile):
+    """Move an expert up a level and a struggling player down, at most once per MIN_GAMES games"""
+    if profile['level_games'] < MIN_GAMES:
+        return
+    tone = _tone(profile)
+    if tone == EXPERT and profile['level'] < len(LEVELS) - 1:
+        profile['level'] += 1
+        profile['level_games'] = 0
+    elif tone == STRUGGLING and profile['level'] > 0:
+        profile['level'] -= 1
+        profile['level_games'] = 0
+
+
+def summary(profile):
+    """
+    What the game needs from a profile row
+
+    Args:
+        profile (dict): A profiles row, or None for a player without games
+
+    Returns:
+        dict: games, wins, average_attempts, hint_rate and unreasonable_rate
+            over all games, the rolling averages under 'recent', and the
+            level, its number range and the tone for hints
+    """
+    if profile is None:
+        level = START_LEVEL
+        return {
+            'games': 0, 'wins': 0, 'average_attempts': None, 'hint_rate': None,
+            'unreasonable_rate': None, 'recent': None, 'level': level,
+            'min_number': LEVELS[level][0], 'max_number': LEVELS[level][1], 'tone': NEW,
+        }
+    level = profile['level']
+    attempts = profile['attempts']
+    return {
+        'games': profile['games'],
+        'wins': profile['wins'],
+        'average_attempts': round(attempts / profile['games'], 2),
+        'hint_rate': round(profile['hints_used'] / attempts, 3) if attempts else 0.0,
+        'unreasonable_rate': round(profile['unreasonable'] / attempts, 3) if attempts else 0.0,
+        'recent': {
+            name: round(profile[name], 3)
+            for name in ('efficiency', 'hint_rate', 'unreasonable_rate', 'win_rate')
+        },
+        'level': level,
+        'min_number': LEVELS[level][0],
+        'max_number': LEVELS[level][1],
+        'tone': _tone(profile),
+    }
+
+
+def game_profile(profile, min_number, max_number):
+    """
+    The slice of a profile a game keeps in its state for hints
+
+    Returns:
+        dict: tone, usual_attempts (the player's recent efficiency applied
+            to this range, or None for a new player) and unreasonable_rate
+    """
+    recent = profile['recent']
+    if recent is None:
+        return {'tone': profile['tone'], 'usual_attempts': None, 'unreasonable_rate': 0.0}
+    return {
+        'tone': profile['tone'],
+        'usual_attempts': round(recent['efficiency'] * optimal_attempts(min_number, max_number), 1),
+        'unreasonable_rate': recent['unreasonable_rate'],
+    }
+
+
+def open_player_profiles(path=None):
+    """
+    Open the profile store configured by argument or environment
+
+    Args:
+        path (str): SQLite file (default: $PLAYER_PROFILES_PATH or 'player_profiles.db')
+
+    Returns:
+        PlayerProfiles
+    """
+    return PlayerProfiles(path or os.environ.get('PLAYER_PROFILES_PATH', 'player_profiles.db'))
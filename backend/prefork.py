@@ -0,0 +1,164 @@
+"""Pre-fork WSGI server: one listening socket shared by N worker processes
+
+    GAME_STORE=sqlite python backend/prefork.py --workers 4
+
+The parent binds the socket, imports the app once and forks the workers,
+which all accept() on the inherited socket, so the kernel spreads
+connections across them with no sticky routing. Game state lives in the
+shared SQLite store, so any worker can serve any /guess. The parent only
+supervises: it restarts workers that die and stops them all on SIGINT or
+SIGTERM.
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Pause before replacing a dead worker, so a crash at startup cannot spin
+RESPAWN_DELAY = 1.0
+
+
+def require_shared_store(workers):
+    """Switch to the SQLite store when several processes must share games"""
+    if workers > 1 and os.environ.get('GAME_STORE', 'memory') == 'memory':
+        print("⚠️  The memory game store is per process; using GAME_STORE=sqlite for multiple workers")
+        os.environ['GAME_STORE'] = 'sqlite'
+
+
+def require_local_rooms(workers):
+    """
+    Turn multiplayer rooms off when several processes would each hold their own
+
+    Rooms live in one process's memory, so a join or guess landing on
+    another worker would get 404. Asking for them explicitly ($ROOMS=1)
+    with several workers is refused.
+    """
+    if workers <= 1:
+        return
+    if os.environ.get('ROOMS') == '1':
+        sys.exit('Rooms are kept in one process and need --workers 1; set ROOMS=0 to run without them')
+    if os.environ.get('ROOMS') != '0':
+        print("⚠️  Rooms are kept per process; disabling them (ROOMS=0) for multiple workers")
+        os.environ['ROOMS'] = '0'
+
+
+def bind_socket(host, port, backlog):
+    """Create the listening socket every worker inherits"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """Forks and supervises worker processes serving one WSGI app"""
+
+    def __init__(self, app, sock, workers=2):
+        """
+        Args:
+            app: WSGI application, imported before forking so workers share its pages
+            sock (socket.socket): Bound, listening socket
+            workers (int): Worker processes to keep running
+        """
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children = set()
+        self.stopping = False
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+        # Worker: never return into the parent's supervision loop
+        try:
+            self._work()
+        except Exception:
+            traceback.print_exc()
+            sys.exit(1)
+        # sys.exit runs atexit handlers, which flush the event log
+        sys.exit(0)
+
+    def _work(self):
+        """Serve requests on the inherited socket until SIGTERM"""
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        from werkzeug.serving import make_server, WSGIRequestHandler
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        host, port = self.sock.getsockname()[:2]
+        server = make_server(host, port, self.app, threaded=True,
+                             request_handler=QuietHandler, fd=self.sock.fileno())
+        server.serve_forever()
+
+    def _stop(self, *_):
+        self.stopping = True
+
+    def run(self):
+        """Fork the workers and block until asked to stop"""
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for _ in range(self.workers):
+            self._spawn()
+
+        while not self.stopping:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid:
+                self.children.discard(pid)
+                print(f"⚠️  Worker {pid} exited; starting a replacement")
+                time.sleep(RESPAWN_DELAY)
+                self._spawn()
+            else:
+                time.sleep(0.2)
+
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self.children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.sock.close()
+
+
+def serve(host='0.0.0.0', port=5000, workers=None, backlog=2048):
+    """Run the backend on a pre-forked pool of threaded Werkzeug servers"""
+    workers = workers or os.cpu_count() or 1
+    require_shared_store(workers)
+    require_local_rooms(workers)
+    sock = bind_socket(host, port, backlog)
+
+    sys.path.insert(0, BACKEND_DIR)
+    from app import create_app
+    # Warm up once here; every forked worker inherits the tables, already ready
+    app = create_app(background=False)
+
+    print(f"🚀 Backend (prefork) on http://{host}:{port} with {workers} worker(s)")
+    PreforkServer(app, sock, workers).run()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the backend on pre-forked worker processes')
+    parser.add_argument('--host', default=os.environ.get('SERVER_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('SERVER_PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SERVER_WORKERS', os.cpu_count() or 1)))
+    parser.add_argument('--backlog', type=int, default=int(os.environ.get('SERVER_BACKLOG', 2048)))
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.backlog)
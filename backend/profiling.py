@@ -0,0 +1,259 @@
+"""Opt-in request profiling that produces folded stacks for flame graphs
+
+Profiler wraps the Flask WSGI app, inside the rate limiter, so a profile
+covers everything Flask does for a request: session decoding, the view,
+check_guess, hint generation and jsonify. A request is profiled when it
+is picked at random with probability $PROFILE_RATE, or when it carries
+an X-Profile header holding the admin token. Other requests pay one
+random() call and a dict lookup.
+
+Two modes, chosen with $PROFILE:
+
+- sample: a daemon thread records the stack of each request being
+  profiled as soon as one starts and then every $PROFILE_INTERVAL_MS
+  while any is running. The sampler needs the GIL, so it can be kept
+  waiting behind a request that never blocks, for up to the interpreter's
+  switch interval (5 ms by default); a shorter request may finish before
+  its sample. $PROFILE_SWITCH_INTERVAL_MS lowers the interval while
+  profiled requests run. That is opt-in, since it is process-wide and
+  makes every thread switch more often, not only the profiled ones. Its
+  cost is one stack walk per profiled
+  request per sample and does not grow with call depth or call count,
+  so it is safe to leave on for a small fraction of production traffic.
+  Folded counts are samples.
+- trace: sys.setprofile on the request's thread records every call and
+  return, giving exact self time per stack in microseconds. It slows a
+  profiled request several times over, so use it in development. This
+  is used instead of cProfile, which keeps caller/callee pairs rather
+  than whole stacks and so cannot produce folded stacks.
+
+Stacks are aggregated as "GET /status;app:game_status;... <count>" lines,
+the input format of flamegraph.pl and speedscope. At most $PROFILE_MAX_STACKS
+distinct stacks are kept; the rest are counted under one [truncated] stack.
+"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+
+TRUNCATED = ('[truncated]',)
+
+
+def _frame_name(code):
+    """'module:qualified.function' for a code object"""
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f'{module}:{getattr(code, "co_qualname", code.co_name)}'
+
+
+class FoldedStacks:
+    """Thread-safe counts per call stack, bounded in the number of stacks"""
+
+    def __init__(self, max_stacks=5000):
+        self.max_stacks = max_stacks
+        self._counts = {}      # tuple of frame names, root first -> count
+        self._lock = threading.Lock()
+
+    def add(self, stack, amount=1):
+        with self._lock:
+            if stack not in self._counts and len(self._counts) >= self.max_stacks:
+                stack = TRUNCATED
+            self._counts[stack] = self._counts.get(stack, 0) + amount
+
+    def merge(self, counts):
+        """Add a dict of stack -> count gathered without the lock"""
+        for stack, amount in counts.items():
+            self.add(stack, amount)
+
+    def __len__(self):
+        return len(self._counts)
+
+    def clear(self):
+        with self._lock:
+            self._counts = {}
+
+    def render(self):
+        """The folded stacks, one 'frame;frame;frame count' line each, heaviest first"""
+        with self._lock:
+            items = sorted(self._counts.items(), key=lambda item: -item[1])
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in items)
+
+
+class _Tracer:
+    """setprofile hook charging elapsed time to the stack on top at each event"""
+
+    __slots__ = ('stack', 'counts', 'last', 'depth')
+
+    def __init__(self, label):
+        self.stack = [label]
+        self.counts = {}
+        self.last = time.perf_counter_ns()
+        self.depth = 0
+
+    def _charge(self, now):
+        key = tuple(self.stack)
+        self.counts[key] = self.counts.get(key, 0) + (now - self.last)
+        self.last = now
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if event == 'call':
+            self._charge(now)
+            self.stack.append(_frame_name(frame.f_code))
+            self.depth += 1
+        elif event == 'c_call':
+            self._charge(now)
+            self.stack.append(f'builtins:{getattr(arg, "__qualname__", getattr(arg, "__name__", "?"))}')
+            self.depth += 1
+        elif self.depth:   # return, c_return, c_exception for a frame we pushed
+            self._charge(now)
+            self.stack.pop()
+            self.depth -= 1
+
+    def folded(self):
+        """Counts in microseconds"""
+        self._charge(time.perf_counter_ns())
+        return {stack: nanoseconds // 1000 for stack, nanoseconds in self.counts.items() if nanoseconds >= 1000}
+
+
+class Profiler:
+    """WSGI middleware profiling a fraction of requests into FoldedStacks"""
+
+    def __init__(self, wsgi_app, mode='sample', rate=0.01, token=None, interval=0.005, max_stacks=5000,
+                 switch_interval=None):
+        """
+        Args:
+            wsgi_app: The application to profile
+            mode (str): 'sample' or 'trace'
+            rate (float): Fraction of requests profiled at random
+            token (str): Value of X-Profile that profiles a request on
+                demand; without one, only loopback clients may ask
+            interval (float): Seconds between samples in sample mode
+            max_stacks (int): Distinct stacks kept before [truncated]
+            switch_interval (float): GIL switch interval in seconds while
+                profiled requests run in sample mode; None leaves the
+                interpreter's alone
+        """
+        if mode not in ('sample', 'trace'):
+            raise ValueError(f'Unknown profile mode: {mode}')
+        self.wsgi_app = wsgi_app
+        self.mode = mode
+        self.rate = rate
+        self.token = token
+        self.interval = interval
+        self.switch_interval = switch_interval
+        self.stacks = FoldedStacks(max_stacks)
+        self.stats = {'profiled': 0, 'samples': 0, 'sampler_seconds': 0.0}    # updated under _lock
+        self._active = {}           # thread id -> request label, while profiled
+        self._wake = threading.Event()      # set while any profiled request runs
+        self._arrived = threading.Event()   # set when one starts, for an immediate sample
+        self._switch_interval = None        # the interpreter's own, while lowered
+        self._sampler = None
+        self._lock = threading.Lock()
+
+    def _wanted(self, environ):
+        header = environ.get('HTTP_X_PROFILE')
+        if header is not None:
+            if self.token:
+                return hmac.compare_digest(header.encode(), self.token.encode())
+            return environ.get('REMOTE_ADDR') in ('127.0.0.1', '::1')
+        return self.rate > 0 and random.random() < self.rate
+
+    def __call__(self, environ, start_response):
+        if not self._wanted(environ):
+            return self.wsgi_app(environ, start_response)
+        with self._lock:
+            self.stats['profiled'] += 1
+        label = f"{environ.get('REQUEST_METHOD', '')} {environ.get('PATH_INFO', '')}"
+        if self.mode == 'trace':
+            return self._trace(label, environ, start_response)
+        return self._sample(label, environ, start_response)
+
+    def _trace(self, label, environ, start_response):
+        tracer = _Tracer(label)
+        sys.setprofile(tracer)
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            sys.setprofile(None)
+            self.stacks.merge(tracer.folded())
+
+    def _sample(self, label, environ, start_response):
+        thread_id = threading.get_ident()
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name='profiler', daemon=True)
+                self._sampler.start()
+            if not self._active and self.switch_interval is not None:
+                self._switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(self._switch_interval, self.switch_interval))
+            self._active[thread_id] = label
+            self._wake.set()
+            self._arrived.set()
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            with self._lock:
+                del self._active[thread_id]
+                if not self._active:
+                    self._wake.clear()
+                    if self._switch_interval is not None:
+                        sys.setswitchinterval(self._switch_interval)
+                        self._switch_interval = None
+
+    def _sample_loop(self):
+        """Sample every profiled request on arrival and each interval; sleeps while there are none"""
+        entry = Profiler._sample.__code__
+        while True:
+            self._wake.wait()
+            self._arrived.wait(self.interval)
+            self._arrived.clear()
+            started = time.perf_counter()
+            with self._lock:
+                active = list(self._active.items())
+            frames = sys._current_frames()
+            for thread_id, label in active:
+                frame = frames.get(thread_id)
+                names = []
+                # Walk down to this middleware; the server's frames below it are the same every time
+                while frame is not None and frame.f_code is not entry:
+                    names.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                names.append(label)
+                names.reverse()
+                self.stacks.add(tuple(names))
+            del frames
+            with self._lock:
+                self.stats['samples'] += len(active)
+                self.stats['sampler_seconds'] += time.perf_counter() - started
+
+
+def install_profiler(app):
+    """
+    Wrap a Flask app's WSGI callable with a Profiler configured from the environment
+
+    $PROFILE selects 'sample' or 'trace' (unset: no profiler), $PROFILE_RATE
+    the random fraction (default 0.01), $PROFILE_INTERVAL_MS the sampling
+    interval (default 5), $PROFILE_MAX_STACKS the stack limit (default 5000),
+    $PROFILE_SWITCH_INTERVAL_MS the GIL switch interval while sampling
+    (unset: the interpreter's) and $ADMIN_TOKEN the X-Profile value.
+
+    Returns:
+        Profiler or None
+    """
+    mode = os.environ.get('PROFILE')
+    if not mode or mode == '0':
+        return None
+    switch_interval = float(os.environ.get('PROFILE_SWITCH_INTERVAL_MS') or 0) / 1000
+    profiler = Profiler(
+        app.wsgi_app,
+        mode=mode,
+        rate=float(os.environ.get('PROFILE_RATE', 0.01)),
+        token=os.environ.get('ADMIN_TOKEN'),
+        interval=float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000,
+        max_stacks=int(os.environ.get('PROFILE_MAX_STACKS', 5000)),
+        switch_interval=switch_interval or None,
+    )
+    app.wsgi_app = profiler
+    return profiler
@@ -0,0 +1,366 @@
+"""Rate limiting that turns floods away before Flask does any work
+
+RateLimiter wraps the WSGI app. It looks only at the path, the client
+address and, for per-game rules, a hash of the session cookie's payload,
+so a rejected request never has its body parsed, a view run or a game
+allocated. The cookie is not verified here: that would cost an HMAC per
+request, even for a request about to be turned away. A forged cookie only
+buys a bucket of its own on the per-game rule; every request still draws
+on its address's bucket under the client rule. Each rule is a token bucket: up to burst requests at
+once, refilled at rate per second. Rejections get 429 with Retry-After.
+
+Behind proxies, install_proxy_fix takes the client address from
+X-Forwarded-For, trusting $TRUSTED_PROXY_HOPS hops, so players sharing a
+CDN do not share one bucket.
+
+Buckets live in process memory by default. With several worker processes
+the SQLite backend lets them share one set of buckets, standing in for a
+shared cache such as Redis.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+
+class Rule:
+    """One token bucket per key for requests under a path"""
+
+    __slots__ = ('name', 'path', 'key', 'rate', 'burst')
+
+    def __init__(self, name, path, key, rate, burst):
+        """
+        Args:
+            name (str): Label for metrics and bucket keys
+            path (str): Path the rule covers, with its sub-paths; None for all
+            key (str): 'client' (remote address) or 'session' (the session
+                cookie's payload; falls back to the client without one)
+            rate (float): Tokens refilled per second
+            burst (int): Bucket size
+        """
+        self.name = name
+        self.path = path
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+
+    def matches(self, path):
+        return self.path is None or path == self.path or path.startswith(self.path + '/')
+
+
+def parse_limit(value):
+    """'<requests>/<seconds>' -> (rate per second, burst)"""
+    requests, _, seconds = value.partition('/')
+    requests = int(requests)
+    return requests / float(seconds or 1), requests
+
+
+def default_rules():
+    """Rules from $RATE_LIMIT_START, $RATE_LIMIT_GUESS and $RATE_LIMIT_CLIENT"""
+    env = os.environ.get
+    return [
+        Rule('start', '/start', 'client', *parse_limit(env('RATE_LIMIT_START', '30/60'))),
+        Rule('guess', '/guess', 'session', *parse_limit(env('RATE_LIMIT_GUESS', '20/10'))),
+        Rule('client', None, 'client', *parse_limit(env('RATE_LIMIT_CLIENT', '200/10'))),
+    ]
+
+
+class MemoryBuckets:
+    """Token buckets in a process-local dict"""
+
+    def __init__(self, idle=600, sweep_interval=60):
+        """
+        Args:
+            idle (float): Seconds after which an untouched bucket is full
+                again and can be forgotten
+            sweep_interval (float): Minimum seconds between sweeps
+        """
+        self.idle = idle
+        self.sweep_interval = sweep_interval
+        self._buckets = {}      # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def take(self, key, rate, burst):
+        """
+        Take one token
+
+        Returns:
+            float: 0.0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _sweep(self, now):
+        """Forget buckets that have refilled completely. Caller holds the lock."""
+        cutoff = now - self.idle
+        for key in [key for key, (_, updated_at) in self._buckets.items() if updated_at < cutoff]:
+            del self._buckets[key]
+        self._next_sweep = now + self.sweep_interval
+
+
+class SQLiteBuckets:
+    """Token buckets in a SQLite file shared by every worker process
+
+    Each take is one short BEGIN IMMEDIATE transaction on a WAL database,
+    so workers on the same host see the same buckets.
+    """
+
+    def __init__(self, path='ratelimit.db', idle=600, sweep_interval=60):
+        """
+        Args:
+            path (str): SQLite database file
+            idle (float): Seconds after which an untouched bucket is deleted
+            sweep_interval (float): Minimum seconds between sweeps
+        """
+        self.path = path
+        self.idle = idle
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._next_sweep = time.time() + sweep_interval
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL) WITHOUT ROWID'
+        )
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use or after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=OFF')  # buckets are disposable
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def take(self, key, rate, burst):
+        """Take one token; returns 0.0 or the seconds to wait (see MemoryBuckets.take)"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated_at = row if row is not None else (burst, now)
+            tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            conn.execute('INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)',
+                         (key, tokens - 1 if wait == 0.0 else tokens, now))
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                conn.execute('DELETE FROM buckets WHERE updated_at < ?', (now - self.idle,))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return wait
+
+
+class RateLimiter:
+    """WSGI middleware applying Rules before the wrapped app runs"""
+
+    def __init__(self, wsgi_app, buckets, rules, cookie_name='session', allowed_origins=(), on_reject=None):
+        """
+        Args:
+            wsgi_app: The application to protect
+            buckets: MemoryBuckets or SQLiteBuckets
+            rules (list): Rules checked in order; the first empty bucket rejects
+            cookie_name (str): Session cookie identifying a game
+            allowed_origins (list): Origins that get CORS headers on a 429
+            on_reject: Optional callable receiving the rule name
+        """
+        self.wsgi_app = wsgi_app
+        self.buckets = buckets
+        self.rules = rules
+        self.cookie_prefix = cookie_name + '='
+        self.allowed_origins = set(allowed_origins)
+        self.on_reject = on_reject
+
+    def _session_cookie(self, environ):
+        """The raw session cookie value, without decoding or verifying it"""
+        for part in environ.get('HTTP_COOKIE', '').split(';'):
+            part = part.strip()
+            if part.startswith(self.cookie_prefix):
+                return part[len(self.cookie_prefix):]
+        return None
+
+    def _session_key(self, environ):
+        """'session:<hash>' for a session cookie, else None
+
+        Only the payload is hashed: Flask cookies are
+        <payload>.<timestamp>.<signature>, and re-signing the same session
+        (player and game) changes the last two but keeps the bucket.
+        """
+        cookie = self._session_cookie(environ)
+        if not cookie:
+            return None
+        payload = cookie.rsplit('.', 2)[0]
+        return 'session:' + hashlib.blake2b(payload.encode('utf-8', 'replace'), digest_size=16).hexdigest()
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') != 'OPTIONS':  # CORS preflights pass
+            path = environ.get('PATH_INFO', '')
+            client = environ.get('REMOTE_ADDR', '')
+            for rule in self.rules:
+                if not rule.matches(path):
+                    continue
+                key = client
+                if rule.key == 'session':
+                    key = self._session_key(environ) or client
+                wait = self.buckets.take(f'{rule.name}:{key}', rule.rate, rule.burst)
+                if wait:
+                    return self._reject(environ, start_response, rule, wait)
+        return self.wsgi_app(environ, start_response)
+
+    def _reject(self, environ, start_response, rule, wait):
+        if self.on_reject is not None:
+            self.on_reject(rule.name)
+        retry_after = max(1, math.ceil(wait))
+        body = json.dumps({'error': 'Too many requests. Slow down.', 'retry_after': retry_after}).encode('utf-8')
+        headers = [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body))),
+            ('Retry-After', str(retry_after)),
+        ]
+        origin = environ.get('HTTP_ORIGIN')
+        if origin in self.allowed_origins:
+            headers += [
+                ('Access-Control-Allow-Origin', origin),
+                ('Access-Control-Allow-Credentials', 'true'),
+                ('Vary', 'Origin'),
+            ]
+        start_response('429 Too Many Requests', headers)
+        return [body]
+
+
+class ClientGames:
+    """Caps the games one client keeps open by evicting its oldest
+
+    The app keys clients by player id, not address, so players sharing a
+    NAT or CDN address never evict each other's games. A player who keeps
+    replaying an old session cookie to /start (each replay starts a game
+    the newer cookie does not replace) only ever holds max_games of them.
+
+    The games are tracked in process memory, so the cap is per worker: a
+    player spreading /start over N worker processes can hold up to N times
+    max_games until the extra games expire.
+    """
+
+    def __init__(self, max_games=50, max_clients=100000):
+        """
+        Args:
+            max_games (int): Games kept per client; 0 means unlimited
+            max_clients (int): Clients tracked; the least recently seen are dropped
+        """
+        self.max_games = max_games
+        self.max_clients = max_clients
+        self._clients = OrderedDict()   # client -> OrderedDict of game ids
+        self._lock = threading.Lock()
+
+    def add(self, client, game_id):
+        """
+        Record a new game for a client
+
+        Returns:
+            list: Game ids over the cap, oldest first, for the caller to delete
+        """
+        if not self.max_games:
+            return []
+        with self._lock:
+            games = self._clients.get(client)
+            if games is None:
+                games = self._clients[client] = OrderedDict()
+                if len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(client)
+            games[game_id] = None
+            evicted = []
+            while len(games) > self.max_games:
+                evicted.append(games.popitem(last=False)[0])
+            return evicted
+
+    def discard(self, client, game_id):
+        """Forget a game that was deleted or replaced"""
+        with self._lock:
+            games = self._clients.get(client)
+            if games is not None:
+                games.pop(game_id, None)
+                if not games:
+                    del self._clients[client]
+
+
+def install_proxy_fix(app, hops=None):
+    """
+    Take the client address from X-Forwarded-For behind trusted proxies
+
+    Install it last so it wraps every other middleware: the limiter, the
+    profiler's loopback check and the views then all see the client's
+    address. Without trusted hops the header is ignored, since anyone can
+    send it.
+
+    Args:
+        app (Flask): The application
+        hops (int): Proxies in front of the app that append to
+            X-Forwarded-For (default: $TRUSTED_PROXY_HOPS or 0)
+
+    Returns:
+        ProxyFix or None: None when no proxy is trusted
+    """
+    hops = int(os.environ.get('TRUSTED_PROXY_HOPS', 0)) if hops is None else hops
+    if hops <= 0:
+        return None
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    return app.wsgi_app
+
+
+def install_rate_limiter(app, allowed_origins=(), on_reject=None, store=None, path=None):
+    """
+    Wrap a Flask app's WSGI callable with the configured limiter
+
+    Args:
+        app (Flask): The application
+        allowed_origins (list): Origins that get CORS headers on a 429
+        on_reject: Optional callable receiving the rejecting rule's name
+        store (str): 'memory' or 'sqlite' (default: $RATE_LIMIT_STORE or 'memory')
+        path (str): SQLite file (default: $RATE_LIMIT_PATH or 'ratelimit.db')
+
+    Returns:
+        RateLimiter or None: None when $RATE_LIMIT=0
+    """
+    if os.environ.get('RATE_LIMIT', '1') == '0':
+        return None
+    rules = default_rules()
+    # A bucket untouched this long has refilled and need not be kept
+    idle = max(rule.burst / rule.rate for rule in rules)
+    store = store or os.environ.get('RATE_LIMIT_STORE', 'memory')
+    if store == 'memory':
+        buckets = MemoryBuckets(idle=idle)
+    elif store == 'sqlite':
+        buckets = SQLiteBuckets(path or os.environ.get('RATE_LIMIT_PATH', 'ratelimit.db'), idle=idle)
+    else:
+        raise ValueError(f'Unknown rate limit store: {store}')
+    limiter = RateLimiter(app.wsgi_app, buckets, rules, app.config.get('SESSION_COOKIE_NAME', 'session'),
+                          allowed_origins, on_reject)
+    app.wsgi_app = limiter
+    return limiter
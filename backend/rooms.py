@@ -0,0 +1,324 @@
+"""Multiplayer rooms where everyone races to find the same secret number
+
+Every guess in a room is published as a Server-Sent Event. An event is
+serialized once into its final wire bytes and stored in the room's ring
+buffer; each subscriber only keeps a cursor (the last event id it sent),
+so fan-out to N players costs one encode plus N buffer writes.
+
+Slow clients apply their own backpressure: nothing is queued per
+subscriber, so a client that falls further behind than the ring holds is
+sent a single 'snapshot' of the room instead of the events it missed.
+"""
+import json
+import secrets
+import threading
+import time
+
+from game_state import GuessTracker
+
+# Events kept per room for subscribers that are catching up
+ROOM_HISTORY = 256
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# Sent once at the start of every stream: reconnect after 3 seconds
+STREAM_PREAMBLE = b'retry: 3000\n\n'
+KEEP_ALIVE = b': keep-alive\n\n'
+
+# Environ key asgi.py sets so the Flask view admits a stream instead of serving it;
+# the view replaces it with (room, cursor) for the event loop to stream from
+NATIVE_STREAM = 'guessmaster.native_stream'
+
+# Response headers for an event stream; proxies must not buffer it
+STREAM_HEADERS = [
+    ('Content-Type', 'text/event-stream'),
+    ('Cache-Control', 'no-cache'),
+    ('X-Accel-Buffering', 'no'),
+]
+
+
+def format_event(event_id, kind, payload):
+    """Encode one Server-Sent Event to bytes"""
+    data = json.dumps(payload, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {kind}\ndata: {data}\n\n'.encode('utf-8')
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Room:
+    """One shared secret, its players and a ring buffer of encoded events"""
+
+    def __init__(self, room_id, secret_number, min_number, max_number, history=ROOM_HISTORY):
+        """
+        Args:
+            room_id (str): Public id used in URLs
+            secret_number (int): The number every player is looking for
+            min_number (int): Lowest possible number
+            max_number (int): Highest possible number
+            history (int): Events kept for subscribers that fall behind
+        """
+        self.room_id = room_id
+        self.secret_number = secret_number
+        self.min_number = min_number
+        self.max_number = max_number
+        self.tracker = GuessTracker(min_number, max_number)
+        self.players = {}           # player_id -> attempts
+        self.winner = None
+        self.last_event_id = 0
+        self.subscribers = 0
+        self.last_active = time.monotonic()
+
+        self._events = [None] * history
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._loop_waiters = {}     # event loop -> future resolved by the next event
+        self._snapshot = None       # (event_id, encoded snapshot)
+
+    def _publish(self, kind, payload):
+        """Encode an event once and wake every subscriber. Caller holds the lock."""
+        self.last_event_id += 1
+        event_id = self.last_event_id
+        self._events[event_id % len(self._events)] = format_event(event_id, kind, payload)
+        self._changed.notify_all()
+        # One wake-up per event loop, however many subscribers it serves
+        for loop, future in self._loop_waiters.items():
+            loop.call_soon_threadsafe(_resolve, future)
+        self._loop_waiters.clear()
+
+    def record_guess(self, player_id, name, guess, code):
+        """
+        Apply a checked guess and broadcast it
+
+        Args:
+            player_id (int): Guessing player's id
+            name (str): Display name shown to the room
+            guess (int): A validated guess
+            code (int): GameLogic result code for the guess
+
+        Returns:
+            int: The player's attempts in this room, or None if the room
+                was already won before this guess arrived
+        """
+        with self._lock:
+            if self.winner is not None:
+                return None
+            attempts = self.players.get(player_id, 0) + 1
+            self.players[player_id] = attempts
+            self.tracker.record(guess, self.secret_number)
+            self.last_active = time.monotonic()
+            if code == 0:
+                self.winner = name
+                self._publish('win', {'player': name, 'guess': guess, 'attempts': attempts,
+                                      'secret_number': self.secret_number})
+            else:
+                self._publish('guess', {'player': name, 'guess': guess, 'code': code, 'attempts': attempts,
+                                        'lower_bound': self.tracker.lower_bound(),
+                                        'upper_bound': self.tracker.upper_bound()})
+            return attempts
+
+    def snapshot(self):
+        """Public room state, without the secret until someone has won"""
+        with self._lock:
+            return self._snapshot_payload()
+
+    def _snapshot_payload(self):
+        payload = {
+            'room_id': self.room_id,
+            'min_number': self.min_number,
+            'max_number': self.max_number,
+            'players': len(self.players),
+            'guesses': self.tracker.count,
+            'lower_bound': self.tracker.lower_bound(),
+            'upper_bound': self.tracker.upper_bound(),
+            'finished': self.winner is not None,
+            'winner': self.winner,
+        }
+        if self.winner is not None:
+            payload['secret_number'] = self.secret_number
+        return payload
+
+    def read(self, cursor):
+        """
+        Encoded events after a cursor, or a snapshot if it fell too far behind
+
+        Args:
+            cursor (int): Last event id the subscriber has, or None for a new one
+
+        Returns:
+            tuple: (list of event bytes, new cursor, finished) where finished
+                means the room is won and the subscriber has every event
+        """
+        with self._lock:
+            return self._read(cursor)
+
+    def _read(self, cursor):
+        last = self.last_event_id
+        if cursor is None or cursor < last - len(self._events) or cursor > last:
+            if self._snapshot is None or self._snapshot[0] != last:
+                self._snapshot = (last, format_event(last, 'snapshot', self._snapshot_payload()))
+            chunks = [self._snapshot[1]]
+        else:
+            size = len(self._events)
+            chunks = [self._events[event_id % size] for event_id in range(cursor + 1, last + 1)]
+        return chunks, last, self.winner is not None
+
+    def wait(self, cursor, timeout):
+        """Block a thread until there are events after cursor; returns read(cursor)"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.last_event_id != cursor, timeout)
+            if self.last_event_id == cursor:
+                return [], cursor, self.winner is not None
+            return self._read(cursor)
+
+    async def wait_async(self, cursor, timeout):
+        """Suspend a coroutine until there are events after cursor; returns read(cursor)"""
+        import asyncio  # only ASGI servers need it; WSGI workers start without it
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.last_event_id != cursor:
+                return self._read(cursor)
+            future = self._loop_waiters.get(loop)
+            if future is None:
+                future = self._loop_waiters[loop] = loop.create_future()
+        try:
+            # Shielded: the future is shared by every subscriber on this loop
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._lock:
+            if self.last_event_id == cursor:
+                return [], cursor, self.winner is not None
+            return self._read(cursor)
+
+
+class RoomRegistry:
+    """All rooms in this process, dropped after sitting idle"""
+
+    def __init__(self, max_rooms=1000, idle_ttl=3600):
+        """
+        Args:
+            max_rooms (int): Rooms allowed at once
+            idle_ttl (int): Seconds without a guess or subscriber before a room is dropped
+        """
+        self.max_rooms = max_rooms
+        self.idle_ttl = idle_ttl
+        self._rooms = {}
+        self._lock = threading.Lock()
+
+    def create(self, secret_number, min_number, max_number):
+        """
+        Open a new room
+
+        Returns:
+            Room: The room, or None when the room limit is reached
+        """
+        with self._lock:
+            self._sweep()
+            if len(self._rooms) >= self.max_rooms:
+                return None
+            room_id = secrets.token_urlsafe(6)
+            room = self._rooms[room_id] = Room(room_id, secret_number, min_number, max_number)
+            return room
+
+    def get(self, room_id):
+        """Return a room by id, or None"""
+        return self._rooms.get(room_id)
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def subscribers(self):
+        """Open event streams across every room"""
+        return sum(room.subscribers for room in list(self._rooms.values()))
+
+    def _sweep(self):
+        """Drop idle rooms nobody is watching. Caller must hold the lock."""
+        cutoff = time.monotonic() - self.idle_ttl
+        for room_id, room in list(self._rooms.items()):
+            if room.last_active < cutoff and not room.subscribers:
+                del self._rooms[room_id]
+
+
+def parse_last_event_id(value):
+    """Cursor from a Last-Event-ID header or query value, or None for a fresh stream"""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def stream_events(room, cursor, heartbeat=HEARTBEAT_SECONDS):
+    """
+    WSGI response body for a room's event stream
+
+    Each stream holds a server thread, but the thread sleeps on the room's
+    condition variable until an event arrives; there is no polling.
+    """
+    with room._lock:
+        room.subscribers += 1
+    try:
+        yield STREAM_PREAMBLE
+        chunks, cursor, finished = room.read(cursor)
+        while True:
+            # Everything pending goes out as one write
+            yield b''.join(chunks) if chunks else KEEP_ALIVE
+            if finished:
+                return
+            chunks, cursor, finished = room.wait(cursor, heartbeat)
+    finally:
+        with room._lock:
+            room.subscribers -= 1
+            room.last_active = time.monotonic()
+
+
+async def stream_events_asgi(room, cursor, receive, send, headers, heartbeat=HEARTBEAT_SECONDS):
+    """
+    Serve a room's event stream directly on the ASGI event loop
+
+    Used by asgi.py so that open streams cost a coroutine each rather than
+    a thread from the WSGI pool. await send() only returns once the server
+    can take more data, so a slow client simply reads from an older cursor.
+
+    Args:
+        headers (list): Encoded (name, value) response header pairs
+    """
+    import asyncio
+
+    async def pump():
+        nonlocal cursor
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': STREAM_PREAMBLE, 'more_body': True})
+        chunks, cursor, finished = room.read(cursor)
+        while True:
+            body = b''.join(chunks) if chunks else KEEP_ALIVE
+            await send({'type': 'http.response.body', 'body': body, 'more_body': not finished})
+            if finished:
+                return
+            chunks, cursor, finished = await room.wait_async(cursor, heartbeat)
+
+    pump_task = asyncio.ensure_future(pump())
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                pump_task.cancel()
+                return
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    with room._lock:
+        room.subscribers += 1
+    try:
+        await pump_task
+    except asyncio.CancelledError:
+        if not pump_task.cancelled():
+            raise
+    finally:
+        watcher.cancel()
+        with room._lock:
+            room.subscribers -= 1
+            room.last_active = time.monotonic()
@@ -0,0 +1,87 @@
+"""Launch the backend with a chosen server and concurrency settings
+
+    python backend/serve.py                      # uvicorn, one worker per core
+    python backend/serve.py --workers 4 --threads 64
+    python backend/serve.py --server prefork     # pre-forked threaded WSGI workers
+    python backend/serve.py --server dev         # Werkzeug dev server
+
+Every option can also be set through the environment variable shown in its
+help text, which is how the benchmark runs are configured.
+"""
+import argparse
+import os
+import sys
+
+from prefork import require_local_rooms, require_shared_store, serve as serve_prefork
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_args(argv=None):
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description='Run the AI Guess Master backend')
+    parser.add_argument('--server', choices=['uvicorn', 'prefork', 'dev'], default=env('SERVER', 'uvicorn'),
+                        help='uvicorn (ASGI, production), prefork (WSGI workers sharing one socket) '
+                             'or dev (Werkzeug, debugging) [$SERVER]')
+    parser.add_argument('--host', default=env('SERVER_HOST', '0.0.0.0'), help='[$SERVER_HOST]')
+    parser.add_argument('--port', type=int, default=int(env('SERVER_PORT', 5000)), help='[$SERVER_PORT]')
+    parser.add_argument('--workers', type=int, default=int(env('SERVER_WORKERS', os.cpu_count() or 1)),
+                        help='Worker processes, one event loop each [$SERVER_WORKERS]')
+    parser.add_argument('--threads', type=int, default=int(env('ASGI_THREADS', 32)),
+                        help='Requests running inside Flask at once, per worker [$ASGI_THREADS]')
+    parser.add_argument('--backlog', type=int, default=int(env('SERVER_BACKLOG', 2048)),
+                        help='Pending connections queued by the kernel [$SERVER_BACKLOG]')
+    parser.add_argument('--keep-alive', type=int, default=int(env('SERVER_KEEPALIVE', 75)),
+                        help='Seconds an idle keep-alive connection stays open [$SERVER_KEEPALIVE]')
+    parser.add_argument('--limit-concurrency', type=int, default=env('SERVER_LIMIT_CONCURRENCY'),
+                        help='Open connections per worker before answering 503 [$SERVER_LIMIT_CONCURRENCY]')
+    parser.add_argument('--debug', action='store_true', help='Enable the Flask debugger (dev server only)')
+    return parser.parse_args(argv)
+
+
+def run_uvicorn(args):
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit('uvicorn is not installed. Run: pip install -r requirements.txt')
+
+    # Workers are separate processes that import asgi.py themselves
+    os.environ['ASGI_THREADS'] = str(args.threads)
+    require_shared_store(args.workers)
+    require_local_rooms(args.workers)
+    print(f"🚀 Backend (uvicorn) on http://{args.host}:{args.port} "
+          f"with {args.workers} worker(s) x {args.threads} thread(s)")
+    uvicorn.run(
+        'asgi:application',
+        app_dir=BACKEND_DIR,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        limit_concurrency=int(args.limit_concurrency) if args.limit_concurrency else None,
+        lifespan='on',
+        access_log=False,
+    )
+
+
+def run_prefork(args):
+    serve_prefork(args.host, args.port, args.workers, args.backlog)
+
+
+def run_dev(args):
+    sys.path.insert(0, BACKEND_DIR)
+    from app import create_app
+    app = create_app()
+    print(f"🚀 Backend (dev server) on http://{args.host}:{args.port}")
+    app.run(debug=args.debug, host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    if arguments.server == 'uvicorn':
+        run_uvicorn(arguments)
+    elif arguments.server == 'prefork':
+        run_prefork(arguments)
+    else:
+        run_dev(arguments)
@@ -0,0 +1,351 @@
+"""Headless simulation of many games for offline strategy evaluation
+
+    python backend/simulate.py --games 1000000 --workers 8
+    python backend/simulate.py --models human,hint_follower --hint-policies never,always,after:4 \\
+        --ranges 1-100,1-10000 --output runs.jsonl --per-game
+
+Games are played directly against GameLogic.check_guess, GuessTracker and
+the AIHints methods, with no HTTP or Flask in between. Each combination of
+player model, number range and hint policy is split into chunks that run
+on a process pool. Every chunk has its own RNG seeded from --seed and the
+chunk's identity, so a run gives the same results whatever the worker
+count. The hint policy is not part of that identity: every policy replays
+the same secrets, and each game's player noise starts from the same seed,
+so policies are compared on identical games. Chunk results are streamed
+to --output as JSON lines while the run progresses, and the attempt
+distribution of every combination is reported at the end.
+
+The hint a simulated player gets is get_binary_search_hint's, the solver's
+next guess, which hint_follower reads back with SUGGESTION. /guess serves
+generate_hint's catalogue text instead, personalized by the player's
+profile, and only struggling players are shown the solver's guess. The
+hint policies therefore measure what following the optimal suggestion is
+worth, not how players do with the hints the server sends.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+from collections import Counter
+
+from ai_hints import AIHints
+from game_logic import GameLogic
+from game_state import GuessTracker
+from solver import get_solver
+
+# The suggested number in AIHints.get_binary_search_hint's text
+SUGGESTION = re.compile(r'Try (?:starting with|guessing) (-?\d+)')
+
+
+# --- Player models ------------------------------------------------------
+
+class BinaryPlayer:
+    """Guesses the midpoint of what is still possible; never needs a hint"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def next_guess(self, lower, upper, hint):
+        """
+        Args:
+            lower (int): Lowest number still possible
+            upper (int): Highest number still possible
+            hint (str): Hint received for this guess, or None
+
+        Returns:
+            int: The guess
+        """
+        return (lower + upper) // 2
+
+
+class RandomPlayer(BinaryPlayer):
+    """Guesses uniformly inside what is still possible"""
+
+    def next_guess(self, lower, upper, hint):
+        return self.rng.randint(lower, upper)
+
+
+class HumanPlayer(BinaryPlayer):
+    """Aims for the midpoint but misses by a random fraction of the interval"""
+
+    noise = 0.25
+
+    def next_guess(self, lower, upper, hint):
+        guess = round(self.rng.gauss((lower + upper) / 2, (upper - lower) * self.noise))
+        return min(upper, max(lower, guess))
+
+
+class HintFollower(HumanPlayer):
+    """Plays like a human, but takes the suggested number whenever hinted"""
+
+    def next_guess(self, lower, upper, hint):
+        if hint:
+            match = SUGGESTION.search(hint)
+            if match:
+                return int(match.group(1))
+        return super().next_guess(lower, upper, hint)
+
+
+PLAYER_MODELS = {
+    'binary': BinaryPlayer,
+    'random': RandomPlayer,
+    'human': HumanPlayer,
+    'hint_follower': HintFollower,
+}
+
+
+def parse_hint_policy(policy):
+    """
+    'never', 'always', 'after:N' (from guess N+1 on) or 'every:N'
+
+    Returns:
+        Callable taking the number of guesses made and returning True to ask for a hint
+    """
+    name, _, value = policy.partition(':')
+    if name == 'never':
+        return lambda attempts: False
+    if name == 'always':
+        return lambda attempts: True
+    if name == 'after':
+        threshold = int(value)
+        return lambda attempts: attempts >= threshold
+    if name == 'every':
+        period = int(value)
+        return lambda attempts: attempts % period == period - 1
+    raise ValueError(f'Unknown hint policy: {policy}')
+
+
+def parse_range(value):
+    """'1-100' -> (1, 100)"""
+    match = re.fullmatch(r'(-?\d+)-(-?\d+)', value)
+    if not match:
+        raise ValueError(f'Ranges look like 1-100, not {value}')
+    return int(match.group(1)), int(match.group(2))
+
+
+# --- Simulation ---------------------------------------------------------
+
+_game_logic = None
+_ai_hints = None
+
+
+def _engine():
+    """This process's GameLogic and AIHints, built once per worker"""
+    global _game_logic, _ai_hints
+    if _ai_hints is None:
+        _game_logic = GameLogic()
+        _ai_hints = AIHints(_game_logic)
+    return _game_logic, _ai_hints
+
+
+def play_game(player, secret_number, min_number, max_number, wants_hint, max_attempts):
+    """
+    Play one game to the end
+
+    Returns:
+        tuple: (attempts, hints used, won)
+    """
+    game_logic, ai_hints = _engine()
+    tracker = GuessTracker(min_number, max_number)
+    guesses = []
+    hints = 0
+    hint = None
+    for attempts in range(max_attempts):
+        if wants_hint(attempts):
+            hints += 1
+            hint = ai_hints.get_binary_search_hint(guesses, secret_number, tracker)
+        guess = player.next_guess(tracker.lower_bound(), tracker.upper_bound(), hint)
+        hint = None
+        guesses.append(guess)
+        tracker.record(guess, secret_number)
+        if game_logic.check_guess(guess, secret_number)['correct']:
+            return attempts + 1, hints, True
+    return max_attempts, hints, False
+
+
+def run_chunk(task):
+    """
+    Play one chunk of games in a worker process
+
+    Args:
+        task (dict): model, range, hint_policy, games, chunk, seed,
+            max_attempts and per_game
+
+    Returns:
+        dict: The chunk's identity plus an attempts histogram, hint and
+            win totals, and the per-game attempts if requested
+    """
+    min_number, max_number = task['range']
+    rng = random.Random(f"{task['seed']}:{task['model']}:{min_number}-{max_number}:{task['chunk']}")
+    # Reseeded per game, so hints changing how many guesses a game takes
+    # cannot shift the secrets or noise of the games after it
+    player_rng = random.Random()
+    player = PLAYER_MODELS[task['model']](player_rng)
+    wants_hint = parse_hint_policy(task['hint_policy'])
+
+    histogram = Counter()
+    per_game = []
+    hints = 0
+    wins = 0
+    for _ in range(task['games']):
+        secret_number = rng.randint(min_number, max_number)
+        player_rng.seed(rng.getrandbits(64))
+        attempts, used, won = play_game(player, secret_number, min_number, max_number,
+                                        wants_hint, task['max_attempts'])
+        histogram[attempts] += 1
+        hints += used
+        wins += won
+        if task['per_game']:
+            per_game.append(attempts)
+
+    result = {
+        'model': task['model'],
+        'range': f'{min_number}-{max_number}',
+        'hint_policy': task['hint_policy'],
+        'chunk': task['chunk'],
+        'games': task['games'],
+        'wins': wins,
+        'hints': hints,
+        'attempts': {str(attempts): count for attempts, count in sorted(histogram.items())},
+    }
+    if task['per_game']:
+        result['per_game'] = per_game
+    return result
+
+
+def make_tasks(args):
+    """Split every (model, range, hint policy) combination into chunks"""
+    tasks = []
+    for model in args.models:
+        for number_range in args.ranges:
+            for policy in args.hint_policies:
+                remaining = args.games
+                chunk = 0
+                while remaining > 0:
+                    games = min(args.chunk_size, remaining)
+                    tasks.append({
+                        'model': model, 'range': number_range, 'hint_policy': policy,
+                        'games': games, 'chunk': chunk, 'seed': args.seed,
+                        'max_attempts': args.max_attempts, 'per_game': args.per_game,
+                    })
+                    remaining -= games
+                    chunk += 1
+    return tasks
+
+
+# --- Reporting ----------------------------------------------------------
+
+def summarize(results):
+    """Merge chunk results into one attempt distribution per combination"""
+    merged = {}
+    for result in results:
+        key = (result['model'], result['range'], result['hint_policy'])
+        entry = merged.setdefault(key, {'games': 0, 'wins': 0, 'hints': 0, 'histogram': Counter()})
+        entry['games'] += result['games']
+        entry['wins'] += result['wins']
+        entry['hints'] += result['hints']
+        entry['histogram'].update({int(attempts): count for attempts, count in result['attempts'].items()})
+
+    summary = []
+    for (model, number_range, policy), entry in sorted(merged.items()):
+        histogram = entry['histogram']
+        total = entry['games']
+        cumulative = 0
+        quantiles = {}
+        for attempts in sorted(histogram):
+            cumulative += histogram[attempts]
+            for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+                if name not in quantiles and cumulative >= fraction * total:
+                    quantiles[name] = attempts
+        min_number, max_number = parse_range(number_range)
+        summary.append({
+            'model': model,
+            'range': number_range,
+            'hint_policy': policy,
+            'games': total,
+            'win_rate': entry['wins'] / total,
+            'mean_attempts': sum(attempts * count for attempts, count in histogram.items()) / total,
+            **quantiles,
+            'max': max(histogram),
+            'hints_per_game': entry['hints'] / total,
+            'optimal_mean': get_solver(min_number, max_number).expected_attempts(min_number, max_number),
+            'attempts': {str(attempts): histogram[attempts] for attempts in sorted(histogram)},
+        })
+    return summary
+
+
+def print_report(summary):
+    print(f"{'model':<14}{'range':<12}{'hints':<10}{'games':>10}{'mean':>8}{'opt':>7}"
+          f"{'p50':>5}{'p90':>5}{'p99':>5}{'max':>6}{'hints/g':>9}{'won':>8}")
+    for row in summary:
+        print(f"{row['model']:<14}{row['range']:<12}{row['hint_policy']:<10}{row['games']:>10}"
+              f"{row['mean_attempts']:>8.2f}{row['optimal_mean']:>7.2f}{row['p50']:>5}{row['p90']:>5}"
+              f"{row['p99']:>5}{row['max']:>6}{row['hints_per_game']:>9.2f}{row['win_rate']:>8.1%}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate games to evaluate player models and hint policies')
+    parser.add_argument('--games', type=int, default=100000, help='Games per model, range and hint policy')
+    parser.add_argument('--models', default='binary,human,hint_follower',
+                        help=f"Comma-separated player models: {', '.join(sorted(PLAYER_MODELS))}")
+    parser.add_argument('--ranges', default='1-100', help='Comma-separated ranges, e.g. 1-100,1-1000')
+    parser.add_argument('--hint-policies', default='never,always',
+                        help='Comma-separated: never, always, after:N, every:N')
+    parser.add_argument('--max-attempts', type=int, default=1000, help='A game stops unwon after this many guesses')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Games per task sent to a worker')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Stream chunk results to this JSON lines file')
+    parser.add_argument('--per-game', action='store_true', help='Include every game\'s attempts in --output')
+    parser.add_argument('--json', help='Write the final summary to this file')
+    args = parser.parse_args(argv)
+
+    args.models = args.models.split(',')
+    unknown = [model for model in args.models if model not in PLAYER_MODELS]
+    if unknown:
+        parser.error(f"Unknown player model(s): {', '.join(unknown)}")
+    args.ranges = [parse_range(value) for value in args.ranges.split(',')]
+    args.hint_policies = args.hint_policies.split(',')
+    for policy in args.hint_policies:
+        parse_hint_policy(policy)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tasks = make_tasks(args)
+    combinations = len(args.models) * len(args.ranges) * len(args.hint_policies)
+    print(f"🎲 {args.games} games x {combinations} combinations in {len(tasks)} chunks "
+          f"on {args.workers} worker(s), seed {args.seed}")
+
+    output = open(args.output, 'w') if args.output else None
+    results = []
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            # Chunks are written as they finish, so a long run can be followed with tail -f
+            for result in pool.imap_unordered(run_chunk, tasks):
+                if output is not None:
+                    output.write(json.dumps(result, separators=(',', ':')) + '\n')
+                result.pop('per_game', None)
+                results.append(result)
+    finally:
+        if output is not None:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    total_games = sum(result['games'] for result in results)
+    print(f"⏱  {total_games} games in {elapsed:.1f}s ({total_games / elapsed:,.0f} games/s)")
+    summary = summarize(results)
+    print_report(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'seed': args.seed, 'games': total_games, 'seconds': elapsed, 'summary': summary}, f, indent=2)
+        print(f"💾 Summary written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
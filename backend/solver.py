@@ -0,0 +1,85 @@
+from functools import lru_cache
+
+
+class GuessSolver:
+    """Optimal next guesses over the remaining interval of one number range
+
+    Secrets are drawn uniformly, and under a uniform prior guessing the
+    midpoint of the remaining interval builds the complete binary search
+    tree. That tree minimises the expected attempts and the worst-case
+    attempts, and it maximises the chance of winning within any attempt
+    limit. Every answer then has a closed form and needs no table,
+    whatever the range size.
+    """
+
+    def __init__(self, min_number, max_number):
+        """
+        Args:
+            min_number (int): Lowest possible secret number
+            max_number (int): Highest possible secret number
+        """
+        self.min_number = min_number
+        self.max_number = max_number
+
+    def _check(self, lower, upper):
+        if lower > upper or lower < self.min_number or upper > self.max_number:
+            raise ValueError(f'Interval {lower}-{upper} is outside {self.min_number}-{self.max_number}')
+
+    def next_guess(self, lower, upper):
+        """
+        Best guess when the secret is known to lie in [lower, upper]
+
+        Args:
+            lower (int): Lowest number still possible
+            upper (int): Highest number still possible
+
+        Returns:
+            int: The guess to make next
+        """
+        self._check(lower, upper)
+        return (lower + upper) // 2
+
+    def worst_case_attempts(self, lower, upper):
+        """
+        Fewest attempts that guarantee a win from [lower, upper]
+
+        Returns:
+            int: ceil(log2(n + 1)) for an interval of n numbers
+        """
+        self._check(lower, upper)
+        return (upper - lower + 1).bit_length()
+
+    def expected_attempts(self, lower, upper):
+        """
+        Expected attempts to win from [lower, upper] when playing optimally
+
+        Returns:
+            float: Average attempts over the numbers in the interval
+        """
+        self._check(lower, upper)
+        n = upper - lower + 1
+        # Complete tree: levels 1..d are full, the remaining r nodes sit at depth d + 1
+        d = (n + 1).bit_length() - 1
+        r = n - ((1 << d) - 1)
+        return ((d - 1) * (1 << d) + 1 + r * (d + 1)) / n
+
+    def win_probability(self, lower, upper, attempts_left):
+        """
+        Chance of winning within attempts_left guesses
+
+        Returns:
+            float: Between 0 and 1
+        """
+        self._check(lower, upper)
+        if attempts_left <= 0:
+            return 0.0
+        n = upper - lower + 1
+        if attempts_left >= n.bit_length():
+            return 1.0
+        return ((1 << attempts_left) - 1) / n
+
+
+@lru_cache(maxsize=256)
+def get_solver(min_number, max_number):
+    """Return the shared solver for a range"""
+    return GuessSolver(min_number, max_number)
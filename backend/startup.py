@@ -0,0 +1,102 @@
+"""Lazy resources and readiness tracking for fast worker startup
+
+Importing the app only defines routes. Resources that cost something to
+build (hint tables, the hint provider's pool, the leaderboard schema) are
+wrapped in Lazy and built on first use. create_app() can then run a
+warm-up that builds them and precomputes tables ahead of traffic, and
+/ready reports 503 until that is done so a load balancer or autoscaler
+only routes to warm workers.
+"""
+import threading
+import time
+
+# When the backend modules started loading; app.py imports this module early
+IMPORTED_AT = time.perf_counter()
+
+
+class Lazy:
+    """A resource built by factory() on first get(), once, thread-safely"""
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory: Callable returning the resource
+        """
+        self._factory = factory
+        self._value = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the resource, building it if this is the first call"""
+        if self._built:
+            return self._value
+        with self._lock:
+            if not self._built:
+                self._value = self._factory()
+                self._built = True
+        return self._value
+
+    @property
+    def built(self):
+        return self._built
+
+
+class Startup:
+    """Readiness of this worker: ready unless a warm-up is still running"""
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self._ready.set()
+        self.started = False
+        self.warm_up_seconds = None
+        self.ready_after = None     # seconds from IMPORTED_AT to ready
+        self.error = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def run(self, warm_up, background=True):
+        """
+        Run warm_up() with the worker marked not ready until it finishes
+
+        Args:
+            warm_up: Callable doing the warm-up work
+            background (bool): Run on a daemon thread so requests are
+                served meanwhile; pass False before forking workers
+        """
+        if self.started:
+            return
+        self.started = True
+        self._ready.clear()
+        if background:
+            threading.Thread(target=self._run, args=(warm_up,), name='warm-up', daemon=True).start()
+        else:
+            self._run(warm_up)
+
+    def _run(self, warm_up):
+        started = time.perf_counter()
+        try:
+            warm_up()
+        except Exception as e:
+            # A failed warm-up leaves resources to be built lazily; still serve
+            self.error = str(e)
+            print(f"⚠️  Warm-up failed: {e}")
+        self.warm_up_seconds = time.perf_counter() - started
+        self.ready_after = time.perf_counter() - IMPORTED_AT
+        self._ready.set()
+
+    def wait(self, timeout=None):
+        """Block until ready; returns False on timeout"""
+        return self._ready.wait(timeout)
+
+    def status(self):
+        """Body for /ready"""
+        status = {'ready': self.ready}
+        if self.warm_up_seconds is not None:
+            status['warm_up_ms'] = round(self.warm_up_seconds * 1000, 2)
+            status['ready_after_ms'] = round(self.ready_after * 1000, 2)
+        if self.error:
+            status['warm_up_error'] = self.error
+        return status
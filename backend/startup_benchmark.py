@@ -0,0 +1,158 @@
+"""Measure how quickly a cold backend process becomes useful
+
+    python backend/startup_benchmark.py --runs 5
+    python backend/startup_benchmark.py --server prefork --no-warm-up --output cold.json
+
+Every run starts fresh interpreters, so nothing is cached between runs:
+
+- import: time for `import app`, then for create_app() with a foreground
+  warm-up, measured inside a new interpreter.
+- first request: time from spawning serve.py until its first /status
+  answers, and until /ready answers 200.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark import BACKEND_DIR, git_revision, percentile
+
+IMPORT_PROBE = '''
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app(background=False)
+print(json.dumps({"import_ms": (imported - started) * 1000,
+                  "create_app_ms": (time.perf_counter() - imported) * 1000}))
+'''
+
+# How often a starting server is polled, and for how long
+POLL_INTERVAL = 0.002
+START_TIMEOUT = 30.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def probe(port, path):
+    """Status code of a GET, or None while nothing is listening"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return None
+    finally:
+        conn.close()
+
+
+def measure_import(env):
+    output = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_server(args, env):
+    """Spawn a server and time its first answered request and readiness"""
+    port = free_port()
+    command = [sys.executable, 'serve.py', '--server', args.server, '--host', '127.0.0.1',
+               '--port', str(port), '--workers', '1']
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timings = {}
+    try:
+        deadline = started + START_TIMEOUT
+        while 'first_request_ms' not in timings or 'ready_ms' not in timings:
+            if time.perf_counter() > deadline or process.poll() is not None:
+                raise RuntimeError(f'{args.server} server did not become ready')
+            if 'first_request_ms' not in timings:
+                if probe(port, '/status') == 200:
+                    timings['first_request_ms'] = (time.perf_counter() - started) * 1000
+                    continue
+            elif probe(port, '/ready') == 200:
+                timings['ready_ms'] = (time.perf_counter() - started) * 1000
+                continue
+            time.sleep(POLL_INTERVAL)
+    finally:
+        process.terminate()
+        process.wait()
+    return timings
+
+
+def summarize(samples):
+    """min / median / max of each timing across runs"""
+    summary = {}
+    for name in samples[0]:
+        values = sorted(sample[name] for sample in samples)
+        summary[name] = {
+            'min': round(values[0], 2),
+            'median': round(percentile(values, 0.5), 2),
+            'max': round(values[-1], 2),
+        }
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark backend startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts to measure')
+    parser.add_argument('--server', choices=['dev', 'prefork', 'uvicorn'], default='dev')
+    parser.add_argument('--no-warm-up', dest='warm_up', action='store_false',
+                        help='Start with WARM_UP=0 (resources built on first use)')
+    parser.add_argument('--label', help='Free-form label stored in the JSON results')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🏁 {args.runs} cold starts, {args.server} server, warm-up {'on' if args.warm_up else 'off'}")
+
+    samples = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ,
+                   WARM_UP='1' if args.warm_up else '0',
+                   GAME_STORE_PATH=os.path.join(data_dir, 'games.db'),
+                   LEADERBOARD_PATH=os.path.join(data_dir, 'leaderboard.db'),
+                   PLAYER_PROFILES_PATH=os.path.join(data_dir, 'player_profiles.db'))
+        if args.server == 'dev':
+            env.setdefault('GAME_STORE', 'memory')
+        for _ in range(args.runs):
+            sample = measure_import(env)
+            sample.update(measure_server(args, env))
+            samples.append(sample)
+
+    summary = summarize(samples)
+    print(f"{'':<18}{'min':>10}{'median':>10}{'max':>10}")
+    for name, stats in summary.items():
+        print(f"{name:<18}{stats['min']:>8.1f}ms{stats['median']:>8.1f}ms{stats['max']:>8.1f}ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'label': args.label,
+                'git_revision': git_revision(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'config': {key: value for key, value in vars(args).items() if key != 'output'},
+                'samples': samples,
+                'summary': summary,
+            }, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
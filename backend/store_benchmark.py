@@ -0,0 +1,132 @@
+"""Measure how SQLite game store transactions scale with worker processes
+
+    python backend/store_benchmark.py
+    python backend/store_benchmark.py --processes 1,2,4,8 --work-ms 2 --output store.json
+
+Each process plays guesses on games of its own through
+SQLiteGameStore.transaction, the way prefork workers share one file.
+The body of each transaction reads and rewrites the state, then waits
+--work-ms with the game held, standing in for what /guess does there
+(checking the guess, prefetching hints, logging). The same run is
+repeated with the BEGIN IMMEDIATE transaction the store used before
+rows were versioned, which held the database write lock for the whole
+body.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import tempfile
+import time
+from contextlib import contextmanager
+
+from benchmark import git_revision
+from game_store import GameConflict, GameTransaction, SQLiteGameStore
+
+GAMES_PER_PROCESS = 8
+
+
+class LockedSQLiteGameStore(SQLiteGameStore):
+    """What transaction() did before: the database write lock around the body"""
+
+    @contextmanager
+    def transaction(self, game_id):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            txn = GameTransaction(game_id, self.get(game_id))
+            yield txn
+            if txn.dirty and txn.state is not None:
+                self.save(game_id, txn.state)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+
+STORES = {'versioned': SQLiteGameStore, 'locked': LockedSQLiteGameStore}
+
+
+def play(kind, path, transactions, work, start, results):
+    """One worker: guesses round-robin over its own games"""
+    store = STORES[kind](path)
+    games = [store.create({'attempts': 0, 'guesses': []}) for _ in range(GAMES_PER_PROCESS)]
+    conflicts = 0
+    start.wait()
+    started = time.perf_counter()
+    for n in range(transactions):
+        try:
+            with store.transaction(games[n % GAMES_PER_PROCESS]) as txn:
+                txn.state['attempts'] += 1
+                txn.state['guesses'].append(n)
+                time.sleep(work)
+                txn.save()
+        except GameConflict:
+            conflicts += 1
+    results.put((time.perf_counter() - started, conflicts))
+
+
+def run(kind, processes, transactions, work):
+    """Transactions per second over all processes, and conflicts seen"""
+    with tempfile.TemporaryDirectory(prefix='store-benchmark-') as directory:
+        path = os.path.join(directory, 'games.db')
+        STORES[kind](path)
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=play, args=(kind, path, transactions, work, start, results))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        time.sleep(0.2)     # let every worker open the file and create its games
+        start.set()
+        outcomes = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    elapsed = max(seconds for seconds, _ in outcomes)
+    return processes * transactions / elapsed, sum(conflicts for _, conflicts in outcomes)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark SQLite game store transactions')
+    parser.add_argument('--processes', default='1,2,4,8', help='Comma-separated worker process counts')
+    parser.add_argument('--transactions', type=int, default=300, help='Transactions per process')
+    parser.add_argument('--work-ms', type=float, default=1.0, help='Milliseconds each transaction holds its game')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    counts = [int(count) for count in args.processes.split(',')]
+    work = args.work_ms / 1000
+    print(f"🗄️  {args.transactions} transactions per process, {args.work_ms:g} ms held each, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'processes':<11}{'versioned':>14}{'locked':>14}")
+
+    results = {}
+    for processes in counts:
+        row = results[processes] = {}
+        for kind in STORES:
+            rate, conflicts = run(kind, processes, args.transactions, work)
+            row[f'{kind}_per_second'] = round(rate, 1)
+            row[f'{kind}_conflicts'] = conflicts
+        print(f"{processes:<11}{row['versioned_per_second']:>12.0f}/s{row['locked_per_second']:>12.0f}/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'git_revision': git_revision(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'transactions': args.transactions,
+                'work_ms': args.work_ms,
+                'results': results,
+            }, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import struct
+
+from game_store import SQLiteGameStore
+from wire import BINARY_MIMETYPE, CORRECT_FLAG, VERSION
+
+
+def _start(client, min_number=1, max_number=100, **body):
+    response = client.post('/start', json=dict(body, min_number=min_number, max_number=max_number))
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _secret(backend, started):
+    """The secret of a game /start did not disclose"""
+    return backend._secret_number(backend.game_store.get(started['game_id']))
+
+
+def _solve(client, min_number, max_number, **body):
+    """Binary search to the secret; returns every /guess response body"""
+    lower, upper = min_number, max_number
+    responses = []
+    while True:
+        guess = (lower + upper) // 2
+        data = client.post('/guess', json=dict(body, guess=guess)).get_json()
+        responses.append(data)
+        if data['correct']:
+            return responses
+        if data['result'].startswith('Too high'):
+            upper = guess - 1
+        else:
+            lower = guess + 1
+
+
+def test_full_game(backend, client):
+    started = _start(client)
+    assert 'secret_number' not in started
+    assert started['min_number'] == 1 and started['max_number'] == 100
+    responses = _solve(client, 1, 100)
+    won = responses[-1]
+    assert won['game_over'] is True
+    assert won['attempts'] == len(responses) <= 7
+    assert won['guesses'][-1] == _secret(backend, started)
+    assert client.get('/status').get_json()['game_active'] is False
+    assert client.post('/guess', json={'guess': 50}).status_code == 400
+
+
+def test_invalid_requests_get_stable_codes(client):
+    assert client.post('/guess', json={'guess': 5}).status_code == 400    # no game yet
+    response = client.post('/start', json={'min_number': 1, 'max_number': 2 ** 60})
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'out_of_range'
+    response = client.post('/start', json={'min_number': 10, 'max_number': 10})
+    assert response.get_json()['code'] == 'bad_range'
+
+    _start(client)
+    for body, code in (({}, 'missing'), ({'guess': True}, 'not_integer'), ({'guess': 12.5}, 'not_integer'),
+                       ({'guess': 2 ** 53}, 'out_of_range'), ({'guess': 101}, 'out_of_range'),
+                       ({'guess': 5, 'get_hint': 'yes'}, 'not_boolean')):
+        response = client.post('/guess', json=body)
+        assert response.status_code == 400
+        assert response.get_json()['code'] == code
+    assert client.get('/status').get_json()['attempts'] == 0
+
+
+def test_hint_requests(backend, client):
+    secret = _secret(backend, _start(client, 1, 1000))
+    wrong = 1 if secret > 2 else 1000
+    data = client.post('/guess', json={'guess': wrong, 'get_hint': True}).get_json()
+    assert data['ai_hint']
+    assert 'ai_hint' not in client.post('/guess', json={'guess': wrong}).get_json()
+
+
+def test_struggling_players_get_the_odds_of_their_remaining_attempts(backend, client):
+    game_id = _start(client, 1, 1000)['game_id']
+    state = backend.game_store.get(game_id)
+    state.update(max_attempts=3, profile={'tone': 'struggling', 'usual_attempts': None, 'unreasonable_rate': 0.0})
+    backend.game_store.save(game_id, state)
+    secret = backend._secret_number(state)
+    wrong = 1 if secret > 2 else 1000
+    hint = client.post('/guess', json={'guess': wrong, 'get_hint': True}).get_json()['ai_hint']
+    assert 'With 2 attempts left, playing optimally wins' in hint
+
+
+def test_reset_and_restart_replace_the_game(backend, client):
+    first = _start(client)['game_id']
+    second = _start(client)['game_id']
+    assert backend.game_store.get(first) is None
+    assert client.post('/reset').status_code == 200
+    assert backend.game_store.get(second) is None
+    assert client.get('/status').get_json()['game_active'] is False
+
+
+def test_batch_stops_at_the_win(backend, client):
+    secret = _secret(backend, _start(client, 1, 10))
+    response = client.post('/guess/batch', json={'guesses': list(range(1, 11))})
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['correct'] is True and data['game_active'] is False
+    assert data['processed'] == secret
+    assert data['results'][-1] == [secret, 0]
+
+    _start(client, 1, 10)
+    response = client.post('/guess/batch', json={'guesses': [1, 11]})
+    assert response.get_json()['code'] == 'out_of_range'
+    assert client.get('/status').get_json()['attempts'] == 0
+
+
+def test_disclosed_secret_is_not_ranked(backend, client, monkeypatch):
+    _start(client, 1, 64)
+    rank = _solve(client, 1, 64)[-1]['leaderboard_rank']
+    assert isinstance(rank, int) and rank >= 1
+
+    monkeypatch.setattr(backend, 'DISCLOSE_SECRET', True)
+    started = _start(client, 1, 64)
+    assert started['secret_number'] == _secret(backend, started)
+    assert _solve(client, 1, 64)[-1]['leaderboard_rank'] is None
+
+
+def test_binary_responses(backend, client):
+    secret = _secret(backend, _start(client, 1, 100))
+    headers = {'Accept': BINARY_MIMETYPE}
+    body = client.post('/guess', json={'guess': secret}, headers=headers).data
+    version, flags, code, attempts, guess = struct.unpack_from('>BBbIq', body)
+    assert (version, code, attempts, guess) == (VERSION, 0, 1, secret)
+    assert flags & CORRECT_FLAG
+
+    _start(client, 1, 100)
+    client.post('/guess', json={'guess': 1})
+    client.post('/guess', json={'guess': 2})
+    body = client.get('/status?since=1', headers=headers).data
+    assert struct.unpack('>BBqqIIq', body)[2:] == (1, 100, 2, 1, 2)
+
+
+def test_players_sharing_an_address_keep_their_games(backend, monkeypatch):
+    monkeypatch.setattr(backend.client_games, 'max_games', 1)
+    app = backend.create_app(background=False)
+    alice, bob = app.test_client(), app.test_client()
+    _start(alice)
+    _start(bob)
+    assert alice.get('/status').get_json()['game_active'] is True
+    assert bob.get('/status').get_json()['game_active'] is True
+
+
+def test_guess_that_loses_a_race_gets_409(backend, client, monkeypatch, tmp_path):
+    path = str(tmp_path / 'games.db')
+    monkeypatch.setattr(backend, 'game_store', SQLiteGameStore(path))
+    game_id = _start(client)['game_id']
+    other_worker = SQLiteGameStore(path)
+    log_guess = backend._log_guess
+
+    def race(*args):
+        # Another worker saves the game while this guess holds it
+        with other_worker.transaction(game_id) as txn:
+            txn.state['attempts'] = 10
+            txn.save()
+        log_guess(*args)
+
+    monkeypatch.setattr(backend, '_log_guess', race)
+    response = client.post('/guess', json={'guess': 50})
+    assert response.status_code == 409
+    assert response.get_json()['code'] == 'conflict'
+    assert backend.game_store.get(game_id)['attempts'] == 10
+
+
+def test_metrics_and_readiness(client):
+    _start(client)
+    client.post('/guess', json={'guess': 50})
+    text = client.get('/metrics').get_data(as_text=True)
+    assert 'guessmaster_requests_total{endpoint="/guess",method="POST",status="200"}' in text
+    assert client.get('/ready').status_code == 200
+    assert client.get('/test').status_code == 200
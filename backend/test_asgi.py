@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+from asgi import MAX_BODY_BYTES, Application
+
+
+@pytest.fixture
+def application(backend):
+    return Application(backend.create_app(background=False), threads=4)
+
+
+def _call(application, method, path, body=b'', headers=(), until=None):
+    """
+    Send one request through the ASGI app
+
+    Args:
+        until: Bytes after which the client disconnects, for streams
+
+    Returns:
+        tuple: (status, headers dict, body bytes)
+    """
+    async def run():
+        received = []
+        disconnect = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            received.append(message)
+            if until is not None and until in b''.join(m.get('body', b'') for m in received):
+                disconnect.set()
+
+        declared = dict(headers)
+        declared.setdefault(b'content-length', str(len(body)).encode())
+        scope = {
+            'type': 'http', 'http_version': '1.1', 'method': method, 'path': path, 'query_string': b'',
+            'headers': list(declared.items()),
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        }
+        await asyncio.wait_for(application(scope, receive, send), 5)
+        start = received[0]
+        return (start['status'], dict(start['headers']),
+                b''.join(message.get('body', b'') for message in received[1:]))
+
+    return asyncio.run(run())
+
+
+def test_requests_reach_flask(application):
+    status, headers, body = _call(application, 'POST', '/rooms', b'{"max_number": 50}',
+                                  [(b'content-type', b'application/json')])
+    assert status == 201
+    room_id = json.loads(body)['room_id']
+    status, _, body = _call(application, 'GET', f'/rooms/{room_id}')
+    assert status == 200 and json.loads(body)['max_number'] == 50
+
+
+def test_oversized_bodies_are_refused(application):
+    declared = [(b'content-length', str(MAX_BODY_BYTES + 1).encode())]
+    status, _, _ = _call(application, 'POST', '/start', headers=declared)
+    assert status == 413
+
+
+def test_room_events_are_streamed_on_the_loop(application):
+    _, _, body = _call(application, 'POST', '/rooms', b'{}', [(b'content-type', b'application/json')])
+    room_id = json.loads(body)['room_id']
+    status, headers, body = _call(application, 'GET', f'/rooms/{room_id}/events', until=b'event: snapshot')
+    assert status == 200
+    assert headers[b'content-type'].startswith(b'text/event-stream')
+    assert b'content-length' not in headers
+    assert b'event: snapshot' in body
+
+    # Anything but an admitted stream is passed on as the app answered
+    status, _, body = _call(application, 'GET', '/rooms/unknown/events')
+    assert status == 404 and json.loads(body)['error'] == 'Room not found'
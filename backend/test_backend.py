@@ -13,6 +13,9 @@ def test_start_game():
         data = response.json()
         print(f"✅ Game started successfully!")
         print(f"   Message: {data['message']}")
+        if 'secret_number' not in data:
+            print("   Secret number: hidden (start the server with DISCLOSE_SECRET=1 to run this test)")
+            return None
         print(f"   Secret number: {data['secret_number']}")
         print(f"   Attempts: {data['attempts']}")
         return data['secret_number']
@@ -76,6 +79,48 @@ def test_reset_game():
     else:
         print(f"❌ Failed to reset game: {response.status_code}")
 
+def test_batch_guess():
+    """Test the /guess/batch endpoint"""
+    print("\nTesting /guess/batch endpoint...")
+    client = requests.Session()
+    client.post(f'{BASE_URL}/start')
+    
+    payload = {'guesses': list(range(1, 101)), 'get_hint': False}
+    response = client.post(f'{BASE_URL}/guess/batch', json=payload)
+    
+    if response.status_code == 200:
+        data = response.json()
+        print(f"✅ Batch processed successfully!")
+        print(f"   Processed: {data['processed']}")
+        print(f"   Correct: {data['correct']}")
+        print(f"   Attempts: {data['attempts']}")
+    else:
+        print(f"❌ Failed to process batch: {response.status_code}")
+        print(f"   Error: {response.text}")
+
+def test_room():
+    """Test a multiplayer room and its event stream"""
+    print("\nTesting /rooms endpoints...")
+    response = requests.post(f'{BASE_URL}/rooms', json={'min_number': 1, 'max_number': 100})
+    if response.status_code != 201:
+        print(f"❌ Failed to create room: {response.status_code}")
+        return
+    room_id = response.json()['room_id']
+    print(f"✅ Room created: {room_id}")
+    
+    # Win the room by trying every number in turn
+    for guess in range(1, 101):
+        data = requests.post(f'{BASE_URL}/rooms/{room_id}/guess', json={'guess': guess, 'name': 'tester'}).json()
+        if data.get('correct'):
+            break
+    
+    # A finished room's stream sends its snapshot and closes
+    stream = requests.get(f'{BASE_URL}/rooms/{room_id}/events', timeout=5)
+    if 'event: snapshot' in stream.text and '"finished":true' in stream.text:
+        print(f"✅ Room won in {data['attempts']} attempts and the stream reported it")
+    else:
+        print(f"❌ Unexpected event stream: {stream.text[:200]}")
+
 def run_full_game_test():
     """Run a complete game test"""
     print("🎮 Starting Number Guessing Game Test")
@@ -108,6 +153,12 @@ def run_full_game_test():
     # Reset the game
     test_reset_game()
     
+    # Play a whole game in one batch
+    test_batch_guess()
+    
+    # Race through a multiplayer room
+    test_room()
+    
     print("\n" + "=" * 50)
     print("✅ All tests completed!")
 
@@ -0,0 +1,68 @@
+import itertools
+
+import pytest
+
+from event_log import EVENT_RECORD, SECRET_UNKNOWN, GameEventLog
+from fairness import SecretDeriver, verify_commitment
+
+# Fields that differ between any two games, whatever their secrets
+PER_GAME = ('nonce', 'started_at', 'player_id', 'player_name')
+
+
+@pytest.fixture
+def deriver(backend, monkeypatch):
+    deriver = SecretDeriver(b'test-game-key')
+    monkeypatch.setattr(backend, 'secret_deriver', deriver)
+    return deriver
+
+
+def _nonces_with_secrets_above(deriver, guess, count):
+    """Nonces whose secrets in 1-1000 all differ and lie above guess"""
+    found = {}
+    for n in itertools.count():
+        nonce = f'{n:032x}'
+        secret = deriver.secret_number(nonce, 1, 1000)
+        if secret > guess + 1 and secret not in found:
+            found[secret] = nonce
+            if len(found) == count:
+                return list(found.items())
+
+
+def _play(backend, client, monkeypatch, deriver, nonce, guesses):
+    monkeypatch.setattr(deriver, 'new_nonce', lambda: nonce)
+    started = client.post('/start', json={'min_number': 1, 'max_number': 1000}).get_json()
+    assert 'secret_number' not in started
+    for guess in guesses:
+        client.post('/guess', json={'guess': guess, 'get_hint': True})
+    return started, backend.game_store.get(started['game_id'])
+
+
+def test_stored_state_does_not_reveal_the_secret(backend, client, deriver, monkeypatch):
+    guesses = [500, 400, 499]
+    (secret_a, nonce_a), (secret_b, nonce_b) = _nonces_with_secrets_above(deriver, 500, 2)
+    _, state_a = _play(backend, client, monkeypatch, deriver, nonce_a, guesses)
+    _, state_b = _play(backend, client, monkeypatch, deriver, nonce_b, guesses)
+    assert secret_a != secret_b
+
+    # Games with different secrets but the same feedback are stored identically
+    for state in (state_a, state_b):
+        for name in PER_GAME:
+            state.pop(name, None)
+        state.pop('prefetched_hints', None)
+    assert state_a == state_b
+    assert set(state_a['tracker']) == {'min_number', 'max_number', 'low', 'high', 'count'}
+
+
+def test_event_log_holds_the_secret_only_once_revealed(backend, client, deriver, monkeypatch, tmp_path):
+    log = GameEventLog(str(tmp_path / 'events.log'), flush_bytes=1)
+    monkeypatch.setattr(backend, 'event_log', log)
+    [(secret, nonce)] = _nonces_with_secrets_above(deriver, 500, 1)
+    started, _ = _play(backend, client, monkeypatch, deriver, nonce, [500, 1000])
+    won = client.post('/guess', json={'guess': secret}).get_json()
+    log.close()
+
+    data = (tmp_path / 'events.log').read_bytes()
+    logged = [record[4] for record in EVENT_RECORD.iter_unpack(data)]
+    expected = [SECRET_UNKNOWN, SECRET_UNKNOWN, secret] if secret != 1000 else [SECRET_UNKNOWN, secret]
+    assert logged == expected
+    assert verify_commitment(started['commitment'], won['reveal']['secret_number'], won['reveal']['salt'])
@@ -0,0 +1,124 @@
+import sqlite3
+
+import pytest
+
+from game_store import GameConflict, MemoryGameStore, SQLiteGameStore
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryGameStore(ttl=60)
+    return SQLiteGameStore(str(tmp_path / 'games.db'), ttl=60)
+
+
+def test_create_get_delete(store):
+    game_id = store.create({'attempts': 0})
+    assert store.get(game_id) == {'attempts': 0}
+    store.delete(game_id)
+    assert store.get(game_id) is None
+    assert store.get('unknown') is None
+
+
+def test_transaction_saves_only_when_marked(store):
+    game_id = store.create({'attempts': 0})
+    with store.transaction(game_id) as txn:
+        txn.state = dict(txn.state, attempts=1)
+    assert store.get(game_id) == {'attempts': 0}
+    with store.transaction(game_id) as txn:
+        txn.state = dict(txn.state, attempts=2)
+        txn.save()
+    assert store.get(game_id) == {'attempts': 2}
+    with store.transaction('unknown') as txn:
+        assert txn.state is None
+
+
+def test_failed_transaction_leaves_state(store):
+    game_id = store.create({'attempts': 0})
+    with pytest.raises(RuntimeError):
+        with store.transaction(game_id) as txn:
+            txn.state = dict(txn.state, attempts=5)
+            txn.save()
+            raise RuntimeError('view failed')
+    assert store.get(game_id) == {'attempts': 0}
+
+    # Changes made in place are not kept either
+    with pytest.raises(RuntimeError):
+        with store.transaction(game_id) as txn:
+            txn.state['attempts'] = 6
+            raise RuntimeError('view failed')
+    assert store.get(game_id) == {'attempts': 0}
+
+
+def test_sqlite_transaction_detects_a_concurrent_save(tmp_path):
+    path = str(tmp_path / 'games.db')
+    ours, theirs = SQLiteGameStore(path), SQLiteGameStore(path)   # as in two worker processes
+    game_id = ours.create({'attempts': 0})
+    other_id = ours.create({'attempts': 0})
+    with pytest.raises(GameConflict):
+        with ours.transaction(game_id) as txn:
+            with theirs.transaction(game_id) as their_txn:
+                their_txn.state['attempts'] = 1
+                their_txn.save()
+            # Other games are not held up by an open transaction
+            with theirs.transaction(other_id) as their_txn:
+                their_txn.state['attempts'] = 1
+                their_txn.save()
+            txn.state['attempts'] = 5
+            txn.save()
+    assert ours.get(game_id) == {'attempts': 1}
+    assert ours.get(other_id) == {'attempts': 1}
+
+
+def test_sqlite_store_versions_older_files(tmp_path):
+    path = str(tmp_path / 'games.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE games (game_id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)')
+    conn.execute("INSERT INTO games VALUES ('old', '{\"attempts\":2}', 1e12)")
+    conn.commit()
+    conn.close()
+    store = SQLiteGameStore(path)
+    with store.transaction('old') as txn:
+        txn.state['attempts'] = 3
+        txn.save()
+    assert store.get('old') == {'attempts': 3}
+
+
+def test_sqlite_store_survives_reopen(tmp_path):
+    path = str(tmp_path / 'games.db')
+    game_id = SQLiteGameStore(path).create({'attempts': 3})
+    assert SQLiteGameStore(path).get(game_id) == {'attempts': 3}
+
+
+def test_memory_store_expires_games():
+    store = MemoryGameStore(ttl=-1)
+    game_id = store.create({'attempts': 0})
+    assert store.get(game_id) is None
+    assert store.evictions['expired'] == 1
+
+
+def test_memory_store_evicts_least_recently_saved():
+    store = MemoryGameStore(ttl=60, max_games=2)
+    first = store.create({'n': 1})
+    second = store.create({'n': 2})
+    store.save(first, {'n': 1})
+    third = store.create({'n': 3})
+    assert store.get(second) is None
+    assert store.get(first) == {'n': 1}
+    assert store.get(third) == {'n': 3}
+    assert len(store) == 2
+    assert store.evictions['capacity'] == 1
+
+
+def test_sqlite_store_sweeps_expired_and_excess(tmp_path):
+    store = SQLiteGameStore(str(tmp_path / 'games.db'), ttl=60, sweep_interval=0, max_games=2)
+    games = [store.create({'n': n}) for n in range(4)]
+    assert [store.get(game_id) for game_id in games[:2]] == [None, None]
+    assert store.get(games[3]) == {'n': 3}
+    assert store.evictions['capacity'] == 2
+
+    expiring = SQLiteGameStore(str(tmp_path / 'expiring.db'), ttl=-1, sweep_interval=0)
+    game_id = expiring.create({'n': 0})
+    assert expiring.get(game_id) is None
+    expiring.create({'n': 1})
+    assert expiring.evictions['expired'] >= 1
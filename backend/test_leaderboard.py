@@ -0,0 +1,43 @@
+import pytest
+
+from leaderboard import Leaderboard
+
+
+@pytest.fixture
+def board(tmp_path):
+    return Leaderboard(str(tmp_path / 'leaderboard.db'))
+
+
+def test_ranks_by_attempts_then_whole_seconds(board):
+    assert board.record(1, 'a', 1, 100, 6, 12.0, 0) == 1
+    assert board.record(2, 'b', 1, 100, 5, 30.0, 0) == 1
+    assert board.record(3, 'c', 1, 100, 6, 12.9, 1) == 2     # tied with a on (6, 12s)
+    assert board.record(4, 'd', 1, 100, 6, 11.0, 0) == 2
+    assert board.record(5, 'e', 1, 100, 9, 1.0, 0) == 5
+    assert board.rank(1, 100, 6, 12.5) == 3
+    assert board.rank(1, 100, 4, 99.0) == 1
+    assert board.total(1, 100) == 5
+
+
+def test_top_shares_ranks_between_ties(board):
+    for player_id, (attempts, duration) in enumerate([(6, 12.0), (5, 30.0), (6, 12.9), (6, 11.0)]):
+        board.record(player_id, f'p{player_id}', 1, 100, attempts, duration, 0)
+    top = board.top(1, 100)
+    assert [(entry['name'], entry['rank']) for entry in top] == [('p1', 1), ('p3', 2), ('p0', 3), ('p2', 3)]
+    assert len(board.top(1, 100, limit=2)) == 2
+
+
+def test_ranges_are_ranked_separately(board):
+    board.record(1, 'a', 1, 100, 3, 5.0, 0)
+    assert board.record(2, 'b', 1, 1000, 9, 5.0, 0) == 1
+    assert board.total(1, 1000) == 1
+    assert board.top(1, 50) == []
+
+
+def test_player_best(board):
+    board.record(7, 'me', 1, 100, 8, 20.0, 2)
+    board.record(7, 'me', 1, 100, 6, 40.0, 1)
+    board.record(8, 'other', 1, 100, 5, 10.0, 0)
+    best = board.player_best(7, 1, 100)
+    assert best == {'rank': 2, 'total': 3, 'attempts': 6, 'duration': 40.0, 'hints_used': 1}
+    assert board.player_best(7, 1, 1000) is None
@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from profiling import TRUNCATED, FoldedStacks, Profiler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _app(environ, start_response):
+    _busy(0.002)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+def _call(profiler, path='/guess', **environ):
+    environ = dict({'REQUEST_METHOD': 'POST', 'PATH_INFO': path, 'REMOTE_ADDR': '127.0.0.1'}, **environ)
+    return b''.join(profiler(environ, lambda status, headers: None))
+
+
+def test_folded_stacks_render_and_truncate():
+    stacks = FoldedStacks(max_stacks=2)
+    stacks.add(('GET /a', 'app:a'))
+    stacks.add(('GET /a', 'app:a'), 2)
+    stacks.merge({('GET /b', 'app:b'): 1, ('GET /c', 'app:c'): 4})
+    assert stacks.render() == f'{TRUNCATED[0]} 4\nGET /a;app:a 3\nGET /b;app:b 1\n'
+    stacks.clear()
+    assert len(stacks) == 0
+
+
+def test_requests_shorter_than_the_interval_are_sampled():
+    profiler = Profiler(_app, mode='sample', rate=1.0, interval=0.005, switch_interval=0.0001)
+    switch_interval = sys.getswitchinterval()
+    for _ in range(20):
+        assert _call(profiler) == b'ok'
+    assert profiler.stats['profiled'] == 20
+    # Nearly every 2 ms request gets its arrival sample; allow for a loaded machine
+    assert profiler.stats['samples'] >= 10
+    assert 'POST /guess;test_profiling:_app;test_profiling:_busy' in profiler.stacks.render()
+    assert sys.getswitchinterval() == switch_interval
+
+
+def test_switch_interval_is_left_alone_unless_asked():
+    seen = []
+
+    def app(environ, start_response):
+        seen.append(sys.getswitchinterval())
+        return _app(environ, start_response)
+
+    switch_interval = sys.getswitchinterval()
+    _call(Profiler(app, mode='sample', rate=1.0))
+    _call(Profiler(app, mode='sample', rate=1.0, switch_interval=0.0001))
+    assert seen == [switch_interval, pytest.approx(0.0001)]
+    assert sys.getswitchinterval() == switch_interval
+
+
+def test_stats_count_concurrent_requests():
+    profiler = Profiler(lambda environ, start_response: [b'ok'], mode='trace', rate=1.0)
+    threads = [threading.Thread(target=lambda: [_call(profiler) for _ in range(200)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert profiler.stats['profiled'] == 800
+
+
+def test_trace_mode_records_every_call():
+    profiler = Profiler(_app, mode='trace', rate=1.0)
+    _call(profiler, '/status')
+    folded = profiler.stacks.render()
+    assert 'POST /status;test_profiling:_app;test_profiling:_busy' in folded
+
+
+def test_requests_are_chosen_by_rate_or_header():
+    profiler = Profiler(_app, mode='trace', rate=0.0, token='secret')
+    _call(profiler)
+    _call(profiler, HTTP_X_PROFILE='wrong')
+    assert profiler.stats['profiled'] == 0
+    _call(profiler, HTTP_X_PROFILE='secret')
+    assert profiler.stats['profiled'] == 1
+
+    # Without a token only loopback clients may ask
+    open_profiler = Profiler(_app, mode='trace', rate=0.0)
+    _call(open_profiler, HTTP_X_PROFILE='1', REMOTE_ADDR='203.0.113.9')
+    _call(open_profiler, HTTP_X_PROFILE='1')
+    assert open_profiler.stats['profiled'] == 1
+
+    with pytest.raises(ValueError):
+        Profiler(_app, mode='cprofile')
+
+
+def test_admin_endpoint_serves_profiled_guesses(backend, client):
+    backend.profiler.stacks.clear()
+    client.post('/start', json={'min_number': 1, 'max_number': 100})
+    client.post('/guess', json={'guess': 50}, headers={'X-Profile': '1'})
+    response = client.get('/admin/profile?reset=1')
+    assert response.status_code == 200
+    assert response.headers['X-Profile-Mode'] == 'trace'
+    folded = response.get_data(as_text=True)
+    assert folded.startswith('POST /guess;')
+    assert ';app:make_guess;' in folded
+    assert client.get('/admin/profile').get_data(as_text=True) == ''
+    assert client.get('/admin/profile', environ_base={'REMOTE_ADDR': '203.0.113.9'}).status_code == 403
@@ -0,0 +1,132 @@
+import pytest
+from flask import Flask, jsonify, session
+
+from ratelimit import ClientGames, MemoryBuckets, SQLiteBuckets, install_proxy_fix, install_rate_limiter
+
+
+def _limited_app(monkeypatch, proxy_hops=0, client_limit='1000/1'):
+    """A two-route app behind the limiter: 2 guesses per session (or client) per minute"""
+    monkeypatch.setenv('RATE_LIMIT', '1')
+    monkeypatch.setenv('RATE_LIMIT_START', '100/1')
+    monkeypatch.setenv('RATE_LIMIT_GUESS', '2/60')
+    monkeypatch.setenv('RATE_LIMIT_CLIENT', client_limit)
+    app = Flask(__name__)
+    app.secret_key = 'test'
+
+    @app.route('/start', methods=['POST'])
+    def start():
+        session['game_id'] = f'g{len(app.games)}'
+        app.games.append(session['game_id'])
+        return jsonify({'game_id': session['game_id']})
+
+    @app.route('/guess', methods=['POST'])
+    def guess():
+        return jsonify({'ok': True})
+
+    app.games = []
+    install_rate_limiter(app)
+    install_proxy_fix(app, hops=proxy_hops)
+    return app
+
+
+def _guesses(client, times, **kwargs):
+    return [client.post('/guess', **kwargs).status_code for _ in range(times)]
+
+
+def test_guess_rule_is_keyed_on_the_session(monkeypatch):
+    app = _limited_app(monkeypatch)
+    first, second = app.test_client(), app.test_client()
+    first.post('/start')
+    second.post('/start')
+    assert _guesses(first, 3) == [200, 200, 429]
+    assert _guesses(second, 2) == [200, 200]
+    # A new game gets a new bucket
+    first.post('/start')
+    assert _guesses(first, 1) == [200]
+
+
+def test_rejection_carries_retry_after(monkeypatch):
+    app = _limited_app(monkeypatch)
+    client = app.test_client()
+    _guesses(client, 2)
+    response = client.post('/guess')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['retry_after'] >= 1
+
+
+def test_guess_rule_keys_on_the_cookie_payload(monkeypatch):
+    app = _limited_app(monkeypatch)
+    client = app.test_client()
+    client.post('/start')
+    cookie = client.get_cookie('session').value
+    assert _guesses(client, 2) == [200, 200]
+    # The same session re-signed (new timestamp and signature) is the same bucket
+    resigned = app.test_client()
+    resigned.set_cookie('session', cookie.rsplit('.', 2)[0] + '.AAAAAA.resigned')
+    assert _guesses(resigned, 1) == [429]
+
+
+def test_forged_cookies_still_share_the_client_bucket(monkeypatch):
+    app = _limited_app(monkeypatch, client_limit='3/60')
+    statuses = []
+    for n in range(4):
+        client = app.test_client()
+        client.set_cookie('session', f'forged{n}')
+        statuses += _guesses(client, 1)
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(monkeypatch):
+    app = _limited_app(monkeypatch)
+    client = app.test_client()
+    assert _guesses(client, 2, headers={'X-Forwarded-For': '198.51.100.1'}) == [200, 200]
+    assert _guesses(client, 1, headers={'X-Forwarded-For': '198.51.100.2'}) == [429]
+
+
+def test_trusted_proxy_separates_clients(monkeypatch):
+    app = _limited_app(monkeypatch, proxy_hops=1)
+    client = app.test_client()
+    assert _guesses(client, 3, headers={'X-Forwarded-For': '198.51.100.1'}) == [200, 200, 429]
+    assert _guesses(client, 2, headers={'X-Forwarded-For': '198.51.100.2'}) == [200, 200]
+    # Only the hop the proxy appended is trusted, not what the client put before it
+    spoofed = {'X-Forwarded-For': '203.0.113.9, 198.51.100.1'}
+    assert _guesses(client, 1, headers=spoofed) == [429]
+
+
+def test_rate_limit_can_be_turned_off(monkeypatch):
+    monkeypatch.setenv('RATE_LIMIT', '0')
+    app = Flask(__name__)
+    assert install_rate_limiter(app) is None
+    assert install_proxy_fix(app, hops=0) is None
+
+
+@pytest.mark.parametrize('kind', ['memory', 'sqlite'])
+def test_buckets_refill_at_rate(kind, tmp_path):
+    buckets = MemoryBuckets() if kind == 'memory' else SQLiteBuckets(str(tmp_path / 'ratelimit.db'))
+    assert [buckets.take('k', 1.0, 2) for _ in range(2)] == [0.0, 0.0]
+    wait = buckets.take('k', 1.0, 2)
+    assert 0 < wait <= 1.0
+    assert buckets.take('other', 1.0, 2) == 0.0
+
+
+def test_client_games_caps_each_player():
+    games = ClientGames(max_games=2)
+    assert games.add(1, 'a') == []
+    assert games.add(1, 'b') == []
+    assert games.add(2, 'x') == []
+    assert games.add(1, 'c') == ['a']
+    games.discard(1, 'b')
+    assert games.add(1, 'd') == []
+    assert games.add(1, 'e') == ['c']
+    assert games.add(2, 'y') == []
+
+
+def test_client_games_forgets_least_recent_players():
+    games = ClientGames(max_games=1, max_clients=2)
+    games.add(1, 'a')
+    games.add(2, 'b')
+    games.add(3, 'c')
+    # Player 1 was dropped, so its old game is no longer tracked or evicted
+    assert games.add(1, 'd') == []
+    assert ClientGames(max_games=0).add(1, 'a') == []
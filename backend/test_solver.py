@@ -0,0 +1,57 @@
+from functools import lru_cache
+
+import pytest
+
+from solver import GuessSolver, get_solver
+
+
+def _optimal_expected(size):
+    """Brute-force expected attempts of the best search tree over size numbers"""
+    @lru_cache(maxsize=None)
+    def cost(i, j):
+        if i > j:
+            return 0
+        return j - i + 1 + min(cost(i, r - 1) + cost(r + 1, j) for r in range(i, j + 1))
+    return cost(0, size - 1) / size
+
+
+def _play(solver, secret, lower, upper):
+    attempts = 0
+    while True:
+        guess = solver.next_guess(lower, upper)
+        attempts += 1
+        if guess == secret:
+            return attempts
+        if guess < secret:
+            lower = guess + 1
+        else:
+            upper = guess - 1
+
+
+def test_uniform_solver_wins_within_worst_case():
+    solver = get_solver(1, 100)
+    worst = solver.worst_case_attempts(1, 100)
+    assert worst == 7
+    attempts = [_play(solver, secret, 1, 100) for secret in range(1, 101)]
+    assert max(attempts) == worst
+    assert sum(attempts) / 100 == pytest.approx(solver.expected_attempts(1, 100))
+
+
+def test_uniform_expected_attempts_is_optimal():
+    for size in (1, 2, 3, 7, 10, 31):
+        solver = GuessSolver(1, size)
+        assert solver.expected_attempts(1, size) == pytest.approx(_optimal_expected(size))
+
+
+def test_win_probability():
+    solver = GuessSolver(1, 100)
+    assert solver.win_probability(1, 100, 0) == 0.0
+    assert solver.win_probability(1, 100, 7) == 1.0
+    assert solver.win_probability(1, 100, 3) == pytest.approx(7 / 100)
+
+
+def test_solver_rejects_bad_input():
+    with pytest.raises(ValueError):
+        GuessSolver(1, 100).next_guess(0, 50)
+    with pytest.raises(ValueError):
+        GuessSolver(1, 100).next_guess(60, 50)
@@ -0,0 +1,87 @@
+from validation import (BAD_RANGE, EMPTY, MAX_SAFE_INTEGER, MISSING, NOT_BOOLEAN, NOT_INTEGER, NOT_LIST,
+                        NOT_OBJECT, OUT_OF_RANGE, TOO_LONG, Field, Schema, check_bounds, check_integer,
+                        check_range, flag, integer, integer_list, text)
+
+
+def test_check_integer_accepts_ints_integral_floats_and_digit_strings():
+    assert check_integer(42, 'guess') == (42, None)
+    assert check_integer(50.0, 'guess') == (50, None)
+    assert check_integer(' -7 ', 'guess') == (-7, None)
+    assert check_integer('+12', 'guess') == (12, None)
+
+
+def test_check_integer_rejects_other_values():
+    for value in (True, False, 12.5, float('nan'), float('inf'), '12a', '', [1], {'n': 1}, '1' * 25):
+        number, error = check_integer(value, 'guess', 'Guess')
+        assert number is None
+        assert error.code == NOT_INTEGER
+        assert error.message == 'Guess must be a whole number'
+
+
+def test_check_integer_bounds_magnitude():
+    assert check_integer(MAX_SAFE_INTEGER, 'guess') == (MAX_SAFE_INTEGER, None)
+    assert check_integer(-MAX_SAFE_INTEGER, 'guess') == (-MAX_SAFE_INTEGER, None)
+    for value in (2 ** 53, -2 ** 53, 10 ** 30, float(2 ** 60), str(2 ** 53)):
+        number, error = check_integer(value, 'guess')
+        assert number is None
+        assert error.code == OUT_OF_RANGE
+
+
+def test_integer_fast_path_still_bounds_magnitude():
+    check = integer('Guess')
+    assert check(5, 'guess') == (5, None)
+    assert check(10 ** 30, 'guess')[1].code == OUT_OF_RANGE
+
+
+def test_check_bounds():
+    assert check_bounds(1, 1, 100, 'guess') is None
+    assert check_bounds(100, 1, 100, 'guess') is None
+    assert check_bounds(101, 1, 100, 'guess').code == OUT_OF_RANGE
+    assert check_bounds(0, 1, 100, 'guess').code == OUT_OF_RANGE
+
+
+def test_check_range():
+    assert check_range(1, 100, 1000) is None
+    assert check_range(5, 5, 1000).code == BAD_RANGE
+    assert check_range(10, 1, 1000).code == BAD_RANGE
+    assert check_range(1, 2000, 1000).field == 'max_number'
+
+
+def test_check_range_rejects_unsafe_bounds():
+    span = 10 ** 30
+    error = check_range(-2 ** 53, 0, span)
+    assert (error.code, error.field) == (BAD_RANGE, 'min_number')
+    error = check_range(0, 2 ** 53, span)
+    assert (error.code, error.field) == (BAD_RANGE, 'max_number')
+    assert check_range(-MAX_SAFE_INTEGER, MAX_SAFE_INTEGER, span) is None
+
+
+def test_flag_and_text():
+    assert flag(True, 'get_hint') == (True, None)
+    assert flag(1, 'get_hint')[1].code == NOT_BOOLEAN
+    assert text(5)('  Alice Liddell ', 'name') == ('Alice', None)
+    assert text(5)('x' * 300, 'name')[1].code == TOO_LONG
+
+
+def test_integer_list():
+    check = integer_list(3)
+    assert check([1, '2', 3.0], 'guesses') == ([1, 2, 3], None)
+    assert check([], 'guesses')[1].code == EMPTY
+    assert check('1,2', 'guesses')[1].code == NOT_LIST
+    assert check([1, 2, 3, 4], 'guesses')[1].code == TOO_LONG
+    assert check([1, 2 ** 60], 'guesses')[1].code == OUT_OF_RANGE
+
+
+def test_schema_defaults_required_fields_and_body_check():
+    schema = Schema(
+        Field('guess', integer('Guess'), required='Guess is required'),
+        Field('get_hint', flag, False),
+        check=lambda values: None if values['guess'] != 13 else check_bounds(13, 1, 12, 'guess'),
+    )
+    assert schema.validate({'guess': 5}) == ({'guess': 5, 'get_hint': False}, None)
+    assert schema.validate({'guess': None})[1].code == MISSING
+    assert schema.validate([5])[1].code == NOT_OBJECT
+    assert schema.validate({'guess': 13})[1].code == OUT_OF_RANGE
+    assert schema.validate({'guess': 5, 'get_hint': 'yes'})[1].to_dict() == {
+        'error': 'get_hint must be true or false', 'code': NOT_BOOLEAN, 'field': 'get_hint',
+    }
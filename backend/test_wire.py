@@ -0,0 +1,75 @@
+import struct
+
+from werkzeug.datastructures import MIMEAccept
+
+from wire import (ACTIVE_FLAG, ATTEMPTS_LEFT_FLAG, BINARY_MIMETYPE, CORRECT_FLAG, HINT_FLAG, MAX_HINT_BYTES,
+                  OUT_OF_ATTEMPTS_FLAG, RANK_FLAG, REVEAL_FLAG, TIME_LEFT_FLAG, VERSION, encode_guess,
+                  encode_status, wants_binary)
+
+
+def test_wants_binary():
+    assert wants_binary(MIMEAccept([(BINARY_MIMETYPE, 1)]))
+    assert not wants_binary(MIMEAccept([('application/json', 1)]))
+    assert not wants_binary(MIMEAccept([('*/*', 1)]))
+    assert not wants_binary(MIMEAccept([(BINARY_MIMETYPE, 0.5), ('application/json', 1)]))
+
+
+def test_encode_guess_plain():
+    body = encode_guess(-1, 3, 42)
+    assert body == struct.pack('>BBbIq', VERSION, 0, -1, 3, 42)
+
+
+def test_encode_guess_with_everything():
+    reveal = {'secret_number': 42, 'salt': '00' * 15 + 'ff'}
+    body = encode_guess(0, 7, 42, hint='Ça y est', rank=3, reveal=reveal)
+    version, flags, code, attempts, guess = struct.unpack_from('>BBbIq', body)
+    assert (version, code, attempts, guess) == (VERSION, 0, 7, 42)
+    assert flags == CORRECT_FLAG | RANK_FLAG | REVEAL_FLAG | HINT_FLAG
+    offset = struct.calcsize('>BBbIq')
+    assert struct.unpack_from('>I', body, offset) == (3,)
+    offset += 4
+    assert struct.unpack_from('>q16s', body, offset) == (42, b'\x00' * 15 + b'\xff')
+    offset += 24
+    (length,) = struct.unpack_from('>H', body, offset)
+    assert body[offset + 2:].decode('utf-8') == 'Ça y est'
+    assert length == len('Ça y est'.encode('utf-8'))
+
+
+def test_encode_guess_with_limits_after_the_hint():
+    body = encode_guess(1, 2, 50, hint='Lower', attempts_left=3, seconds_left=12.5)
+    _, flags, _, _, _ = struct.unpack_from('>BBbIq', body)
+    assert flags == HINT_FLAG | ATTEMPTS_LEFT_FLAG | TIME_LEFT_FLAG
+    offset = struct.calcsize('>BBbIq')
+    assert body[offset:offset + 7] == b'\x00\x05Lower'
+    assert struct.unpack_from('>II', body, offset + 7) == (3, 12500)
+
+
+def test_long_hints_are_cut_on_a_character_boundary():
+    hint = 'é' * MAX_HINT_BYTES     # two bytes each, so the limit falls inside one
+    body = encode_guess(1, 1, 5, hint=hint)
+    offset = struct.calcsize('>BBbIq')
+    (length,) = struct.unpack_from('>H', body, offset)
+    assert length == MAX_HINT_BYTES - 1
+    assert body[offset + 2:].decode('utf-8') == 'é' * (length // 2)
+
+
+def test_encode_guess_out_of_attempts():
+    body = encode_guess(1, 10, -5, lost_secret=-9)
+    _, flags, code, _, guess = struct.unpack_from('>BBbIq', body)
+    assert (flags, code, guess) == (OUT_OF_ATTEMPTS_FLAG, 1, -5)
+    assert struct.unpack_from('>q', body, struct.calcsize('>BBbIq')) == (-9,)
+
+
+def test_encode_status_sends_guesses_after_since():
+    state = {'game_active': True, 'min_number': 1, 'max_number': 2 ** 40, 'attempts': 3, 'guesses': [5, 9, 7]}
+    header = struct.calcsize('>BBqqII')
+    body = encode_status(state, since=1)
+    assert struct.unpack_from('>BBqqII', body) == (VERSION, ACTIVE_FLAG, 1, 2 ** 40, 3, 1)
+    assert struct.unpack('>2q', body[header:]) == (9, 7)
+    assert len(encode_status(state, since=99)) == header
+    assert encode_status(state, since=-4)[header:] == struct.pack('>3q', 5, 9, 7)
+
+
+def test_encode_status_inactive():
+    assert encode_status(None) == struct.pack('>BB', VERSION, 0)
+    assert encode_status({'game_active': False}) == struct.pack('>BB', VERSION, 0)
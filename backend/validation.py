@@ -0,0 +1,256 @@
+"""Request validation that never raises
+
+Every endpoint checks its JSON body against a Schema declared once at
+import time. A check is a plain function returning (value, None) or
+(None, Invalid); nothing is converted with int() on unchecked input, so a
+malformed payload costs a few type tests and is rejected with a stable
+error code instead of an exception being raised and caught.
+
+    GUESS = Schema(Field('guess', integer('Guess'), required='Guess is required'),
+                   Field('get_hint', flag, default=False))
+    values, error = GUESS.validate(request.get_json(silent=True))
+
+Error codes, sent to clients as "code" next to the human-readable "error":
+
+    not_object    the body (or a batch entry) is not a JSON object
+    missing       a required field is absent or null
+    not_integer   not a whole number (booleans and 12.5 included)
+    not_boolean   a flag that is not true or false
+    not_string    a text field that is not a string
+    not_list      a list field that is not a list
+    empty         an empty list where at least one item is needed
+    too_long      a string or list over its length limit
+    out_of_range  a number outside the game's range, or beyond MAX_SAFE_INTEGER
+    bad_range     min_number/max_number that do not form a playable range
+"""
+import math
+import re
+
+NOT_OBJECT = 'not_object'
+MISSING = 'missing'
+NOT_INTEGER = 'not_integer'
+NOT_BOOLEAN = 'not_boolean'
+NOT_STRING = 'not_string'
+NOT_LIST = 'not_list'
+EMPTY = 'empty'
+TOO_LONG = 'too_long'
+OUT_OF_RANGE = 'out_of_range'
+BAD_RANGE = 'bad_range'
+
+# Numbers sent as strings ("42") are still accepted. The length is checked
+# before the pattern, so a 5000-digit string is turned away without being
+# scanned, and int() only ever sees ASCII digits it cannot fail on.
+MAX_INTEGER_STRING = 24
+_INTEGER_STRING = re.compile(r'\s*[+-]?[0-9]{1,19}\s*')
+
+# Largest magnitude of any accepted number. Beyond it numbers overflow
+# SQLite INTEGER and the wire format's i64 fields once a range is offset,
+# and JavaScript clients cannot represent them exactly (Number.MAX_SAFE_INTEGER).
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+# Longest string accepted by a text field before trimming
+MAX_STRING = 256
+
+
+class Invalid:
+    """Why a value was rejected: a stable code, the field and a message"""
+
+    __slots__ = ('code', 'field', 'message')
+
+    def __init__(self, code, field, message):
+        self.code = code
+        self.field = field
+        self.message = message
+
+    def to_dict(self):
+        """Body for a 400 response"""
+        error = {'error': self.message, 'code': self.code}
+        if self.field is not None:
+            error['field'] = self.field
+        return error
+
+    def __repr__(self):
+        return f'Invalid({self.code!r}, {self.field!r}, {self.message!r})'
+
+
+# --- Checks -------------------------------------------------------------
+
+def check_integer(value, field, label=None):
+    """
+    Accept an int, an integral float (50.0) or a short string of digits,
+    no larger in magnitude than MAX_SAFE_INTEGER
+
+    Args:
+        value: The submitted value
+        field (str): Field name reported with an error
+        label (str): Name used in the error message (defaults to field)
+
+    Returns:
+        tuple: (int, None) or (None, Invalid)
+    """
+    kind = type(value)
+    if kind is int:             # bool is a subclass of int, but not this type
+        number = value
+    elif kind is float and math.isfinite(value) and value.is_integer():
+        number = int(value)
+    elif kind is str and len(value) <= MAX_INTEGER_STRING and _INTEGER_STRING.fullmatch(value):
+        number = int(value)
+    else:
+        return None, Invalid(NOT_INTEGER, field, f'{label or field} must be a whole number')
+    if -MAX_SAFE_INTEGER <= number <= MAX_SAFE_INTEGER:
+        return number, None
+    return None, Invalid(OUT_OF_RANGE, field,
+                         f'{label or field} must be between {-MAX_SAFE_INTEGER} and {MAX_SAFE_INTEGER}')
+
+
+def check_bounds(value, min_number, max_number, field, label=None):
+    """
+    Check an int lies within [min_number, max_number]
+
+    Returns:
+        Invalid or None
+    """
+    if value < min_number or value > max_number:
+        return Invalid(OUT_OF_RANGE, field, f'{label or field} must be between {min_number} and {max_number}')
+    return None
+
+
+def check_range(min_number, max_number, max_span):
+    """
+    Check two ints form a playable range no wider than max_span, within
+    MAX_SAFE_INTEGER of zero
+
+    Returns:
+        Invalid or None
+    """
+    if min_number < -MAX_SAFE_INTEGER:
+        return Invalid(BAD_RANGE, 'min_number', f'min_number must be at least {-MAX_SAFE_INTEGER}')
+    if max_number > MAX_SAFE_INTEGER:
+        return Invalid(BAD_RANGE, 'max_number', f'max_number must be at most {MAX_SAFE_INTEGER}')
+    if min_number >= max_number:
+        return Invalid(BAD_RANGE, 'min_number', 'min_number must be lower than max_number')
+    if max_number - min_number > max_span:
+        return Invalid(BAD_RANGE, 'max_number', f'Range may span at most {max_span} numbers')
+    return None
+
+
+def integer(label=None):
+    """A field check for whole numbers; errors name the field, or label if given"""
+    def check(value, field):
+        if type(value) is int and -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER:
+            return value, None
+        return check_integer(value, field, label)
+    return check
+
+
+def flag(value, field):
+    """A field check for true/false"""
+    if value is True or value is False:
+        return value, None
+    return None, Invalid(NOT_BOOLEAN, field, f'{field} must be true or false')
+
+
+def text(max_length):
+    """A field check for a string, trimmed and cut to max_length characters"""
+    def check(value, field):
+        if type(value) is not str:
+            return None, Invalid(NOT_STRING, field, f'{field} must be a string')
+        if len(value) > MAX_STRING:
+            return None, Invalid(TOO_LONG, field, f'{field} may be at most {MAX_STRING} characters')
+        return value.strip()[:max_length], None
+    return check
+
+
+def integer_list(max_items, label='Guess'):
+    """A field check for a non-empty list of at most max_items whole numbers"""
+    def check(value, field):
+        if type(value) is not list:
+            return None, Invalid(NOT_LIST, field, f'{field} must be a non-empty list')
+        if not value:
+            return None, Invalid(EMPTY, field, f'{field} must be a non-empty list')
+        if len(value) > max_items:
+            return None, Invalid(TOO_LONG, field, f'At most {max_items} {field} per batch')
+        parsed = []
+        for item in value:
+            number, error = check_integer(item, field, label)
+            if error:
+                return None, error
+            parsed.append(number)
+        return parsed, None
+    return check
+
+
+def object_list(max_items):
+    """A field check for a non-empty list of at most max_items items, left unchecked"""
+    def check(value, field):
+        if type(value) is not list or not value:
+            return None, Invalid(EMPTY if value == [] else NOT_LIST, field, f'{field} must be a non-empty list')
+        if len(value) > max_items:
+            return None, Invalid(TOO_LONG, field, f'At most {max_items} {field} per batch')
+        return value, None
+    return check
+
+
+# --- Schemas ------------------------------------------------------------
+
+class Field:
+    """One key of a request body and the check applied to it"""
+
+    __slots__ = ('name', 'check', 'default', 'required')
+
+    def __init__(self, name, check, default=None, required=None):
+        """
+        Args:
+            name (str): Key in the JSON object
+            check: Callable (value, name) -> (value, Invalid or None)
+            default: Value used when the key is absent or null
+            required (str): Error message when absent; None makes it optional
+        """
+        self.name = name
+        self.check = check
+        self.default = default
+        self.required = required
+
+
+class Schema:
+    """A request body: its fields, checked in order, then an optional whole-body check"""
+
+    def __init__(self, *fields, check=None):
+        """
+        Args:
+            fields (Field): The keys read from the body; others are ignored
+            check: Optional callable (values dict) -> Invalid or None, run
+                once every field has passed
+        """
+        self.fields = fields
+        self.check = check
+        # Flattened once so validate() unpacks tuples instead of reading attributes
+        self._steps = tuple((field.name, field.check, field.default, field.required) for field in fields)
+
+    def validate(self, data):
+        """
+        Check a decoded JSON body (or any dict-like, such as request.args)
+
+        Returns:
+            tuple: (values, None) with a value or default for every field,
+                or (None, Invalid) for the first problem found
+        """
+        if not isinstance(data, dict):
+            return None, Invalid(NOT_OBJECT, None, 'Request body must be a JSON object')
+        values = {}
+        for name, check, default, required in self._steps:
+            value = data.get(name)
+            if value is None:
+                if required is not None:
+                    return None, Invalid(MISSING, name, required)
+                values[name] = default
+                continue
+            value, error = check(value, name)
+            if error is not None:
+                return None, error
+            values[name] = value
+        if self.check is not None:
+            error = self.check(values)
+            if error is not None:
+                return None, error
+        return values, None
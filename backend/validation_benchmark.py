@@ -0,0 +1,111 @@
+"""Measure what request validation costs per request
+
+    python backend/validation_benchmark.py
+    python backend/validation_benchmark.py --iterations 200000 --output validation.json
+
+Each payload is validated the way /guess does it, with GUESS_REQUEST and
+the game's range check, and again with the try/int() parsing the
+endpoints used before validation.py. The adversarial payloads are those
+benchmark.py's adversarial strategy sends.
+"""
+import argparse
+import json
+import os
+import platform
+import time
+
+os.environ.setdefault('RATE_LIMIT', '0')
+os.environ.setdefault('WARM_UP', '0')
+
+from benchmark import git_revision
+from app import GUESS_REQUEST, _check_guess
+
+MIN_NUMBER = 1
+MAX_NUMBER = 100
+
+PAYLOADS = {
+    'valid': {'guess': 50, 'get_hint': True},
+    'valid_string': {'guess': '50'},
+    'missing': {},
+    'not_object': [50],
+    'word': {'guess': 'fifty'},
+    'null': {'guess': None},
+    'boolean': {'guess': True},
+    'fraction': {'guess': 12.5},
+    'list': {'guess': [1, 2]},
+    'out_of_range': {'guess': MAX_NUMBER + 1},
+    'huge_string': {'guess': '9' * 5000},
+}
+
+
+def validate(data):
+    """The /guess path: schema, then the game's range"""
+    values, error = GUESS_REQUEST.validate(data)
+    if error is None:
+        error = _check_guess(values['guess'], MIN_NUMBER, MAX_NUMBER)
+    return error
+
+
+def legacy_validate(data):
+    """What /guess did before: truthiness checks and int() in a try block"""
+    if not data or 'guess' not in data:
+        return 'Guess is required'
+    try:
+        guess = int(data['guess'])
+    except (ValueError, TypeError):
+        return 'Guess must be a valid number'
+    if guess < MIN_NUMBER or guess > MAX_NUMBER:
+        return f'Guess must be between {MIN_NUMBER} and {MAX_NUMBER}'
+    bool(data.get('get_hint', False))
+    return None
+
+
+def time_per_call(function, payload, iterations):
+    """Best of three runs, in microseconds per call"""
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            function(payload)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / iterations * 1e6
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark request validation')
+    parser.add_argument('--iterations', type=int, default=100000, help='Validations per payload and run')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🧪 {len(PAYLOADS)} payloads x {args.iterations} validations, best of 3")
+    print(f"{'payload':<16}{'result':<14}{'schema':>10}{'try/int':>10}")
+
+    results = {}
+    for name, payload in PAYLOADS.items():
+        error = validate(payload)
+        row = results[name] = {
+            'code': error.code if error else None,
+            'schema_us': round(time_per_call(validate, payload, args.iterations), 3),
+            'legacy_us': round(time_per_call(legacy_validate, payload, args.iterations), 3),
+        }
+        print(f"{name:<16}{row['code'] or 'ok':<14}{row['schema_us']:>8.2f}µs{row['legacy_us']:>8.2f}µs")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'git_revision': git_revision(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'iterations': args.iterations,
+                'results': results,
+            }, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Compact binary encoding for /guess and /status responses
+
+Clients that send Accept: application/vnd.guessmaster+binary get a fixed
+big-endian layout instead of JSON. It carries the result code instead of
+English text and only the guesses the client does not have yet: /guess
+sends the one guess just made, and /status sends the guesses after the
+?since=N index. Error responses are always JSON.
+
+/guess:
+    u8  version
+    u8  flags       1 correct, 2 hint follows, 4 leaderboard rank follows,
+                    8 commit-reveal secret follows, 16 out of attempts
+                    (the game is over and its secret number follows),
+                    32 attempts left follow, 64 time left follows
+    i8  code        -1 too low, 0 correct, 1 too high
+    u32 attempts
+    i64 guess
+    [u32 leaderboard rank]
+    [i64 secret number, 16-byte salt]
+    [i64 secret number]
+    [u16 hint length, hint as UTF-8]
+    [u32 attempts left]
+    [u32 milliseconds left]
+
+The JSON status field is not sent: a 200 /guess is won with flag 1, out
+of attempts with flag 16 and active otherwise, since a game that ran out
+of time is answered with a JSON 409. Attempts and time left come after
+the hint, which is length-prefixed, so decoders that predate them still
+read everything before them.
+
+/status:
+    u8  version
+    u8  flags       1 game active; nothing else follows when clear
+    i64 min_number
+    i64 max_number
+    u32 attempts
+    u32 since       index of the first guess that follows
+    i64 guess * (attempts - since)
+"""
+import struct
+
+BINARY_MIMETYPE = 'application/vnd.guessmaster+binary'
+JSON_MIMETYPE = 'application/json'
+VERSION = 1
+
+CORRECT_FLAG = 1
+HINT_FLAG = 2
+RANK_FLAG = 4
+REVEAL_FLAG = 8
+OUT_OF_ATTEMPTS_FLAG = 16
+ATTEMPTS_LEFT_FLAG = 32
+TIME_LEFT_FLAG = 64
+ACTIVE_FLAG = 1
+
+# Longest hint in bytes that fits the u16 length prefix
+MAX_HINT_BYTES = 0xFFFF
+
+_GUESS = struct.Struct('>BBbIq')
+_RANK = struct.Struct('>I')
+_REVEAL = struct.Struct('>q16s')
+_SECRET = struct.Struct('>q')
+_HINT_LENGTH = struct.Struct('>H')
+_LEFT = struct.Struct('>I')
+_STATUS = struct.Struct('>BBqqII')
+_INACTIVE = struct.Struct('>BB')
+
+
+def wants_binary(accept_mimetypes):
+    """True if the request's Accept header prefers the binary format over JSON"""
+    return accept_mimetypes.best_match([JSON_MIMETYPE, BINARY_MIMETYPE]) == BINARY_MIMETYPE
+
+
+def encode_guess(code, attempts, guess, hint=None, rank=None, reveal=None, lost_secret=None,
+                 attempts_left=None, seconds_left=None):
+    """
+    Encode a /guess result
+
+    Args:
+        code (int): check_guess result code
+        attempts (int): Guesses made in the game, including this one
+        guess (int): The guess just made
+        hint (str): AI hint, if one was requested
+        rank (int): Leaderboard rank, if the guess won the game
+        reveal (dict): secret_number and hex salt ending a commit-reveal game
+        lost_secret (int): The secret number, if this guess used up the last attempt
+        attempts_left (int): Attempts left, if the game has a limit
+        seconds_left (float): Seconds left, if the game has a time limit
+
+    Returns:
+        bytes: Response body
+    """
+    flags = CORRECT_FLAG if code == 0 else 0
+    parts = []
+    if rank is not None:
+        flags |= RANK_FLAG
+        parts.append(_RANK.pack(rank))
+    if reveal is not None:
+        flags |= REVEAL_FLAG
+        parts.append(_REVEAL.pack(reveal['secret_number'], bytes.fromhex(reveal['salt'])))
+    if lost_secret is not None:
+        flags |= OUT_OF_ATTEMPTS_FLAG
+        parts.append(_SECRET.pack(lost_secret))
+    if hint:
+        flags |= HINT_FLAG
+        encoded = hint.encode('utf-8')
+        if len(encoded) > MAX_HINT_BYTES:
+            # Cut on a character boundary: drop the bytes of a split character
+            encoded = encoded[:MAX_HINT_BYTES].decode('utf-8', 'ignore').encode('utf-8')
+        parts.append(_HINT_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    if attempts_left is not None:
+        flags |= ATTEMPTS_LEFT_FLAG
+        parts.append(_LEFT.pack(attempts_left))
+    if seconds_left is not None:
+        flags |= TIME_LEFT_FLAG
+        parts.append(_LEFT.pack(round(seconds_left * 1000)))
+    return _GUESS.pack(VERSION, flags, code, attempts, guess) + b''.join(parts)
+
+
+def encode_status(state, since=0):
+    """
+    Encode a /status result
+
+    Args:
+        state (dict): Game state, or None when there is no active game
+        since (int): Number of guesses the client already has
+
+    Returns:
+        bytes: Response body
+    """
+    if state is None or not state['game_active']:
+        return _INACTIVE.pack(VERSION, 0)
+    guesses = state['guesses']
+    since = max(0, min(since, len(guesses)))
+    delta = guesses[since:]
+    return (_STATUS.pack(VERSION, ACTIVE_FLAG, state['min_number'], state['max_number'],
+                         state['attempts'], since)
+            + struct.pack(f'>{len(delta)}q', *delta))
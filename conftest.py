@@ -0,0 +1,2 @@
+# A script that checks a live server on :5000 with requests; run it with python
+collect_ignore = ['test_connection.py']
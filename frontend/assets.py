@@ -0,0 +1,211 @@
+"""Build-once static asset pipeline for the frontend
+
+At startup every asset is read, fingerprinted with a content hash,
+compressed with gzip (and Brotli when the brotli package is installed) and
+kept in memory. Fingerprinted URLs never change content, so they are
+served as immutable for a year; index.html, whose references are
+rewritten to those URLs, is revalidated with its ETag on every load.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+INDEX_TEMPLATE = os.path.join('templates', 'index.html')
+
+# Cache-Control for content-addressed URLs and for everything else
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Below this size compression is not worth a header round of negotiation
+MIN_COMPRESS_BYTES = 256
+
+# Encoding tokens mapped to the suffix used in ETags and built file names
+ENCODINGS = (('br', 'br'), ('gzip', 'gz'))
+
+# References to local assets inside index.html, e.g. href="../style.css"
+ASSET_REFERENCE = re.compile(r'''(src|href)="(?:\.\./|/)?([\w.-]+\.(?:css|js))"''')
+
+
+class Asset:
+    """One servable file with its precompressed variants"""
+
+    __slots__ = ('path', 'content_type', 'digest', 'cache_control', 'variants')
+
+    def __init__(self, path, body, content_type, cache_control):
+        """
+        Args:
+            path (str): URL path without the leading slash
+            body (bytes): Uncompressed content
+            content_type (str): Content-Type header value
+            cache_control (str): Cache-Control header value
+        """
+        self.path = path
+        self.content_type = content_type
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.cache_control = cache_control
+        # encoding (None for identity) -> (body, strong ETag)
+        self.variants = {None: (body, f'"{self.digest}"')}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            for encoding, suffix in ENCODINGS:
+                compressed = _compress(body, encoding)
+                if compressed is not None and len(compressed) < len(body):
+                    self.variants[encoding] = (compressed, f'"{self.digest}-{suffix}"')
+
+    def negotiate(self, accept_encoding):
+        """
+        Pick the smallest variant the client accepts
+
+        Returns:
+            tuple: (encoding or None, body, etag)
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and encoding in accepted:
+                body, etag = self.variants[encoding]
+                return encoding, body, etag
+        body, etag = self.variants[None]
+        return None, body, etag
+
+
+def _compress(body, encoding):
+    if encoding == 'gzip':
+        # mtime=0 keeps the output, and so the ETag, identical between builds
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(body, quality=11)
+    return None
+
+
+def parse_accept_encoding(header):
+    """Set of encodings accepted with a non-zero q-value"""
+    accepted = set()
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name == '*':
+            accepted.update(encoding for encoding, _ in ENCODINGS)
+        elif name:
+            accepted.add(name)
+    return accepted
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header lists the ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def fingerprinted_name(name, digest):
+    """script.js -> script.<digest>.js"""
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{digest}{ext}'
+
+
+def _content_type(name):
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+class AssetPipeline:
+    """Fingerprinted, precompressed assets held in memory"""
+
+    def __init__(self, static_dir=STATIC_DIR):
+        """
+        Args:
+            static_dir (str): Directory holding the assets and templates/index.html
+        """
+        self.static_dir = static_dir
+        self.assets = {}      # URL path -> Asset
+        self.manifest = {}    # logical name -> fingerprinted name
+        self.build()
+
+    def build(self):
+        """Read, fingerprint and compress every asset, then render index.html"""
+        assets = {}
+        manifest = {}
+        for name in sorted(os.listdir(self.static_dir)):
+            path = os.path.join(self.static_dir, name)
+            if not os.path.isfile(path):
+                continue
+            with open(path, 'rb') as f:
+                body = f.read()
+            content_type = _content_type(name)
+            # The plain name stays available for old links, but must be revalidated
+            plain = Asset(name, body, content_type, REVALIDATE)
+            hashed_name = fingerprinted_name(name, plain.digest)
+            assets[name] = plain
+            assets[hashed_name] = Asset(hashed_name, body, content_type, IMMUTABLE)
+            manifest[name] = hashed_name
+
+        with open(os.path.join(self.static_dir, INDEX_TEMPLATE), encoding='utf-8') as f:
+            template = f.read()
+
+        def rewrite(match):
+            hashed_name = manifest.get(match.group(2))
+            if hashed_name is None:
+                return match.group(0)
+            return f'{match.group(1)}="/{hashed_name}"'
+
+        index = ASSET_REFERENCE.sub(rewrite, template).encode('utf-8')
+        assets[''] = assets['index.html'] = Asset('index.html', index, _content_type('index.html'), REVALIDATE)
+
+        self.assets = assets
+        self.manifest = manifest
+
+    def get(self, path):
+        """Asset for a URL path (without the leading slash), or None"""
+        return self.assets.get(path)
+
+    def write(self, out_dir):
+        """
+        Write the built site for a CDN or a static file server
+
+        Every variant is written next to its file (app.<hash>.js,
+        app.<hash>.js.gz, app.<hash>.js.br) so servers with precompressed
+        file support (nginx gzip_static/brotli_static) can use them as-is.
+        A manifest.json maps logical names to fingerprinted ones.
+
+        Returns:
+            int: Number of files written
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        written = 0
+        for path, asset in self.assets.items():
+            if not path or path in self.manifest:
+                continue  # '' aliases index.html; plain names are only for the live server
+            for encoding, (body, _) in asset.variants.items():
+                suffix = dict(ENCODINGS).get(encoding)
+                target = os.path.join(out_dir, f'{path}.{suffix}' if suffix else path)
+                with open(target, 'wb') as f:
+                    f.write(body)
+                written += 1
+        with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        return written + 1
@@ -1,19 +1,65 @@
-from flask import Flask, send_from_directory
+from flask import Flask, Response, request, send_from_directory
+import argparse
 import os
 
+from assets import AssetPipeline, etag_matches
+
 app = Flask(__name__)
 
+# Built once at startup by run_pipeline(); None in --dev mode
+pipeline = None
+
+def serve_asset(path):
+    """Serve a built asset from memory with ETag, 304 and encoding negotiation"""
+    asset = pipeline.get(path)
+    if asset is None:
+        return Response('Not Found', status=404, mimetype='text/plain')
+
+    encoding, body, etag = asset.negotiate(request.headers.get('Accept-Encoding'))
+    headers = {
+        'ETag': etag,
+        'Cache-Control': asset.cache_control,
+        'Vary': 'Accept-Encoding',
+    }
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers=headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, headers=headers, content_type=asset.content_type)
+
 # Serve static files
 @app.route('/')
 def index():
+    if pipeline is not None:
+        return serve_asset('')
     return send_from_directory('static/templates', 'index.html')
 
 @app.route('/<path:filename>')
 def static_files(filename):
+    if pipeline is not None:
+        return serve_asset(filename)
     return send_from_directory('static', filename)
 
 if __name__ == '__main__':
-    print("🎨 Frontend server starting...")
-    print("📱 Open your browser and go to: http://localhost:3000")
-    print("🔗 Make sure the backend is running on http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=3000) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Serve the AI Guess Master frontend')
+    parser.add_argument('--dev', action='store_true',
+                        help='Serve files straight from disk with the debugger on')
+    parser.add_argument('--build', metavar='DIR',
+                        help='Write fingerprinted, precompressed assets to DIR and exit')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('FRONTEND_PORT', 3000)))
+    args = parser.parse_args()
+
+    if args.build:
+        written = AssetPipeline().write(args.build)
+        print(f"📦 Wrote {written} files to {args.build}")
+    elif args.dev:
+        print("🎨 Frontend dev server starting...")
+        print(f"📱 Open your browser and go to: http://localhost:{args.port}")
+        print("🔗 Make sure the backend is running on http://localhost:5000")
+        app.run(debug=True, host='0.0.0.0', port=args.port)
+    else:
+        pipeline = AssetPipeline()
+        print(f"🎨 Frontend server starting with {len(pipeline.manifest)} fingerprinted assets...")
+        print(f"📱 Open your browser and go to: http://localhost:{args.port}")
+        print("🔗 Make sure the backend is running on http://localhost:5000")
+        app.run(host='0.0.0.0', port=args.port, threaded=True)
@@ -3,15 +3,30 @@ let gameState = {
     isActive: false,
     attempts: 0,
     guesses: [],
-    secretNumber: null
+    secretNumber: null,
+    minNumber: 1,
+    maxNumber: 100,
+    roomId: null,
+    roomEvents: null,
+    roomFeed: [],
+    commitment: null
 };
 
 // API configuration
 const API_BASE_URL = 'http://localhost:5000';
 
+// Compact response format for /guess and /status (layout in backend/wire.py)
+const BINARY_MIMETYPE = 'application/vnd.guessmaster+binary';
+const RESULT_MESSAGES = {
+    '-1': guess => `Too low! The number is higher than ${guess}.`,
+    '0': () => 'Correct! You found the number!',
+    '1': guess => `Too high! The number is lower than ${guess}.`
+};
+
 // DOM elements
 const elements = {
     startBtn: document.getElementById('startBtn'),
+    roomBtn: document.getElementById('roomBtn'),
     resetBtn: document.getElementById('resetBtn'),
     submitGuess: document.getElementById('submitGuess'),
     playAgainBtn: document.getElementById('playAgainBtn'),
@@ -38,12 +53,20 @@ const elements = {
 // Initialize the game
 document.addEventListener('DOMContentLoaded', () => {
     setupEventListeners();
-    checkGameStatus();
+    
+    // A shared room link looks like ?room=<id>
+    const roomId = new URLSearchParams(window.location.search).get('room');
+    if (roomId) {
+        joinRoom(roomId);
+    } else {
+        checkGameStatus();
+    }
 });
 
 // Setup event listeners
 function setupEventListeners() {
     elements.startBtn.addEventListener('click', startGame);
+    elements.roomBtn.addEventListener('click', createRoom);
     elements.resetBtn.addEventListener('click', resetGame);
     elements.submitGuess.addEventListener('click', submitGuess);
     elements.playAgainBtn.addEventListener('click', startGame);
@@ -60,7 +83,7 @@ function setupEventListeners() {
 // Input validation
 function validateInput() {
     const value = parseInt(elements.guessInput.value);
-    const isValid = value >= 1 && value <= 100;
+    const isValid = value >= gameState.minNumber && value <= gameState.maxNumber;
     
     elements.submitGuess.disabled = !isValid || !elements.guessInput.value;
     
@@ -103,18 +126,108 @@ function updateGameStatus(message, type = 'info') {
     }
 }
 
+// Read a response in whichever format the backend chose; errors are always JSON
+async function readResponse(response, decodeBinary) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (contentType.startsWith(BINARY_MIMETYPE)) {
+        return decodeBinary(new DataView(await response.arrayBuffer()));
+    }
+    return response.json();
+}
+
+// Decode a binary /guess result into the JSON response's shape
+function decodeGuessResponse(view) {
+    const flags = view.getUint8(1);
+    const code = view.getInt8(2);
+    const attempts = view.getUint32(3);
+    const guess = Number(view.getBigInt64(7));
+    let offset = 15;
+    const data = {
+        guess: guess,
+        result: RESULT_MESSAGES[code](guess),
+        correct: (flags & 1) !== 0,
+        attempts: attempts,
+        // Only the new guess is sent; the rest is already on the client
+        guesses: gameState.guesses.concat([guess])
+    };
+    if (flags & 4) {
+        data.leaderboard_rank = view.getUint32(offset);
+        offset += 4;
+    }
+    if (flags & 8) {
+        const salt = new Uint8Array(view.buffer, view.byteOffset + offset + 8, 16);
+        data.reveal = {
+            secret_number: Number(view.getBigInt64(offset)),
+            salt: Array.from(salt, byte => byte.toString(16).padStart(2, '0')).join('')
+        };
+        offset += 24;
+    }
+    if (flags & 16) {
+        data.status = 'out_of_attempts';
+        data.game_over = true;
+        data.final_message = `Out of attempts! The number was ${Number(view.getBigInt64(offset))}.`;
+        offset += 8;
+    }
+    if (flags & 2) {
+        const length = view.getUint16(offset);
+        data.ai_hint = new TextDecoder().decode(
+            new Uint8Array(view.buffer, view.byteOffset + offset + 2, length));
+        offset += 2 + length;
+    }
+    if (flags & 32) {
+        data.attempts_left = view.getUint32(offset);
+        offset += 4;
+    }
+    if (flags & 64) {
+        data.seconds_left = view.getUint32(offset) / 1000;
+        offset += 4;
+    }
+    if (data.correct) {
+        data.status = 'won';
+        data.game_over = true;
+        data.final_message = `Congratulations! You found the number in ${attempts} attempts!`;
+    } else if (!data.status) {
+        data.status = 'active';
+    }
+    return data;
+}
+
+// Decode a binary /status result, appending its guesses to the ones already known
+function decodeStatusResponse(view) {
+    if ((view.getUint8(1) & 1) === 0) {
+        return { game_active: false };
+    }
+    const attempts = view.getUint32(18);
+    const since = view.getUint32(22);
+    const guesses = gameState.guesses.slice(0, since);
+    for (let offset = 26; offset < view.byteLength; offset += 8) {
+        guesses.push(Number(view.getBigInt64(offset)));
+    }
+    return {
+        game_active: true,
+        min_number: Number(view.getBigInt64(2)),
+        max_number: Number(view.getBigInt64(10)),
+        attempts: attempts,
+        guesses: guesses
+    };
+}
+
 // Check current game status
 async function checkGameStatus() {
     try {
-        const response = await fetch(`${API_BASE_URL}/status`, {
+        const response = await fetch(`${API_BASE_URL}/status?since=${gameState.guesses.length}`, {
+            headers: {
+                'Accept': BINARY_MIMETYPE
+            },
             credentials: 'include'
         });
-        const data = await response.json();
+        const data = await readResponse(response, decodeStatusResponse);
         
         if (data.game_active) {
             gameState.isActive = true;
             gameState.attempts = data.attempts;
             gameState.guesses = data.guesses;
+            setGameRange(data.min_number, data.max_number);
             updateUIForActiveGame();
         } else {
             updateUIForInactiveGame();
@@ -125,8 +238,19 @@ async function checkGameStatus() {
     }
 }
 
+// Apply the number range reported by the backend
+function setGameRange(minNumber, maxNumber) {
+    gameState.minNumber = minNumber;
+    gameState.maxNumber = maxNumber;
+    elements.guessInput.min = minNumber;
+    elements.guessInput.max = maxNumber;
+    elements.guessInput.setAttribute('aria-label', `Enter your guess between ${minNumber} and ${maxNumber}`);
+    document.querySelector('label[for="guessInput"]').textContent = `Enter your guess (${minNumber}-${maxNumber}):`;
+}
+
 // Start a new game
 async function startGame() {
+    leaveRoom();
     showLoading();
     
     try {
@@ -148,9 +272,11 @@ async function startGame() {
             gameState.attempts = 0;
             gameState.guesses = [];
             gameState.secretNumber = data.secret_number; // For development only
+            gameState.commitment = data.commitment || null;
+            setGameRange(data.min_number, data.max_number);
             
             updateUIForActiveGame();
-            updateGameStatus('Game started! Guess a number between 1 and 100.');
+            updateGameStatus(data.message);
             
             // Focus on input
             setTimeout(() => {
@@ -167,23 +293,178 @@ async function startGame() {
     hideLoading();
 }
 
+// Create a multiplayer room and open its shareable link
+async function createRoom() {
+    showLoading();
+    
+    try {
+        const response = await fetch(`${API_BASE_URL}/rooms`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            credentials: 'include'
+        });
+        const data = await response.json();
+        
+        if (response.ok) {
+            window.location.search = `?room=${encodeURIComponent(data.room_id)}`;
+            return;
+        }
+        showError(data.error || 'Failed to create room');
+    } catch (error) {
+        console.error('Error creating room:', error);
+        showError('Failed to connect to server');
+    }
+    
+    hideLoading();
+}
+
+// Join a room: the server pushes every player's guesses over Server-Sent Events
+function joinRoom(roomId) {
+    gameState.roomId = roomId;
+    gameState.isActive = true;
+    gameState.attempts = 0;
+    gameState.guesses = [];
+    gameState.roomFeed = [];
+    
+    elements.resetBtn.style.display = 'none';
+    updateGameStatus('Connecting to room...');
+    
+    // EventSource reconnects by itself and resumes from the last event id
+    const events = new EventSource(`${API_BASE_URL}/rooms/${encodeURIComponent(roomId)}/events`);
+    gameState.roomEvents = events;
+    
+    events.addEventListener('snapshot', (event) => {
+        const room = JSON.parse(event.data);
+        setGameRange(room.min_number, room.max_number);
+        if (room.finished) {
+            finishRoom(room.winner, room.secret_number);
+            return;
+        }
+        updateUIForActiveGame();
+        elements.startBtn.style.display = 'none';
+        elements.roomBtn.style.display = 'none';
+        elements.resetBtn.style.display = 'none';
+        updateGameStatus(`Room ${room.room_id}: ${room.players} player(s). The number is between ${room.lower_bound} and ${room.upper_bound}.`);
+    });
+    
+    events.addEventListener('guess', (event) => {
+        const guess = JSON.parse(event.data);
+        const arrow = guess.code < 0 ? '⬆️' : '⬇️';
+        addToRoomFeed(`${guess.player}: ${guess.guess} ${arrow}`);
+        updateGameStatus(`The number is between ${guess.lower_bound} and ${guess.upper_bound}.`);
+    });
+    
+    events.addEventListener('win', (event) => {
+        const win = JSON.parse(event.data);
+        addToRoomFeed(`${win.player}: ${win.guess} 🎉`);
+        finishRoom(win.player, win.secret_number);
+    });
+    
+    events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+            showError('Room not found');
+        }
+    };
+}
+
+// Show the room's shared guess feed, newest first
+function addToRoomFeed(entry) {
+    gameState.roomFeed.unshift(entry);
+    gameState.roomFeed.length = Math.min(gameState.roomFeed.length, 50);
+    
+    elements.historyList.innerHTML = '';
+    gameState.roomFeed.forEach((text) => {
+        const historyItem = document.createElement('div');
+        historyItem.className = 'history-item';
+        historyItem.textContent = text;
+        elements.historyList.appendChild(historyItem);
+    });
+    elements.historySection.style.display = 'block';
+}
+
+// End of a room: stop listening and announce the winner
+function finishRoom(winner, secretNumber) {
+    gameState.isActive = false;
+    if (gameState.roomEvents) {
+        gameState.roomEvents.close();
+        gameState.roomEvents = null;
+    }
+    elements.guessSection.style.display = 'none';
+    updateGameStatus(`${winner} found the number ${secretNumber}!`);
+    showCelebration(`${winner} found the number ${secretNumber}!`);
+}
+
+// Go back to a solo game, dropping ?room= from the address bar
+function leaveRoom() {
+    if (!gameState.roomId) {
+        return;
+    }
+    if (gameState.roomEvents) {
+        gameState.roomEvents.close();
+        gameState.roomEvents = null;
+    }
+    gameState.roomId = null;
+    gameState.roomFeed = [];
+    window.history.replaceState(null, '', window.location.pathname);
+}
+
+// Submit a guess to the current room
+async function submitRoomGuess(guess) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/rooms/${encodeURIComponent(gameState.roomId)}/guess`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            credentials: 'include',
+            body: JSON.stringify({
+                guess: guess
+            })
+        });
+        const data = await response.json();
+        
+        if (response.ok) {
+            gameState.attempts = data.attempts;
+            elements.attemptsCount.textContent = data.attempts;
+            updateResultDisplay(data);
+            elements.guessInput.value = '';
+            elements.submitGuess.disabled = true;
+        } else {
+            showError(data.error || 'Failed to submit guess');
+        }
+    } catch (error) {
+        console.error('Error submitting room guess:', error);
+        showError('Failed to connect to server');
+    }
+    
+    hideLoading();
+}
+
 // Submit a guess
 async function submitGuess() {
     const guess = parseInt(elements.guessInput.value);
     
-    if (!guess || guess < 1 || guess > 100) {
-        showError('Please enter a valid number between 1 and 100');
+    if (Number.isNaN(guess) || guess < gameState.minNumber || guess > gameState.maxNumber) {
+        showError(`Please enter a valid number between ${gameState.minNumber} and ${gameState.maxNumber}`);
         return;
     }
     
     showLoading();
     
+    if (gameState.roomId) {
+        await submitRoomGuess(guess);
+        return;
+    }
+    
     try {
         console.log('Submitting guess:', guess);
         const response = await fetch(`${API_BASE_URL}/guess`, {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Accept': BINARY_MIMETYPE
             },
             credentials: 'include',
             body: JSON.stringify({
@@ -193,11 +474,14 @@ async function submitGuess() {
         });
         
         console.log('Guess response status:', response.status);
-        const data = await response.json();
+        const data = await readResponse(response, decodeGuessResponse);
         console.log('Guess response data:', data);
         
         if (response.ok) {
             handleGuessResult(data);
+        } else if (data.game_over) {
+            // The game ran out of time before this guess
+            endLostGame(data.final_message);
         } else {
             showError(data.error || 'Failed to submit guess');
         }
@@ -230,9 +514,13 @@ function handleGuessResult(data) {
     // Check if game is won
     if (data.correct) {
         gameState.isActive = false;
-        setTimeout(() => {
-            showCelebration(data.final_message);
+        const rankMessage = data.leaderboard_rank ? ` You are #${data.leaderboard_rank} on the leaderboard!` : '';
+        const fairness = checkCommitment(data.reveal);
+        setTimeout(async () => {
+            showCelebration(data.final_message + rankMessage + await fairness);
         }, 1000);
+    } else if (data.game_over) {
+        endLostGame(data.final_message);
     } else {
         // Show hint if available
         if (data.ai_hint) {
@@ -246,6 +534,25 @@ function handleGuessResult(data) {
     }
 }
 
+// End a game that was lost to its attempt or time limit
+function endLostGame(message) {
+    gameState.isActive = false;
+    updateUIForInactiveGame();
+    updateGameStatus('⌛ ' + message);
+}
+
+// Check a commit-reveal game's revealed secret against the commitment from /start
+async function checkCommitment(reveal) {
+    if (!reveal || !gameState.commitment || !window.crypto || !crypto.subtle) {
+        return '';
+    }
+    const text = new TextEncoder().encode(`${reveal.salt}:${reveal.secret_number}`);
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', text));
+    const hex = Array.from(digest, byte => byte.toString(16).padStart(2, '0')).join('');
+    return hex === gameState.commitment ? ' ✅ Fair game: the secret matches its commitment.'
+        : ' ⚠️ The secret does not match the commitment published at the start!';
+}
+
 // Update result display
 function updateResultDisplay(data) {
     let icon, message, details;
@@ -361,12 +668,13 @@ async function resetGame() {
 // Update UI for active game
 function updateUIForActiveGame() {
     elements.startBtn.style.display = 'none';
+    elements.roomBtn.style.display = 'none';
     elements.resetBtn.style.display = 'inline-flex';
     elements.guessSection.style.display = 'block';
     elements.attemptsCounter.style.display = 'block';
     elements.attemptsCount.textContent = gameState.attempts;
     
-    if (gameState.guesses.length > 0) {
+    if (gameState.guesses.length > 0 && !gameState.roomId) {
         elements.resultsSection.style.display = 'block';
         elements.historySection.style.display = 'block';
         updateHistoryDisplay(gameState.guesses);
@@ -376,6 +684,7 @@ function updateUIForActiveGame() {
 // Update UI for inactive game
 function updateUIForInactiveGame() {
     elements.startBtn.style.display = 'inline-flex';
+    elements.roomBtn.style.display = 'inline-flex';
     elements.resetBtn.style.display = 'none';
     elements.guessSection.style.display = 'none';
     elements.resultsSection.style.display = 'none';